@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+# Copyright 2015-2019 IONOS
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Connections opened and wall time per 1,000 get_server calls.
+
+Compares the pooled ApiClient of IonosEnterpriseService with the former
+behaviour of building a new ApiClient (and connection pool) per call.
+Runs against a local HTTPS stand-in, no credentials are needed:
+
+    python benchmarks/bench_api_client_pool.py [--calls 1000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import urllib3
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from ionosenterprise.client import IonosEnterpriseService  # noqa: E402
+
+from standin import StandinServer  # noqa: E402
+
+
+class UnpooledService(IonosEnterpriseService):
+    """Builds a new ApiClient for every call, like the SDK used to."""
+
+    def get_api_client(self):
+        return self._create_api_client()
+
+    def get_api_instance(self, apiClass):
+        return apiClass(self.get_api_client())
+
+
+def run(service_class, server, calls):
+    client = service_class(username='bench', password='bench', host_base=server.url,
+                           ssl_verify=False, use_config=False, use_keyring=False)
+    server.reset()
+    start = time.time()
+    for i in range(calls):
+        client.get_server('dc-1', 'server-{}'.format(i), depth=1)
+    elapsed = time.time() - start
+    client.close()
+    return server.connections, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--calls', type=int, default=1000)
+    args = parser.parse_args()
+    urllib3.disable_warnings()
+
+    with StandinServer() as server:
+        print('{:<10} {:>12} {:>10} {:>12}'.format('client', 'connections', 'wall [s]',
+                                                   'per call [ms]'))
+        for name, service_class in (('before', UnpooledService),
+                                    ('after', IonosEnterpriseService)):
+            connections, elapsed = run(service_class, server, args.calls)
+            print('{:<10} {:>12} {:>10.2f} {:>12.2f}'.format(
+                name, connections, elapsed, elapsed * 1000 / args.calls))
+
+
+if __name__ == '__main__':
+    main()
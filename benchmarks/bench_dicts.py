@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+# Copyright 2015-2019 IONOS
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Time to build the request bodies of 10,000 servers.
+
+Every server has two new volumes and two NICs with three firewall rules
+each. With --baseline the builders of requests/dicts.py at another git
+revision are timed as well, after checking that they build the same
+bodies:
+
+    python benchmarks/bench_dicts.py [--servers 10000] [--baseline REV]
+"""
+
+import argparse
+import importlib
+import json
+import os
+import subprocess
+import sys
+import time
+import types
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from ionosenterprise.client import FirewallRule, NIC, Server, Volume  # noqa: E402
+
+dicts_module = importlib.import_module('ionosenterprise.requests.dicts')
+
+
+def servers(count):
+    rules = [FirewallRule(name='port {}'.format(port), protocol='TCP',
+                          port_range_start=port, port_range_end=port) for port in (22, 80, 443)]
+    return [Server(name='server {}'.format(i), cores=2, ram=4096, cpu_family='INTEL_XEON',
+                   availability_zone='AUTO', boot_volume_id=None,
+                   create_volumes=[Volume(name='system {}'.format(i), size=20,
+                                          image_alias='ubuntu:latest',
+                                          ssh_keys=['ssh-rsa AAAAB3Nza benchmark']),
+                                   Volume(name='data {}'.format(i), size=100, disk_type='SSD')],
+                   attach_volumes=['shared-volume'],
+                   nics=[NIC(name='public', lan=1, dhcp=True, firewall_active=True,
+                             firewall_rules=rules),
+                         NIC(name='private', lan=2, ips=['10.0.0.{}'.format(i % 250 + 1)],
+                             dhcp=False)])
+            for i in range(count)]
+
+
+def load_revision(revision):
+    source = subprocess.check_output(
+        ['git', 'show', '{}:ionosenterprise/requests/dicts.py'.format(revision)], cwd=ROOT)
+    module = types.ModuleType('dicts_{}'.format(revision))
+    exec(compile(source, 'dicts.py@{}'.format(revision), 'exec'), module.__dict__)
+    return module.dicts()
+
+
+def build(builder, specs):
+    return [builder._create_server_dict(server) for server in specs]
+
+
+def measure(builders, specs, repeat):
+    """Returns the best time of each builder, timed in turns to share the noise."""
+    best = dict((name, float('inf')) for name, _ in builders)
+    for _ in range(repeat):
+        for name, builder in builders:
+            start = time.perf_counter()
+            build(builder, specs)
+            best[name] = min(best[name], time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--servers', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--baseline', help='git revision to compare with')
+    args = parser.parse_args()
+
+    specs = servers(args.servers)
+    builders = [('current', dicts_module.dicts())]
+    if args.baseline:
+        baseline = load_revision(args.baseline)
+        if json.dumps(build(baseline, specs)) != json.dumps(build(builders[0][1], specs)):
+            sys.exit('The bodies built at {} differ'.format(args.baseline))
+        builders.insert(0, (args.baseline, baseline))
+
+    print('{:<16} {:>12} {:>16}'.format('dicts.py', 'total [ms]', 'per server [us]'))
+    best = measure(builders, specs, args.repeat)
+    for name, _ in builders:
+        elapsed = best[name]
+        print('{:<16} {:>12.1f} {:>16.2f}'.format(
+            name, elapsed * 1000, elapsed * 1e6 / args.servers))
+
+
+if __name__ == '__main__':
+    main()
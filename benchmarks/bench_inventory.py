@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+# Copyright 2015-2019 IONOS
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Time to take the inventory of an account with many data centers.
+
+A local stand-in API with a fixed latency per request serves data
+centers with servers that have a volume and two NICs each. The requests
+examples/ic_datacenter_inventory.py made before it used crawl(),
+including a get_server call per NIC of a LAN, run one after the other
+and are compared with ionosenterprise.inventory.crawl():
+
+    python benchmarks/bench_inventory.py [--datacenters 100] [--servers 5]
+                                         [--latency 0.02] [--workers 32]
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+
+import urllib3
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from ionosenterprise.client import IonosEnterpriseService  # noqa: E402
+from ionosenterprise.inventory import crawl  # noqa: E402
+from standin import StandinServer  # noqa: E402
+
+API = 'https://api.ionos.com/cloudapi/v5/'
+
+
+def resource(path, **properties):
+    return {'id': path.rsplit('/', 1)[-1], 'href': API + path, 'properties': properties,
+            'metadata': {'state': 'AVAILABLE', 'createdDate': '2020-01-01T00:00:00Z',
+                         'lastModifiedDate': '2020-01-01T00:00:00Z'}}
+
+
+def collection(path, items):
+    return {'id': path, 'type': 'collection', 'href': API + path, 'items': items}
+
+
+class Account(object):
+    def __init__(self, datacenters, servers, latency):
+        self.datacenters = datacenters
+        self.servers = servers
+        self.latency = latency
+
+    def nic(self, dc, server, nic):
+        return resource('datacenters/{}/servers/{}/nics/{}'.format(dc, server, nic),
+                        name='nic', lan=nic, mac='02:01:00:00:00:01', dhcp=True,
+                        ips=['10.0.0.1'], firewallActive=False)
+
+    def server(self, dc, server):
+        path = 'datacenters/{}/servers/{}'.format(dc, server)
+        document = resource(path, name='server {}'.format(server), cores=2, ram=4096,
+                            bootVolume=None, bootCdrom=None)
+        document['entities'] = {
+            'volumes': collection(path + '/volumes', [resource(
+                'datacenters/{}/volumes/v{}'.format(dc, server), size=20,
+                licenceType='LINUX')]),
+            'nics': collection(path + '/nics', [self.nic(dc, server, nic) for nic in (1, 2)]),
+        }
+        return document
+
+    def document(self, path):
+        time.sleep(self.latency)
+        path = path.split('?')[0][len('/cloudapi/v5/'):].rstrip('/')
+        segments = path.split('/')
+        if path == 'datacenters':
+            return collection(path, [resource('datacenters/dc{}'.format(i), name='dc {}'.format(i),
+                                              location='de/fra')
+                                     for i in range(self.datacenters)])
+        dc = segments[1]
+        servers = ['s{}'.format(i) for i in range(self.servers)]
+        if segments[2:] == ['servers']:
+            return collection(path, [self.server(dc, server) for server in servers])
+        if segments[2] == 'servers':
+            return self.server(dc, segments[3])
+        if segments[2:] == ['volumes']:
+            return collection(path, [resource('datacenters/{}/volumes/v{}'.format(dc, server),
+                                              name='volume', size=20, licenceType='LINUX')
+                                     for server in servers])
+        if segments[2:] == ['loadbalancers']:
+            return collection(path, [])
+        if segments[2:] == ['lans']:
+            lans = []
+            for lan in (1, 2):
+                document = resource('{}/{}'.format(path, lan), name='lan', public=lan == 1)
+                document['entities'] = {'nics': collection(
+                    '{}/{}/nics'.format(path, lan),
+                    [self.nic(dc, server, lan) for server in servers])}
+                lans.append(document)
+            return collection(path, lans)
+        raise ValueError(path)
+
+
+def example_crawl(client):
+    """The requests of the former examples/ic_datacenter_inventory.py -d -n."""
+    for dc in client.list_datacenters()['items']:
+        client.list_servers(dc['id'], 3)
+        client.list_volumes(dc['id'], 2)
+    for dc in client.list_datacenters()['items']:
+        client.list_loadbalancers(dc['id'], 2)
+        lans = client.list_lans(dc['id'], 3)
+        for lan in lans['items']:
+            for nic in lan['entities']['nics']['items']:
+                serverid = re.sub(r'^.*servers/([^/]+)/nics.*', r'\1', nic['href'])
+                client.get_server(dc['id'], serverid, 0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--datacenters', type=int, default=100)
+    parser.add_argument('--servers', type=int, default=5)
+    parser.add_argument('--latency', type=float, default=0.02)
+    parser.add_argument('--workers', type=int, default=32)
+    args = parser.parse_args()
+
+    account = Account(args.datacenters, args.servers, args.latency)
+    print('{:<16} {:>10} {:>10}'.format('crawl', 'time [s]', 'requests'))
+    with StandinServer(account.document) as server:
+        client = IonosEnterpriseService(username='bench', password='bench', host_base=server.url,
+                                        ssl_verify=False, use_config=False, use_keyring=False,
+                                        pool_size=args.workers)
+        urllib3.disable_warnings()
+        for name, run in [('example', lambda: example_crawl(client)),
+                          ('inventory.crawl', lambda: crawl(client, max_workers=args.workers,
+                                                            account=False))]:
+            server.reset()
+            start = time.perf_counter()
+            run()
+            print('{:<16} {:>10.2f} {:>10}'.format(
+                name, time.perf_counter() - start, server.requests))
+        client.close()
+
+
+if __name__ == '__main__':
+    main()
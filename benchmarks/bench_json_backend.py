@@ -0,0 +1,174 @@
+#!/usr/bin/env python
+# Copyright 2015-2019 IONOS
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Decode and encode time of the JSON backends on large API payloads.
+
+The payloads are shaped like the responses of get_datacenter(depth=5) for
+a populated data center and of list_images(depth=1) for the full image
+catalog. 'json' decodes the response body to a str first, as the
+ApiClient does without a backend; the other backends parse the bytes.
+
+    python benchmarks/bench_json_backend.py [--servers 200] [--images 3000]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from ionosenterprise.codec import (  # noqa: E402
+    HAS_ORJSON, HAS_UJSON, JsonBackend, OrjsonBackend, RawBytes, UjsonBackend)
+
+API = 'https://api.ionos.com/cloudapi/v5'
+
+
+def metadata(i):
+    return {
+        'etag': '{:032x}'.format(i * 2654435761),
+        'createdDate': '2019-12-04T14:34:09Z',
+        'createdBy': 'user@example.com',
+        'createdByUserId': '7ee96b46-3c0f-4e08-bbbc-4a2ec6eb3a0a',
+        'lastModifiedDate': '2019-12-04T14:34:09Z',
+        'lastModifiedBy': 'user@example.com',
+        'lastModifiedByUserId': '7ee96b46-3c0f-4e08-bbbc-4a2ec6eb3a0a',
+        'state': 'AVAILABLE',
+    }
+
+
+def entity(kind, href, i, properties, entities=None):
+    document = {'id': '{}-{:08d}'.format(kind, i), 'type': kind, 'href': API + href,
+                'metadata': metadata(i), 'properties': properties}
+    if entities is not None:
+        document['entities'] = entities
+    return document
+
+
+def collection(href, items):
+    return {'id': href.rsplit('/', 1)[-1], 'type': 'collection', 'href': API + href,
+            'items': items}
+
+
+def datacenter_document(servers):
+    dc = '/datacenters/dc-1'
+    server_items = []
+    volume_items = []
+    for i in range(servers):
+        href = '{}/servers/server-{}'.format(dc, i)
+        volumes = [entity('volume', '{}/volumes/volume-{}-{}'.format(dc, i, j), j, {
+            'name': 'volume {} {}'.format(i, j), 'type': 'HDD', 'size': 100,
+            'availabilityZone': 'AUTO', 'image': None, 'imagePassword': None,
+            'sshKeys': None, 'bus': 'VIRTIO', 'licenceType': 'LINUX',
+            'cpuHotPlug': True, 'ramHotPlug': True, 'nicHotPlug': True,
+            'nicHotUnplug': True, 'discVirtioHotPlug': True, 'discVirtioHotUnplug': True,
+            'deviceNumber': j + 1}) for j in range(2)]
+        volume_items.extend(volumes)
+        nics = [entity('nic', '{}/nics/nic-{}'.format(href, j), j, {
+            'name': 'nic {}'.format(j), 'mac': '02:01:{:02x}:{:02x}:00:01'.format(i % 256, j),
+            'ips': ['10.{}.{}.{}'.format(j, i // 256, i % 256)], 'dhcp': True, 'lan': j + 1,
+            'firewallActive': True, 'nat': False}, {
+                'firewallrules': collection('{}/nics/nic-{}/firewallrules'.format(href, j), [
+                    entity('firewall-rule', '{}/nics/nic-{}/firewallrules/fw-{}'.format(
+                        href, j, k), k, {
+                            'name': 'rule {}'.format(k), 'protocol': 'TCP',
+                            'sourceMac': None, 'sourceIp': None, 'targetIp': None,
+                            'icmpCode': None, 'icmpType': None,
+                            'portRangeStart': 22 + k, 'portRangeEnd': 22 + k})
+                    for k in range(3)])}) for j in range(2)]
+        server_items.append(entity('server', href, i, {
+            'name': 'server {}'.format(i), 'cores': 4, 'ram': 8192,
+            'availabilityZone': 'AUTO', 'vmState': 'RUNNING', 'cpuFamily': 'INTEL_XEON',
+            'bootCdrom': None, 'bootVolume': volumes[0]}, {
+                'cdroms': collection(href + '/cdroms', []),
+                'volumes': collection(href + '/volumes', volumes),
+                'nics': collection(href + '/nics', nics)}))
+    lans = [entity('lan', '{}/lans/{}'.format(dc, i + 1), i, {
+        'name': 'lan {}'.format(i), 'public': i == 0, 'ipFailover': []}, {
+            'nics': collection('{}/lans/{}/nics'.format(dc, i + 1), [])}) for i in range(2)]
+    return entity('datacenter', dc, 0, {
+        'name': 'benchmark', 'description': 'depth 5', 'location': 'de/fra', 'version': 42,
+        'features': ['SSD', 'MULTIPLE_CPU', 'VNF_IPV6'], 'secAuthProtection': False}, {
+            'servers': collection(dc + '/servers', server_items),
+            'volumes': collection(dc + '/volumes', volume_items),
+            'loadbalancers': collection(dc + '/loadbalancers', []),
+            'lans': collection(dc + '/lans', lans)})
+
+
+def image_catalog(images):
+    return collection('/images', [entity('image', '/images/image-{}'.format(i), i, {
+        'name': 'Ubuntu-20.04-LTS-server-2021-{:05d}.qcow2'.format(i),
+        'description': 'Übersetzte Beschreibung {}'.format(i), 'location': 'de/fra',
+        'size': 2.0 + i % 10, 'cpuHotPlug': True, 'cpuHotUnplug': False,
+        'ramHotPlug': True, 'ramHotUnplug': False, 'nicHotPlug': True, 'nicHotUnplug': True,
+        'discVirtioHotPlug': True, 'discVirtioHotUnplug': True, 'discScsiHotPlug': False,
+        'discScsiHotUnplug': False, 'licenceType': 'LINUX', 'imageType': 'HDD',
+        'public': True, 'imageAliases': ['ubuntu:latest'], 'cloudInit': 'V1'})
+        for i in range(images)])
+
+
+def stdlib_decode(data):
+    # what the ApiClient does without a backend
+    return JsonBackend.loads(data.decode('utf-8'))
+
+
+def measure(fn, arg, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(arg)
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    result = fn(arg)
+    peak = tracemalloc.get_traced_memory()[1]
+    blocks = sum(stat.count_diff for stat in
+                 tracemalloc.take_snapshot().compare_to(before, 'filename'))
+    tracemalloc.stop()
+    del result
+    return best, peak, blocks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--servers', type=int, default=200)
+    parser.add_argument('--images', type=int, default=3000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    backends = [('json', stdlib_decode, JsonBackend.dumps)]
+    if HAS_UJSON:
+        backends.append(('ujson', UjsonBackend.loads, UjsonBackend.dumps))
+    if HAS_ORJSON:
+        backends.append(('orjson', OrjsonBackend.loads, OrjsonBackend.dumps))
+
+    payloads = [('datacenter depth=5', datacenter_document(args.servers)),
+                ('image catalog', image_catalog(args.images))]
+    for title, document in payloads:
+        data = RawBytes(JsonBackend.dumps(document))
+        print('{} ({:.1f} MiB)'.format(title, len(data) / 1024.0 / 1024.0))
+        print('  {:<8} {:>12} {:>12} {:>16} {:>14}'.format(
+            'backend', 'decode [ms]', 'encode [ms]', 'decode peak [MiB]', 'live blocks'))
+        for name, loads, dumps in backends:
+            decode, peak, blocks = measure(loads, data, args.repeat)
+            encode = measure(dumps, document, args.repeat)[0]
+            print('  {:<8} {:>12.1f} {:>12.1f} {:>16.1f} {:>14}'.format(
+                name, decode * 1000, encode * 1000, peak / 1024.0 / 1024.0, blocks))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+# Copyright 2015-2019 IONOS
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Time to translate the keyword arguments of 100,000 update_* calls.
+
+The arguments of update_server and update_volume calls are translated
+with the per call camel casing the update_* methods used before and
+with the KeyMap of the properties model, after checking that both give
+the same keys:
+
+    python benchmarks/bench_keymap.py [--updates 100000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+import ionoscloud  # noqa: E402
+
+from ionosenterprise.keymap import keymap  # noqa: E402
+
+
+def underscore_to_camelcase(value):
+    def camelcase():
+        yield str.lower
+        while True:
+            yield str.capitalize
+
+    c = camelcase()
+    return "".join(next(c)(x) if x else '_' for x in value.split("_"))
+
+
+def legacy(kwargs):
+    data = {}
+    for attr, value in kwargs.items():
+        data[underscore_to_camelcase(attr)] = value
+    return data
+
+
+def updates(count):
+    result = []
+    for i in range(count):
+        if i % 2:
+            result.append((ionoscloud.models.ServerProperties, {
+                'name': 'server {}'.format(i), 'cores': 2 + i % 4, 'ram': 4096,
+                'cpu_family': 'INTEL_XEON', 'availability_zone': 'AUTO'}))
+        else:
+            result.append((ionoscloud.models.VolumeProperties, {
+                'name': 'volume {}'.format(i), 'size': 20 + i % 100, 'licence_type': 'LINUX',
+                'cpu_hot_plug': True, 'ram_hot_plug': True, 'disc_virtio_hot_plug': True}))
+    return result
+
+
+def run_legacy(specs):
+    return [legacy(kwargs) for _, kwargs in specs]
+
+
+def run_keymap(specs):
+    return [keymap(model).to_keys(kwargs) for model, kwargs in specs]
+
+
+def measure(run, specs, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run(specs)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--updates', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    specs = updates(args.updates)
+    if run_legacy(specs) != run_keymap(specs):
+        sys.exit('The translated keys differ')
+
+    print('{:<16} {:>12} {:>16}'.format('translation', 'total [ms]', 'per update [us]'))
+    for name, run in [('camel casing', run_legacy), ('keymap', run_keymap)]:
+        elapsed = measure(run, specs, args.repeat)
+        print('{:<16} {:>12.1f} {:>16.2f}'.format(
+            name, elapsed * 1000, elapsed * 1e6 / args.updates))
+
+
+if __name__ == '__main__':
+    main()
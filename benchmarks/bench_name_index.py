@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+# Copyright 2015-2019 IONOS
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Time to look up names in a list of 100,000 resources.
+
+The lookups are spread over the match steps of find_item_by_name(): exact,
+case insensitive, prefix and substring. They are timed with the regular
+expression scans find_item_by_name() used before, with find_item_by_name()
+and with one NameIndex reused for all lookups, after checking that all of
+them find the same resources:
+
+    python benchmarks/bench_name_index.py [--names 100000] [--lookups 20]
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from ionosenterprise.utils import NameIndex, find_item_by_name  # noqa: E402
+
+
+def legacy_find_item_by_name(list_, namegetter, name):
+    matching_items = [i for i in list_ if namegetter(i) == name]
+    if not matching_items:
+        prog = re.compile(re.escape(name) + '$', re.IGNORECASE)
+        matching_items = [i for i in list_ if prog.match(namegetter(i))]
+    if not matching_items:
+        prog = re.compile(re.escape(name))
+        matching_items = [i for i in list_ if prog.match(namegetter(i))]
+    if not matching_items:
+        prog = re.compile(re.escape(name), re.IGNORECASE)
+        matching_items = [i for i in list_ if prog.match(namegetter(i))]
+    if not matching_items:
+        prog = re.compile(re.escape(name))
+        matching_items = [i for i in list_ if prog.search(namegetter(i))]
+    if not matching_items:
+        prog = re.compile(re.escape(name), re.IGNORECASE)
+        matching_items = [i for i in list_ if prog.search(namegetter(i))]
+    return matching_items
+
+
+def namegetter(item):
+    return item['properties']['name']
+
+
+def resources(count):
+    return [{'id': str(i), 'properties': {'name': 'Datacenter-{:06d}-{}'.format(
+        i, random.choice(['prod', 'test', 'dev']))}} for i in range(count)]
+
+
+def lookups(items, count):
+    names = [namegetter(random.choice(items)) for _ in range(count)]
+    result = []
+    for i, name in enumerate(names):
+        result.append([name, name.upper(), name[:16], name[11:17].upper()][i % 4])
+    return result
+
+
+def measure(run, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--names', type=int, default=100000)
+    parser.add_argument('--lookups', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    random.seed(0)
+    items = resources(args.names)
+    names = lookups(items, args.lookups)
+
+    def run_legacy():
+        return [legacy_find_item_by_name(items, namegetter, name) for name in names]
+
+    def run_find():
+        return [find_item_by_name(items, namegetter, name) for name in names]
+
+    def run_index():
+        index = NameIndex(items, namegetter)
+        return [index.find(name) for name in names]
+
+    if not run_legacy() == run_find() == run_index():
+        sys.exit('The lookups found different resources')
+
+    print('{:<20} {:>12} {:>16}'.format('lookup', 'total [ms]', 'per lookup [ms]'))
+    for name, run in [('regular expressions', run_legacy), ('find_item_by_name', run_find),
+                      ('NameIndex', run_index)]:
+        elapsed = measure(run, args.repeat)
+        print('{:<20} {:>12.1f} {:>16.3f}'.format(
+            name, elapsed * 1000, elapsed * 1000 / args.lookups))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+# Copyright 2015-2019 IONOS
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Status polls and delay of wait_for_completion() with FixedPolling and AdaptivePolling.
+
+A local stand-in API finishes the requests of three operation types
+after about 2, 12 and 130 seconds (+-10%), scaled by --scale. The
+requests are waited for one after the other; reported per operation
+type are the status polls and the mean time between the end of a
+request and the end of its wait, in unscaled seconds:
+
+    python benchmarks/bench_polling.py [--rounds 10] [--scale 0.01]
+"""
+
+import argparse
+import collections
+import os
+import random
+import sys
+import time
+import uuid
+
+import urllib3
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from ionosenterprise.client import IonosEnterpriseService  # noqa: E402
+from ionosenterprise.polling import AdaptivePolling, FixedPolling, operation_type  # noqa: E402
+from standin import StandinServer  # noqa: E402
+
+API = 'https://api.ionos.com/cloudapi/v5/'
+DC = '9f4e4b4c-0c5d-4f6c-8c3e-2d1b0a9e8f7a'
+SERVER = 'a1b2c3d4-0000-4000-8000-000000000001'
+
+# method, URL and latency in seconds of the operations
+OPERATIONS = [
+    ('PATCH', API + 'datacenters/{}/servers/{}/nics/{}'.format(DC, SERVER, uuid.uuid4()), 2),
+    ('POST', API + 'datacenters/{}/volumes'.format(DC), 12),
+    ('POST', API + 'datacenters/{}/volumes/{}/create-snapshot'.format(DC, uuid.uuid4()), 130),
+]
+
+
+class Requests(object):
+    def __init__(self):
+        self.finished = {}
+
+    def start(self, latency):
+        request_id = str(uuid.uuid4())
+        self.finished[request_id] = time.time() + latency
+        return request_id
+
+    def document(self, path):
+        request_id = path.split('?')[0].split('/')[-2]
+        status = 'DONE' if self.finished[request_id] <= time.time() else 'RUNNING'
+        return {'id': request_id, 'type': 'request-status',
+                'metadata': {'status': status, 'message': status, 'targets': []}}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rounds', type=int, default=10)
+    parser.add_argument('--scale', type=float, default=0.01)
+    args = parser.parse_args()
+    scale = args.scale
+
+    requests = Requests()
+    print('{:<16} {:<30} {:>8} {:>16}'.format(
+        'polling', 'operation', 'polls', 'mean delay [s]'))
+    with StandinServer(requests.document) as server:
+        urllib3.disable_warnings()
+        for name, polling in [
+                ('FixedPolling', FixedPolling(initial_wait=5 * scale, scaleup=10)),
+                ('AdaptivePolling', AdaptivePolling(min_wait=1 * scale, max_wait=60 * scale))]:
+            client = IonosEnterpriseService(
+                username='bench', password='bench', host_base=server.url, ssl_verify=False,
+                use_config=False, use_keyring=False, polling=polling)
+            random.seed(0)
+            polls = collections.Counter()
+            delays = collections.Counter()
+            for _ in range(args.rounds):
+                for method, url, latency in OPERATIONS:
+                    request_id = requests.start(latency * random.uniform(0.9, 1.1) * scale)
+                    # as if the request was sent by the client
+                    location = API + 'requests/{}/status'.format(request_id)
+                    if isinstance(polling, AdaptivePolling):
+                        polling.track(method, url, location)
+                    server.reset()
+                    client.wait_for_completion({'requestId': request_id})
+                    operation = operation_type(method, url)
+                    delays[operation] += time.time() - requests.finished[request_id]
+                    polls[operation] += server.requests
+            for method, url, _ in OPERATIONS:
+                operation = operation_type(method, url)
+                print('{:<16} {:<30} {:>8} {:>16.2f}'.format(
+                    name, operation, polls[operation], delays[operation] / scale / args.rounds))
+            client.close()
+
+
+if __name__ == '__main__':
+    main()
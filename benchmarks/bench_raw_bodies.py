@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+# Copyright 2015-2019 IONOS
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Client CPU time of create_datacenter() for a composite data center.
+
+Sends a data center with 1,000 servers (each with a volume and a NIC with
+firewall rules) to a local stand-in running in another process, so the
+process CPU time is the time the client spends building, converting and
+encoding the request body:
+
+    python benchmarks/bench_raw_bodies.py [--servers 1000] [--repeat 5]
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from ionosenterprise.client import (  # noqa: E402
+    Datacenter, FirewallRule, IonosEnterpriseService, LAN, NIC, Server, Volume)
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+except ImportError:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        self.rfile.read(int(self.headers['Content-Length']))
+        body = b'{"id": "dc-1", "type": "datacenter"}'
+        self.send_response(202)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Location', 'https://api/cloudapi/v5/requests/123-456/status')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        pass
+
+
+def serve(queue):
+    httpd = HTTPServer(('127.0.0.1', 0), _Handler)
+    queue.put(httpd.server_address[1])
+    httpd.serve_forever()
+
+
+def composite_datacenter(servers):
+    rules = [FirewallRule(name='port {}'.format(port), protocol='TCP',
+                          port_range_start=port, port_range_end=port) for port in (22, 80, 443)]
+    return Datacenter(
+        name='benchmark', location='de/fra', description='composite',
+        lans=[LAN(name='public', public=True), LAN(name='private')],
+        servers=[Server(name='server {}'.format(i), cores=2, ram=4096, cpu_family='INTEL_XEON',
+                        availability_zone='AUTO',
+                        create_volumes=[Volume(name='system {}'.format(i), size=20,
+                                               image_alias='ubuntu:latest',
+                                               ssh_keys=['ssh-rsa AAAAB3Nza benchmark'])],
+                        nics=[NIC(name='nic {}'.format(i), lan=1, dhcp=True,
+                                  firewall_active=True, firewall_rules=rules)])
+                 for i in range(servers)])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--servers', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    queue = multiprocessing.Queue()
+    server = multiprocessing.Process(target=serve, args=(queue,))
+    server.daemon = True
+    server.start()
+    url = 'http://127.0.0.1:{}/cloudapi/v5'.format(queue.get())
+
+    datacenter = composite_datacenter(args.servers)
+    print('{:<28} {:>22}'.format('bodies', 'CPU per payload [ms]'))
+    for name, kwargs in (('ionoscloud models', {}),
+                         ('raw_bodies', {'raw_bodies': True}),
+                         ('raw_bodies + orjson', {'raw_bodies': True, 'json_backend': 'orjson'})):
+        client = IonosEnterpriseService(username='bench', password='bench', host_base=url,
+                                        use_config=False, use_keyring=False, **kwargs)
+        client.create_datacenter(datacenter)
+        best = float('inf')
+        for _ in range(args.repeat):
+            start = time.process_time()
+            client.create_datacenter(datacenter)
+            best = min(best, time.process_time() - start)
+        client.close()
+        print('{:<28} {:>22.1f}'.format(name, best * 1000))
+    server.terminate()
+
+
+if __name__ == '__main__':
+    main()
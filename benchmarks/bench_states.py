@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+# Copyright 2015-2019 IONOS
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Number of API calls to wait for many servers to be shut off.
+
+A local stand-in API shuts off each server of a data center at a random
+time within --duration seconds. Polling get_server() for every server
+once per interval, as wait_for_server() in the examples did, is
+compared with client.wait_for_states():
+
+    python benchmarks/bench_states.py [--servers 200] [--duration 2]
+                                      [--interval 0.2]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+import urllib3
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from ionosenterprise.client import IonosEnterpriseService  # noqa: E402
+from ionosenterprise.polling import FixedPolling  # noqa: E402
+from standin import StandinServer  # noqa: E402
+
+DC = '9f4e4b4c-0c5d-4f6c-8c3e-2d1b0a9e8f7a'
+
+
+class Servers(object):
+    def __init__(self, count, duration):
+        self.ids = ['{:08d}-0000-0000-0000-000000000000'.format(i) for i in range(count)]
+        self.duration = duration
+        self.start()
+
+    def start(self):
+        random.seed(0)
+        started = time.time()
+        self.stopped = dict((server_id, started + random.uniform(0, self.duration))
+                            for server_id in self.ids)
+
+    def server(self, server_id):
+        off = self.stopped[server_id] <= time.time()
+        return {'id': server_id, 'type': 'server',
+                'metadata': {'state': 'INACTIVE' if off else 'BUSY'},
+                'properties': {'name': server_id, 'cores': 2, 'ram': 4096,
+                               'vmState': 'SHUTOFF' if off else 'RUNNING'}}
+
+    def document(self, path):
+        path = path.split('?')[0][len('/cloudapi/v5/'):].rstrip('/')
+        if path.endswith('/servers'):
+            return {'id': DC + '/servers', 'type': 'collection',
+                    'items': [self.server(server_id) for server_id in self.ids]}
+        return self.server(path.split('/')[-1])
+
+
+def shutoff(server):
+    return server['properties']['vmState'] == 'SHUTOFF'
+
+
+def example_wait(client, server_ids, interval):
+    """wait_for_server() of the examples, for one server after the other."""
+    for server_id in server_ids:
+        while not shutoff(client.get_server(DC, server_id)):
+            time.sleep(interval)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--servers', type=int, default=200)
+    parser.add_argument('--duration', type=float, default=2)
+    parser.add_argument('--interval', type=float, default=0.2)
+    args = parser.parse_args()
+
+    servers = Servers(args.servers, args.duration)
+    print('{:<16} {:>10} {:>10}'.format('wait', 'time [s]', 'requests'))
+    with StandinServer(servers.document) as server:
+        client = IonosEnterpriseService(username='bench', password='bench', host_base=server.url,
+                                        ssl_verify=False, use_config=False, use_keyring=False)
+        urllib3.disable_warnings()
+        polling = FixedPolling(args.interval, scaleup=None)
+        for name, run in [
+                ('example', lambda: example_wait(client, servers.ids, args.interval)),
+                ('wait_for_states', lambda: client.wait_for_states(
+                    DC, dict((server_id, shutoff) for server_id in servers.ids),
+                    polling=polling))]:
+            servers.start()
+            server.reset()
+            start = time.perf_counter()
+            run()
+            print('{:<16} {:>10.2f} {:>10}'.format(
+                name, time.perf_counter() - start, server.requests))
+        client.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+# Copyright 2015-2019 IONOS
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Peak memory of reading one large deep server collection.
+
+Compares list_servers() with iter_servers(stream=True). Every variant runs
+in a fresh process, so the peak resident set size of the process is the
+peak of the read. Runs against a local HTTPS stand-in:
+
+    python benchmarks/bench_streaming.py [--servers 20000]
+"""
+
+import argparse
+import multiprocessing
+import os
+import resource
+import sys
+import time
+
+import urllib3
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from ionosenterprise.client import IonosEnterpriseService  # noqa: E402
+
+from standin import StandinServer, server_document  # noqa: E402
+
+
+def collection_document(count):
+    def document(path):
+        path = path.split('?')[0]
+        items = []
+        for i in range(count):
+            server = server_document(path + '/server-{}'.format(i))
+            server['entities'] = {
+                'volumes': {'id': 'volumes', 'type': 'collection', 'items': [
+                    server_document(path + '/server-{}/volumes/{}'.format(i, j))
+                    for j in range(2)]},
+                'nics': {'id': 'nics', 'type': 'collection', 'items': [
+                    server_document(path + '/server-{}/nics/{}'.format(i, j))
+                    for j in range(2)]},
+            }
+            items.append(server)
+        return {'id': 'servers', 'type': 'collection', 'href': path, 'items': items}
+    return document
+
+
+def read(url, stream, queue):
+    client = IonosEnterpriseService(username='bench', password='bench', host_base=url,
+                                    ssl_verify=False, use_config=False, use_keyring=False)
+    urllib3.disable_warnings()
+    client.get_api_client()
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.time()
+    cores = 0
+    if stream:
+        for server in client.iter_servers('dc-1', depth=3, stream=True):
+            cores += server['properties']['cores']
+    else:
+        for server in client.list_servers('dc-1', depth=3)['items']:
+            cores += server['properties']['cores']
+    elapsed = time.time() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    queue.put((elapsed, (peak - baseline) / 1024.0, cores))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--servers', type=int, default=20000)
+    args = parser.parse_args()
+
+    with StandinServer(document=collection_document(args.servers)) as server:
+        print('{:<26} {:>10} {:>18}'.format('read', 'wall [s]', 'peak RSS [MiB]'))
+        for name, stream in (('list_servers()', False),
+                             ('iter_servers(stream=True)', True)):
+            queue = multiprocessing.Queue()
+            process = multiprocessing.Process(target=read, args=(server.url, stream, queue))
+            process.start()
+            elapsed, peak, _ = queue.get()
+            process.join()
+            print('{:<26} {:>10.2f} {:>18.1f}'.format(name, elapsed, peak))
+
+
+if __name__ == '__main__':
+    main()
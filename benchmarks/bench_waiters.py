@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+# Copyright 2015-2019 IONOS
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Number of API calls to wait for many provisioning requests.
+
+A local stand-in API finishes each request at a random time within
+--duration seconds; the data center is BUSY until the last one is
+finished. The loop of wait_for_requests() in the examples, polling
+every pending request once per interval, is compared with
+client.wait_for_all() and with client.wait_for_datacenter_idle(), which
+reads the state of the data center and checks the requests once it is
+AVAILABLE:
+
+    python benchmarks/bench_waiters.py [--requests 300] [--duration 2]
+                                       [--interval 0.2]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+import urllib3
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from ionosenterprise.client import IonosEnterpriseService  # noqa: E402
+from ionosenterprise.polling import FixedPolling  # noqa: E402
+from standin import StandinServer  # noqa: E402
+
+DC = '9f4e4b4c-0c5d-4f6c-8c3e-2d1b0a9e8f7a'
+
+
+class Requests(object):
+    def __init__(self, count, duration):
+        self.ids = ['{:08d}-0000-0000-0000-000000000000'.format(i) for i in range(count)]
+        self.count = count
+        self.duration = duration
+        self.start()
+
+    def start(self):
+        random.seed(0)
+        started = time.time()
+        self.finished = dict((request_id, started + random.uniform(0, self.duration))
+                             for request_id in self.ids)
+
+    def status(self, request_id):
+        status = 'DONE' if self.finished[request_id] <= time.time() else 'RUNNING'
+        return {'id': request_id, 'type': 'request-status',
+                'metadata': {'status': status, 'message': status, 'targets': []}}
+
+    def document(self, path):
+        path = path.split('?')[0][len('/cloudapi/v5/'):].rstrip('/')
+        if path.startswith('datacenters/'):
+            busy = max(self.finished.values()) > time.time()
+            return {'id': DC, 'type': 'datacenter',
+                    'metadata': {'state': 'BUSY' if busy else 'AVAILABLE'}}
+        if path == 'requests':
+            return {'id': 'requests', 'type': 'collection', 'items': [
+                {'id': request_id, 'type': 'request',
+                 'metadata': {'requestStatus': self.status(request_id)}}
+                for request_id in self.ids]}
+        return self.status(path.split('/')[1])
+
+
+def example_wait(client, request_ids, interval):
+    """The polling loop of wait_for_requests() in examples/ic_createDatacenter.py."""
+    done = set()
+    while len(done) < len(request_ids):
+        for request_id in request_ids:
+            if request_id not in done and \
+                    client.get_request(request_id, status=True)['metadata']['status'] == 'DONE':
+                done.add(request_id)
+        if len(done) < len(request_ids):
+            time.sleep(interval)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--requests', type=int, default=300)
+    parser.add_argument('--duration', type=float, default=2)
+    parser.add_argument('--interval', type=float, default=0.2)
+    args = parser.parse_args()
+
+    requests = Requests(args.requests, args.duration)
+    print('{:<16} {:>10} {:>10}'.format('wait', 'time [s]', 'requests'))
+    with StandinServer(requests.document) as server:
+        client = IonosEnterpriseService(username='bench', password='bench', host_base=server.url,
+                                        ssl_verify=False, use_config=False, use_keyring=False)
+        urllib3.disable_warnings()
+        for name, run in [
+                ('example', lambda: example_wait(client, requests.ids, args.interval)),
+                ('wait_for_all', lambda: client.wait_for_all(requests.ids,
+                                                             interval=args.interval)),
+                ('datacenter_idle', lambda: client.wait_for_datacenter_idle(
+                    DC, requests.ids, polling=FixedPolling(args.interval, scaleup=None)))]:
+            requests.start()
+            server.reset()
+            start = time.perf_counter()
+            run()
+            print('{:<16} {:>10.2f} {:>10}'.format(
+                name, time.perf_counter() - start, server.requests))
+        client.close()
+
+
+if __name__ == '__main__':
+    main()
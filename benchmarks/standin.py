@@ -0,0 +1,144 @@
+# Copyright 2015-2019 IONOS
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Local HTTPS stand-in for the Cloud API used by the benchmarks.
+
+The server answers every GET with a canned JSON document and counts the
+TCP connections it accepted, so benchmarks can report how many
+connections (and TLS handshakes) a client opened.
+"""
+
+import json
+import os
+import shutil
+import socket
+import ssl
+import subprocess
+import tempfile
+import threading
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+except ImportError:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+
+
+def server_document(path):
+    """Return a plausible server entity for the given request path."""
+    server_id = path.split('?')[0].rstrip('/').split('/')[-1]
+    return {
+        'id': server_id,
+        'type': 'server',
+        'href': 'https://api.ionos.com/cloudapi/v5' + path.split('?')[0],
+        'metadata': {
+            'etag': '45480eb3fbfc31f1d916c1eaa4abdcc3',
+            'createdDate': '2015-12-04T14:34:09Z',
+            'lastModifiedDate': '2015-12-04T14:34:09Z',
+            'state': 'AVAILABLE'
+        },
+        'properties': {
+            'name': 'server-' + server_id,
+            'cores': 2,
+            'ram': 4096,
+            'availabilityZone': 'AUTO',
+            'vmState': 'RUNNING',
+            'cpuFamily': 'INTEL_XEON'
+        }
+    }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        BaseHTTPRequestHandler.setup(self)
+        # headers and body are written separately, avoid delayed ACK stalls
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        with self.server.lock:
+            self.server.requests += 1
+        body = json.dumps(self.server.document(self.path)).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        pass
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class StandinServer(object):
+    """
+    A threaded HTTPS server on localhost with a self-signed certificate.
+
+    Use it as a context manager; ``url`` is the API base to pass as
+    ``host_base`` and ``connections`` the number of accepted connections.
+    """
+
+    def __init__(self, document=server_document):
+        self._tmpdir = tempfile.mkdtemp(prefix='ionos-standin-')
+        certfile = os.path.join(self._tmpdir, 'cert.pem')
+        keyfile = os.path.join(self._tmpdir, 'key.pem')
+        subprocess.check_call(
+            ['openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes', '-days', '1',
+             '-subj', '/CN=localhost', '-keyout', keyfile, '-out', certfile],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(certfile, keyfile)
+
+        self._httpd = _ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+        self._httpd.socket = context.wrap_socket(self._httpd.socket, server_side=True)
+        self._httpd.document = document
+        self._httpd.lock = threading.Lock()
+        self._httpd.connections = 0
+        self._httpd.requests = 0
+        self._thread = threading.Thread(target=self._httpd.serve_forever)
+        self._thread.daemon = True
+
+    @property
+    def url(self):
+        return 'https://127.0.0.1:{}/cloudapi/v5'.format(self._httpd.server_address[1])
+
+    @property
+    def connections(self):
+        return self._httpd.connections
+
+    @property
+    def requests(self):
+        return self._httpd.requests
+
+    def reset(self):
+        with self._httpd.lock:
+            self._httpd.connections = 0
+            self._httpd.requests = 0
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        shutil.rmtree(self._tmpdir, ignore_errors=True)
@@ -1,12 +1,39 @@
 import ionoscloud
+from coreadaptor.IonosApiClient import IonosApiClient
 
 class AuthAdaptor:
-    def __init__(self, username, password):
+    def __init__(self, username, password, host=None, verify_ssl=True, cert_file=None,
+                 pool_size=None, retries=None):
         self.username = username
         self.password = password
+        self.host = host
+        self.verify_ssl = verify_ssl
+        self.cert_file = cert_file
+        self.pool_size = pool_size
+        self.retries = retries
 
-    def get_api_client(self):
-        return ionoscloud.ApiClient(ionoscloud.Configuration(
+    def get_configuration(self):
+        configuration = ionoscloud.Configuration(
+            host = self.host,
             username = self.username,
             password = self.password
-        ))
\ No newline at end of file
+        )
+        if isinstance(self.verify_ssl, str):
+            # requests style: a path to a CA bundle enables verification
+            configuration.ssl_ca_cert = self.verify_ssl
+        else:
+            configuration.verify_ssl = self.verify_ssl
+        if isinstance(self.cert_file, (tuple, list)):
+            configuration.cert_file, configuration.key_file = self.cert_file
+        else:
+            configuration.cert_file = self.cert_file
+        if self.pool_size:
+            # maximum number of connections kept alive per host
+            configuration.connection_pool_maxsize = self.pool_size
+        if self.retries is not None:
+            # urllib3.Retry of the connection pool
+            configuration.retries = self.retries
+        return configuration
+
+    def get_api_client(self):
+        return IonosApiClient(self.get_configuration())
@@ -0,0 +1,245 @@
+import contextlib
+import threading
+
+import ionoscloud
+import urllib3
+from ionoscloud import rest
+from ionoscloud.exceptions import ApiException
+from six.moves.urllib.parse import urlencode
+
+from ionosenterprise.codec import EncodedBody, RawBytes
+from ionosenterprise.rawbody import RawBody
+
+_local = threading.local()
+
+
+@contextlib.contextmanager
+def extra_query_params(**params):
+    """
+    Adds query parameters to the API requests of the current thread.
+
+    Used for parameters the resource methods do not pass on, such as
+    offset and limit of a collection.
+    """
+    previous = getattr(_local, 'query_params', None)
+    _local.query_params = dict(previous or {}, **params)
+    try:
+        yield
+    finally:
+        _local.query_params = previous
+
+
+def current_query_params():
+    return getattr(_local, 'query_params', None)
+
+
+class _StreamTarget(object):
+    response = None
+
+
+@contextlib.contextmanager
+def stream_response():
+    """
+    Leaves the body of the next GET request of the current thread unread.
+
+    The resource method returns None; the urllib3 response is stored in
+    the ``response`` attribute of the yielded object instead.
+    """
+    previous = getattr(_local, 'stream', None)
+    target = _local.stream = _StreamTarget()
+    try:
+        yield target
+    finally:
+        _local.stream = previous
+
+
+def is_streaming():
+    return getattr(_local, 'stream', None) is not None
+
+
+class _EmptyResponse(object):
+    """Stands in for a streamed response, deserializes to None."""
+    status = 200
+    reason = 'OK'
+    data = b'null'
+
+    def getheaders(self):
+        return {}
+
+    def getheader(self, name, default=None):
+        return default
+
+
+class IonosRESTClient(rest.RESTClientObject):
+    """
+    RESTClientObject that sends request bodies encoded by a JSON backend as is.
+    """
+
+    def request(self, method, url, query_params=None, headers=None,
+                body=None, post_params=None, _preload_content=True,
+                _request_timeout=None):
+        if not isinstance(body, EncodedBody):
+            return super(IonosRESTClient, self).request(
+                method, url, query_params=query_params, headers=headers, body=body,
+                post_params=post_params, _preload_content=_preload_content,
+                _request_timeout=_request_timeout)
+
+        headers = dict(headers or {})
+        headers.setdefault('Content-Type', 'application/json')
+        if query_params:
+            url += '?' + urlencode(query_params)
+        timeout = None
+        if isinstance(_request_timeout, int):
+            timeout = urllib3.Timeout(total=_request_timeout)
+        elif isinstance(_request_timeout, tuple) and len(_request_timeout) == 2:
+            timeout = urllib3.Timeout(connect=_request_timeout[0], read=_request_timeout[1])
+        try:
+            r = self.pool_manager.request(method.upper(), url, body=bytes(body),
+                                          preload_content=_preload_content,
+                                          timeout=timeout, headers=headers)
+        except urllib3.exceptions.SSLError as e:
+            raise ApiException(status=0, reason="{0}\n{1}".format(type(e).__name__, str(e)))
+
+        if _preload_content:
+            r = rest.RESTResponse(r)
+        if not 200 <= r.status <= 299:
+            raise ApiException(http_resp=r)
+        return r
+
+
+class IonosApiClient(ionoscloud.ApiClient):
+    """
+    ApiClient that passes every HTTP request through the hooks of the SDK.
+    """
+
+    rate_limiter = None
+    retry_policy = None
+    response_cache = None
+    name_resolver = None
+    polling = None
+    json_backend = None
+
+    def __init__(self, configuration=None, *args, **kwargs):
+        super(IonosApiClient, self).__init__(configuration, *args, **kwargs)
+        self.rest_client = IonosRESTClient(self.configuration)
+
+    def request(self, method, url, query_params=None, headers=None,
+                post_params=None, body=None, _preload_content=True,
+                _request_timeout=None):
+        response = self._request(method, url, query_params, headers, post_params, body,
+                                 _preload_content, _request_timeout)
+        if self.json_backend is not None and _preload_content and \
+                isinstance(response.data, bytes):
+            # keep the body bytes, the backend decodes them itself
+            response.data = RawBytes(response.data)
+        return response
+
+    def sanitize_for_serialization(self, obj):
+        if isinstance(obj, RawBody):
+            # built from plain JSON types and validated already
+            return obj
+        return super(IonosApiClient, self).sanitize_for_serialization(obj)
+
+    def deserialize(self, response, response_type):
+        backend = self.json_backend
+        if backend is None or response_type != 'object':
+            if isinstance(response.data, RawBytes):
+                response.data = bytes.decode(response.data, 'utf-8')
+            return super(IonosApiClient, self).deserialize(response, response_type)
+        data = response.data
+        try:
+            return backend.loads(data)
+        except ValueError:
+            return bytes.decode(data, 'utf-8') if isinstance(data, bytes) else data
+
+    def _request(self, method, url, query_params, headers, post_params, body,
+                 _preload_content, _request_timeout):
+        extra = current_query_params()
+        if extra:
+            query_params = [(k, v) for k, v in query_params or [] if k not in extra]
+            query_params.extend(sorted(extra.items()))
+
+        stream = getattr(_local, 'stream', None)
+        if stream is not None and method == 'GET':
+            _local.stream = None
+            stream.response = self._retry(method, url, query_params, headers, post_params,
+                                          body, False, _request_timeout)
+            return _EmptyResponse()
+
+        cache = self.response_cache
+        if method != 'GET':
+            try:
+                response = self._retry(method, url, query_params, headers, post_params, body,
+                                       _preload_content, _request_timeout)
+                track = getattr(self.polling, 'track', None)
+                if track is not None:
+                    track(method, url, response.getheader('location'))
+                return response
+            finally:
+                if cache is not None:
+                    cache.invalidate(url)
+                if self.name_resolver is not None:
+                    self.name_resolver.invalidate(method, url)
+
+        if cache is None:
+            return self._retry(method, url, query_params, headers, post_params, body,
+                               _preload_content, _request_timeout)
+
+        if not _preload_content:
+            return self._retry(method, url, query_params, headers, post_params, body,
+                               _preload_content, _request_timeout)
+        key = cache.key(url, query_params)
+        response = cache.get(key)
+        if response is None:
+            def send(url, query_params, extra_headers=None):
+                request_headers = dict(headers or {})
+                request_headers.update(extra_headers or {})
+                return self._retry(method, url, query_params, request_headers, post_params,
+                                   body, _preload_content, _request_timeout)
+            response = cache.fetch(key, query_params, send)
+        return response
+
+    def _retry(self, method, url, query_params, headers, post_params, body,
+               _preload_content, _request_timeout):
+        if self.retry_policy is None:
+            return self._send(method, url, query_params, headers, post_params, body,
+                              _preload_content, _request_timeout)
+
+        state = self.retry_policy.begin(method)
+        while True:
+            try:
+                response = self._send(method, url, query_params, headers, post_params, body,
+                                      _preload_content, _request_timeout)
+            except ApiException as e:
+                delay = state.retry_delay(status=e.status, headers=e.headers)
+                if delay is None:
+                    raise state.finish(e)
+            except urllib3.exceptions.HTTPError as e:
+                # connection reset, timeout, ...
+                delay = state.retry_delay(error=e)
+                if delay is None:
+                    raise state.finish(e)
+            else:
+                state.finish()
+                return response
+            state.sleep(delay)
+
+    def _send(self, method, url, query_params, headers, post_params, body,
+              _preload_content, _request_timeout):
+        backend = self.json_backend
+        if backend is not None and body is not None and \
+                method in ('POST', 'PUT', 'PATCH', 'OPTIONS', 'DELETE'):
+            body = EncodedBody(backend.dumps(body))
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        try:
+            return super(IonosApiClient, self).request(
+                method, url, query_params=query_params, headers=headers,
+                post_params=post_params, body=body, _preload_content=_preload_content,
+                _request_timeout=_request_timeout)
+        except ApiException as e:
+            if backend is not None and isinstance(e.body, bytes):
+                # decoded by the backend in IonosCoreProxy.cast_exception
+                e.body = RawBytes(e.body)
+                e.json_backend = backend
+            raise
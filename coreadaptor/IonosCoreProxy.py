@@ -8,6 +8,9 @@ from ionosenterprise.errors import (
     ICFailedRequest,
     ICTimeoutError
 )
+from ionosenterprise.keymap import camel_case
+from ionosenterprise.operations import Operation
+from coreadaptor.IonosApiClient import current_query_params, is_streaming
 import json
 import functools
 import re
@@ -44,15 +47,47 @@ class IonosCoreProxy:
             raise Exception("Failed to extract request ID from response "
                             "header 'location': '{location}'".format(location=headers['location']))
 
+    @staticmethod
+    def is_read(name):
+        return name.startswith('get_') or name.startswith('list_')
+
+    @staticmethod
+    def call_key(f, args, kwargs):
+        """
+        Returns a hashable key of a call with the defaults applied.
+
+        The first argument (the service) is not part of the key, the
+        extra query parameters of the thread are.
+        """
+        bound = inspect.signature(f).bind(*args, **kwargs)
+        bound.apply_defaults()
+        arguments = list(bound.arguments.items())[1:]
+        return f.__name__, repr(arguments), repr(current_query_params())
+
     @staticmethod
     def process_response(f):
-        @functools.wraps(f)
-        def func(*args, **kwargs):
+        def call(args, kwargs):
             try:
                 response = f(*args, **kwargs)
-                return IonosCoreProxy.handle_response_operations(f, response)
+                result = IonosCoreProxy.handle_response_operations(f, response)
             except Exception as e:
                 raise IonosCoreProxy.cast_exception(e)
+            if args and getattr(args[0], 'operations', False) and \
+                    not IonosCoreProxy.is_read(f.__name__):
+                request_id = None
+                if 'location' in response[2]:
+                    request_id = IonosCoreProxy._request_id(response[2])
+                return Operation.start(args[0], result, request_id)
+            return result
+
+        @functools.wraps(f)
+        def func(*args, **kwargs):
+            single_flight = getattr(args[0], 'single_flight', None) if args else None
+            if single_flight is not None and IonosCoreProxy.is_read(f.__name__) and \
+                    not is_streaming():
+                key = IonosCoreProxy.call_key(f, args, kwargs)
+                return single_flight.do(key, call, args, kwargs)
+            return call(args, kwargs)
         return func
 
     @staticmethod
@@ -64,18 +99,19 @@ class IonosCoreProxy:
             except Exception as e:
                 if type(e) == ApiException:
                     code = e.status
-                    msg = json.loads(e.body)
+                    msg = IonosCoreProxy._error_body(e)
                     url = e.url
                     if code == 401:
-                        raise ICNotAuthorizedError(code, msg, url)
+                        error = ICNotAuthorizedError(code, msg, url)
                     elif code == 404:
-                        raise ICNotFoundError(code, msg, url)
+                        error = ICNotFoundError(code, msg, url)
                     elif code == 422:
-                        raise ICValidationError(code, msg, url)
+                        error = ICValidationError(code, msg, url)
                     elif code == 429:
-                        raise ICRateLimitExceededError(code, msg, url)
+                        error = ICRateLimitExceededError(code, msg, url)
                     else:
-                        raise ICError(code, msg, url)
+                        error = ICError(code, msg, url)
+                    raise IonosCoreProxy._copy_retry_info(e, error)
                 elif type(e) == ApiTimeout:
                     raise ICTimeoutError(e.message, e.request_id)
                 elif type(e) == ApiFailedRequest:
@@ -83,24 +119,36 @@ class IonosCoreProxy:
                 raise e
         return func
 
+    @staticmethod
+    def _error_body(e):
+        # set by IonosApiClient when a JSON backend is used
+        backend = getattr(e, 'json_backend', None)
+        if backend is not None:
+            return backend.loads(e.body)
+        return json.loads(e.body)
+
+    @staticmethod
+    def _copy_retry_info(e, error):
+        # set by IonosApiClient when a RetryPolicy is used
+        error.retries = getattr(e, 'retries', 0)
+        error.retry_time = getattr(e, 'retry_time', 0.0)
+        return error
+
     @staticmethod
     def _underscore_to_camelcase(f):
-        def underscore_to_camelcase(value):
-            def camelcase():
-                yield str.lower
-                while True:
-                    yield str.capitalize
-            c = camelcase()
-            return "".join(next(c)(x) if x else '_' for x in value.split("_"))
         def myprint(d):
+            if isinstance(d, list):
+                for v in d:
+                    if isinstance(v, (dict, list)):
+                        myprint(v)
+                return
             for k in list(d):
                 v = d[k]
                 del d[k]
-                d[underscore_to_camelcase(k)] = v
-                if isinstance(v, dict):
+                d[camel_case(k)] = v
+                if isinstance(v, (dict, list)):
                     myprint(v)
 
-
         @functools.wraps(f)
         def func(*args, **kwargs):
             x = f(*args, **kwargs)
@@ -121,7 +169,7 @@ class IonosCoreProxy:
         if 'location' in response_headers:
             if return_data == '':
                 return_data = {}
-            elif type(return_data) != dict:
+            elif not isinstance(return_data, dict):
                 return_data = return_data.to_dict()
             return_data['requestId'] = IonosCoreProxy._request_id(response_headers)
 
@@ -134,20 +182,21 @@ class IonosCoreProxy:
         if type(e).__name__ == ApiException.__name__:
 
             code = e.status
-            msg = json.loads(e.body)
+            msg = IonosCoreProxy._error_body(e)
             url = e.url
 
             if 'messages' in msg:
                 msg = msg['messages']
 
             if code == 401:
-                raise ICNotAuthorizedError(code, msg, url)
-            if code == 404:
-                raise ICNotFoundError(code, msg, url)
-            if code == 422:
-                raise ICValidationError(code, msg, url)
-            if code == 429:
-                raise ICRateLimitExceededError(code, msg, url)
+                error = ICNotAuthorizedError(code, msg, url)
+            elif code == 404:
+                error = ICNotFoundError(code, msg, url)
+            elif code == 422:
+                error = ICValidationError(code, msg, url)
+            elif code == 429:
+                error = ICRateLimitExceededError(code, msg, url)
             else:
-                raise ICError(code, msg, url)
+                error = ICError(code, msg, url)
+            raise IonosCoreProxy._copy_retry_info(e, error)
         raise e
\ No newline at end of file
@@ -36,7 +36,6 @@ by stop/start actions
 import sys
 import os
 import traceback
-import time
 
 from argparse import ArgumentParser
 from argparse import RawDescriptionHelpFormatter
@@ -186,22 +185,21 @@ def wait_for_server(pbclient=None, dc_id=None, serverid=None,
         raise ValueError("argument 'dc_id' must not be None")
     if serverid is None:
         raise ValueError("argument 'serverid' must not be None")
-    total_sleep_time = 0
-    seconds = 5
-    while total_sleep_time < timeout:
-        time.sleep(seconds)
-        total_sleep_time += seconds
-        if total_sleep_time == 60:
-            # Increase polling interval after one minute
-            seconds = 10
-        elif total_sleep_time == 600:
-            # Increase polling interval after 10 minutes
-            seconds = 20
-        server = getServerStates(pbclient, dc_id, serverid)
-        if server[indicator] == state:
-            break
-    # end while(total_sleep_time)
-    return server
+    if indicator == 'vmstate':
+        def reached(server):
+            return server is not None and server['properties']['vmState'] == state
+    else:
+        def reached(server):
+            return server is not None and server['metadata']['state'] == state
+    # polls one listing of the servers of the data center
+    server = pbclient.wait_for_states(dc_id, {serverid: reached}, timeout=timeout)[serverid]
+    if isinstance(server, Exception):
+        # timed out, return the current states
+        return getServerStates(pbclient, dc_id, serverid)
+    return dict(id=server['id'],
+                name=server['properties']['name'],
+                state=server['metadata']['state'],
+                vmstate=server['properties']['vmState'])
 # end wait_for_server()
 
 
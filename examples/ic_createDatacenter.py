@@ -41,6 +41,7 @@ import json
 from base64 import b64decode, b64encode
 
 from ionosenterprise.client import IonosEnterpriseService
+from ionosenterprise.errors import ICFailedRequest, ICTimeoutError
 from ionosenterprise.client import Datacenter, Volume, Server
 from ionosenterprise.client import LAN, NIC, FirewallRule
 
@@ -125,62 +126,34 @@ def wait_for_request(pbclient, request_id,
 # end wait_for_request()
 
 
-def wait_for_requests(pbclient, request_ids=None,
-                      timeout=0, initial_wait=5, scaleup=10):
+def wait_for_requests(pbclient, request_ids=None, timeout=0):
     '''
     Waits for a list of requests to finish until timeout.
     timeout==0 is interpreted as infinite wait time.
     Returns a dict of request_id -> result.
     result is a tuple (return code, request status, message) where return code
     0  : request successful
-    1  : request failed
+    1  : request failed, or its status could not be read
     -1 : timeout exceeded
-    The wait_period is increased every scaleup steps to adjust for long
-    running requests.
+    The requests are polled together by pbclient.wait_for_all(), on the
+    polling schedule of the client.
     '''
     done = dict()
     if not request_ids:
         print("empty request list")
         return done
-    total_wait = 0
-    wait_period = initial_wait
-    next_scaleup = scaleup * wait_period
-    wait = True
-    while wait:
-        for request_id in request_ids:
-            if request_id in done:
-                continue
-            request_status = pbclient.get_request(request_id, status=True)
-            state = request_status['metadata']['status']
-            if state == "DONE":
-                done[request_id] = (0, state, request_status['metadata']['message'])
-                print("Request '{}' is in state '{}'.".format(request_id, state))
-            if state == 'FAILED':
-                done[request_id] = (1, state, request_status['metadata']['message'])
-                print("Request '{}' is in state '{}'.".format(request_id, state))
-        # end for(request_ids)
-        if len(done) == len(request_ids):
-            wait = False
+    results = pbclient.wait_for_all(request_ids, timeout=timeout or None)
+    for request_id, result in zip(request_ids, results):
+        if isinstance(result, ICTimeoutError):
+            done[request_id] = (-1, 'RUNNING', "request not finished before timeout")
+        elif isinstance(result, ICFailedRequest):
+            done[request_id] = (1, 'FAILED', result.msg)
+        elif isinstance(result, Exception):
+            done[request_id] = (1, 'UNKNOWN', "request status not readable: {}"
+                                .format(getattr(result, 'content', result)))
         else:
-            print("{} of {} requests are finished. Sleeping for {} seconds..."
-                  .format(len(done), len(request_ids), wait_period))
-            sleep(wait_period)
-            total_wait += wait_period
-            if timeout != 0 and total_wait > timeout:
-                wait = False
-            next_scaleup -= wait_period
-            if next_scaleup == 0:
-                wait_period += initial_wait
-                next_scaleup = scaleup * wait_period
-                print("scaling up wait_period to {}, next change in {} seconds"
-                      .format(wait_period, next_scaleup))
-        # end if/else(done)
-    # end while(wait)
-    if len(done) != len(request_ids):
-        for request_id in request_ids:
-            if request_id in done:
-                continue
-            done[request_id] = (-1, state, "request not finished before timeout")
+            done[request_id] = (0, 'DONE', result['message'])
+        print("Request '{}' is in state '{}'.".format(request_id, done[request_id][1]))
     return done
 # end wait_for_requests()
 
@@ -553,7 +526,7 @@ USAGE
         # end for(volume)
     # end for(server)
     if requests:
-        result = wait_for_requests(pbclient, requests, initial_wait=10, scaleup=15)
+        result = wait_for_requests(pbclient, requests)
         print("wait loop returned {}".format(str(result)))
         tmpfile = usefile+".tmp_postvol"
         write_dc_definition(dcdef, tmpfile)
@@ -576,7 +549,7 @@ USAGE
             requests.append(response['requestId'])
     # end for(server)
     if requests:
-        result = wait_for_requests(pbclient, requests, initial_wait=10, scaleup=15)
+        result = wait_for_requests(pbclient, requests)
         print("wait loop returned {}".format(str(result)))
         tmpfile = usefile+".tmp_postsrv"
         write_dc_definition(dcdef, tmpfile)
@@ -56,8 +56,6 @@ for reports or automatic post processing.
 import sys
 import os
 import traceback
-import re
-import pprint
 
 from argparse import ArgumentParser
 from argparse import RawDescriptionHelpFormatter
@@ -66,6 +64,7 @@ from getpass import getpass
 import csv
 
 from ionosenterprise.client import IonosEnterpriseService
+from ionosenterprise.inventory import DEPTHS, crawl
 
 __all__ = []
 __version__ = 0.2
@@ -76,18 +75,6 @@ verbose = 0
 DEBUG = 1
 
 
-def pp(value):
-    """
-    Returns a pretty print string of the given value.
-
-    @return: pretty print string
-    @rtype: str
-    """
-
-    pretty_printer = pprint.PrettyPrinter(indent=4)
-    return pretty_printer.pformat(value)
-
-
 class CLIError(Exception):
     '''Generic exception to raise and log different fatal errors.'''
 
@@ -102,243 +89,95 @@ class CLIError(Exception):
         return self.msg
 
 
-def get_dc_inventory(pbclient, dc=None):
-    ''' gets inventory of one data center'''
-    if pbclient is None:
-        raise ValueError("argument 'pbclient' must not be None")
-    if dc is None:
-        raise ValueError("argument 'dc' must not be None")
+def get_dc_inventory(inventory, dc):
+    ''' returns the server and storage rows of one data center'''
     dc_inv = []   # inventory list to return
-    dcid = dc['id']
     # dc_data contains dc specific columns
-    dc_data = [dcid, dc['properties']['name'], dc['properties']['location']]
-    # first get the servers
-    # this will build a hash to relate volumes to servers later
-    # depth 3 is enough to get into volume/nic level plus details
-    servers = pbclient.list_servers(dcid, 3)
-    print("found %i servers in data center %s" % (len(servers['items']), dc['properties']['name']))
-    if verbose > 2:
-        print(str(servers))
-    # this will build a hash to relate volumes to servers later
-    bound_vols = dict()   # hash volume-to-server relations
-    for server in servers['items']:
-        if verbose > 2:
-            print("SERVER: %s" % str(server))
-        serverid = server['id']
-        # server_data contains server specific columns for later output
-        server_data = [
-            server['type'], serverid, server['properties']['name'],
-            server['metadata']['state']
-        ]
+    dc_data = [dc.id, dc.name, dc.properties['location']]
+    for server in inventory.of_type('server', dc.id):
         # OS is determined by boot device (volume||cdrom), not a server property.
         # Might even be unspecified
         bootOS = "NONE"
-        bootdev = server['properties']['bootVolume']
-        if bootdev is None:
-            bootdev = server['properties']['bootCdrom']
-            print("server %s has boot device %s" % (serverid, "CDROM"))
+        bootdev = server.properties['bootVolume'] or server.properties['bootCdrom']
         if bootdev is None:
-            print("server %s has NO boot device" % (serverid))
+            print("server %s has NO boot device" % (server.id))
         else:
             bootOS = bootdev['properties']['licenceType']
-        server_data += [bootOS, server['properties']['cores'], server['properties']['ram']]
-        server_vols = server['entities']['volumes']['items']
-        n_volumes = len(server_vols)
-        total_disk = 0
-        licence_type = ""
-        for vol in server_vols:
-            total_disk += vol['properties']['size']
-            licence_type = str(vol['properties']['licenceType'])
-            bound_vols[vol['id']] = serverid
-            if verbose:
-                print("volume %s is connected to %s w/ OS %s" % (
-                    vol['id'], bound_vols[vol['id']], licence_type))
-        server_nics = server['entities']['nics']['items']
-        n_nics = len(server_nics)
-        server_data += [
-            n_nics, n_volumes, total_disk, "",
-            server['metadata']['createdDate'], server['metadata']['lastModifiedDate']
-        ]
-        dc_inv.append(dc_data + server_data)
-    # end for(servers)
-
-    # and now the volumes...
-    volumes = pbclient.list_volumes(dcid, 2)   # depth 2 gives max. details
-    for volume in volumes['items']:
-        if verbose > 2:
-            print("VOLUME: %s" % str(volume))
-        volid = volume['id']
-        vol_data = [
-            volume['type'], volid, volume['properties']['name'], volume['metadata']['state'],
-            volume['properties']['licenceType'], "", "", "", "", volume['properties']['size']
-        ]
-        connect = 'NONE'
-        if volid in bound_vols:
-            connect = bound_vols[volid]
-        vol_data += [
-            connect, volume['metadata']['createdDate'], volume['metadata']['lastModifiedDate']
-        ]
-        dc_inv.append(dc_data + vol_data)
-    # end for(volumes)
+        volumes = inventory.children(server.id, 'volume')
+        dc_inv.append(dc_data + [
+            server.type, server.id, server.name, server.metadata['state'],
+            bootOS, server.properties['cores'], server.properties['ram'],
+            len(inventory.children(server.id, 'nic')), len(volumes),
+            sum(volume.properties['size'] for volume in volumes), "",
+            server.metadata['createdDate'], server.metadata['lastModifiedDate']
+        ])
+    for volume in inventory.of_type('volume', dc.id):
+        dc_inv.append(dc_data + [
+            volume.type, volume.id, volume.name, volume.metadata['state'],
+            volume.properties['licenceType'], "", "", "", "", volume.properties['size'],
+            volume.parent_id or 'NONE',
+            volume.metadata['createdDate'], volume.metadata['lastModifiedDate']
+        ])
     return dc_inv
 # end get_dc_inventory()
 
 
-def get_images(pbclient):
-    if pbclient is None:
-        raise ValueError("argument 'pbclient' must not be None")
-    print("getting images..")
-    images = pbclient.list_images()
-    print("found %i images" % len(images['items']))
+def get_images(inventory):
+    ''' returns the rows of the images and snapshots'''
     img_inv = []
-    for image in images['items']:
-        if verbose > 2:
-            print("IMAGE: %s" % str(image))
-        img_data = [
-            ('public' if image['properties']['public'] else 'private'),
-            image['properties']['location'], image['type'],
-            image['properties']['imageType'], image['id'], image['properties']['name'],
-            image['metadata']['state'], image['properties']['licenceType'],
-            image['properties']['size'],
-            image['metadata']['createdDate'], image['metadata']['lastModifiedDate']
-        ]
-        img_inv.append(img_data)
+    for image in inventory.of_type('image') + inventory.of_type('snapshot'):
+        if image.type == 'image':
+            visibility = 'public' if image.properties['public'] else 'private'
+            sub_type = image.properties['imageType']
+        else:
+            visibility, sub_type = 'private', 'HDD'
+        img_inv.append([
+            visibility, image.properties['location'], image.type, sub_type,
+            image.id, image.name, image.metadata['state'],
+            image.properties['licenceType'], image.properties['size'],
+            image.metadata['createdDate'], image.metadata['lastModifiedDate']
+        ])
     return img_inv
 # end get_images()
 
 
-def get_snapshots(pbclient):
-    if pbclient is None:
-        raise ValueError("argument 'pbclient' must not be None")
-    print("getting snapshots..")
-    snapshots = pbclient.list_snapshots()
-    print("found %i snapshots" % len(snapshots['items']))
-    snap_inv = []
-    for snap in snapshots['items']:
-        if verbose > 2:
-            print("SNAPSHOT: %s" % str(snap))
-        snap_data = [
-            "private", snap['properties']['location'],
-            snap['type'], "HDD", snap['id'], snap['properties']['name'],
-            snap['metadata']['state'], snap['properties']['licenceType'],
-            snap['properties']['size'],
-            snap['metadata']['createdDate'], snap['metadata']['lastModifiedDate']
-        ]
-        # print("SNAPSHOT: %s" % str(snap_data))
-        snap_inv.append(snap_data)
-    # end for(snapshots)
-    return snap_inv
-# end get_snapshots()
-
-
-def get_ipblocks(pbclient):
-    if pbclient is None:
-        raise ValueError("argument 'pbclient' must not be None")
-    print("getting IP blocks..")
-    ipblocks = pbclient.list_ipblocks()
-    print("found %i IP blocks" % len(ipblocks['items']))
-    ip_inv = []
-    if verbose > 1:
-        print(str(ipblocks))
-    for block in ipblocks['items']:
-        ip_data = [
-            block['properties']['location'], block['type'], block['id'],
-            block['metadata']['state'], block['properties']['size']
-        ]
-        ip_data.extend(block['properties']['ips'])
-        # print str(ip_data)
-        ip_inv.append(ip_data)
-    # end for(ipblocks)
-    return ip_inv
+def get_ipblocks(inventory):
+    ''' returns the rows of the reserved IP blocks'''
+    return [[block.properties['location'], block.type, block.id,
+             block.metadata['state'], block.properties['size']] + block.properties['ips']
+            for block in inventory.of_type('ipblock')]
 # end get_ipblocks()
 
 
-def get_dc_network(pbclient, dc=None):
-    ''' gets inventory of one data center'''
-    if pbclient is None:
-        raise ValueError("argument 'pbclient' must not be None")
-    if dc is None:
-        raise ValueError("argument 'dc' must not be None")
-    print("getting networks..")
-    dcid = dc['id']
-    # dc_data contains dc specific columns
-    dc_data = [dcid, dc['properties']['name'], dc['properties']['location']]
-    lbs = pbclient.list_loadbalancers(dcid, 2)
-    # build lookup hash for loadbalancer's ID->name
-    lbnames = dict([(lb['id'], lb['properties']['name']) for lb in lbs['items']])
-    if verbose > 2:
-        print("LBs: %s" % (str(lbs)))
-    lans = pbclient.list_lans(dcid, 3)
+def get_dc_network(inventory, dc):
+    ''' returns the LAN and NIC rows of one data center'''
     lan_inv = []
-    # lookup hash for server's ID->name
-    servernames = dict()
-    for lan in lans['items']:
-        if verbose > 1:
-            print("LAN: %s" % str(lan))
+    dc_data = [dc.id, dc.name, dc.properties['location']]
+    for lan in inventory.of_type('lan', dc.id):
+        nics = [nic for nic in inventory.of_type('nic', dc.id)
+                if str(nic.properties['lan']) == lan.id]
         lan_data = dc_data + [
-            "LAN "+lan['id'], lan['properties']['name'], lan['properties']['public'],
-            lan['metadata']['state']
+            "LAN "+lan.id, lan.name, lan.properties['public'], lan.metadata['state'], len(nics)
         ]
-        nics = lan['entities']['nics']['items']
-        lan_data.append(len(nics))
-        if nics:
-            for nic in nics:
-                nic_props = nic['properties']
-                # get the serverid of this nic by href
-                # !!! HUUUUH this might also be a loadbalancer ID,
-                # although it's '/servers/<id>/...' !!!
-                serverid = re.sub(r'^.*servers/([^/]+)/nics.*', r'\1', nic['href'])
-                if serverid in lbnames:
-                    servertype = "LB"
-                    servername = lbnames[serverid]
-                    print("server entry for %s is LOADBALANCER %s" % (serverid, servername))
-                else:
-                    servertype = "Server"
-                    if serverid not in servernames:
-                        if verbose:
-                            print("add server entry for %s" % serverid)
-                        server = pbclient.get_server(dcid, serverid, 0)
-                        servernames[serverid] = server['properties']['name']
-                    servername = servernames[serverid]
-                # end if/else(serverid)
-                ips = [str(ip) for ip in nic_props['ips']]
-                nic_data = [
-                    nic['id'], nic_props['mac'], nic_props['dhcp'], ips, nic_props['name'],
-                    nic_props['firewallActive'], servertype, serverid, servername
-                ]
-                lan_inv.append(lan_data+nic_data)
-            # end for(nics)
-        else:
+        if not nics:
             lan_inv.append(lan_data)
-    # end for(lans)
+        for nic in nics:
+            server = inventory.get(nic.parent_id, dc.id)
+            lan_inv.append(lan_data + [
+                nic.id, nic.properties['mac'], nic.properties['dhcp'],
+                [str(ip) for ip in nic.properties['ips']], nic.name,
+                nic.properties['firewallActive'], "Server", server.id, server.name
+            ])
     return lan_inv
-# end get_networks()
-
-
-def get_requests(pbclient):
-    if pbclient is None:
-        raise ValueError("argument 'pbclient' must not be None")
-    print("getting requests..")
-    requests = pbclient.list_requests()   # higher depth gives no more details (API-doc BUG)
-    print("found %i requests" % len(requests['items']))
-    if verbose:
-        print("global: %s" % str(requests))
-    for req in requests['items']:
-        reqid = req['id']
-        # False: get request (w/ body), True: get request status (DONE,..)
-        req_data = pbclient.get_request(reqid)
-        # False: get request (w/ body), True: get request status (DONE,..)
-        req_stat = pbclient.get_request(reqid, True)
-        if verbose > 2:
-            print("REQ: %s\n     %s" % (str(req_data), str(req_stat)))
-        if verbose > 1:
-            print(
-                "request %s|%s|%s" % (
-                    str(reqid), str(req_data['metadata']), str(req_stat['metadata'])
-                )
-            )
-    # end for(requests)
-# end get_requests()
+# end get_dc_network()
+
+
+def write_csv(filename, header, rows):
+    with open(filename, 'w') as csvfile:
+        csvwriter = csv.writer(csvfile, delimiter=';', lineterminator='\n')
+        csvwriter.writerow(header)
+        for row in rows:
+            csvwriter.writerow(row)
 
 
 def main(argv=None):                # IGNORE:C0111
@@ -389,9 +228,9 @@ USAGE
         parser.add_argument(
             '-n', '--network', dest='show_networks', action="store_true",
             help='show network assignments')
-#        parser.add_argument(
-#            '-r', '--request', dest='show_requests', action="store_true",
-#            help='show requests')
+        parser.add_argument(
+            '-w', '--workers', dest='workers', type=int, default=8,
+            help='number of concurrent API requests [default: %(default)s]')
         parser.add_argument(
             "-v", "--verbose", dest="verbose", action="count", default=0,
             help="set verbosity level [default: %(default)s]")
@@ -413,91 +252,53 @@ USAGE
             print("Verbose mode on")
             print("using python ", sys.version_info)
 
-        pbclient = IonosEnterpriseService(user, password)
+        pbclient = IonosEnterpriseService(user, password, pool_size=args.workers)
 
+        # only list the collections of the data centers the files need
+        collections = set()
         if datacenterid is not None:
-            datacenters = {}
-            if datacenterid == '*':
-                # the default depth=1 is sufficient, higher values don't provide more details
-                datacenters = pbclient.list_datacenters()
-            else:
-                datacenters['items'] = []
-                datacenters['items'] = [pbclient.get_datacenter(datacenterid, 1)]
-            if verbose > 1:
-                print(pp(datacenters))
-            print("retrieved %i datacenters " % len(datacenters['items']))
-
-            # dump inventory to file
-            with open("pb_datacenter_inventory.csv", 'w') as csvfile:
-                csvwriter = csv.writer(csvfile, delimiter=';', lineterminator='\n')
-                csvwriter.writerow([
-                    'DCID', 'DCName', 'Loc', 'RscType', 'RscID', 'RscName', 'State', 'LicType',
-                    'Cores', 'RAM', '# NICs', '# Volumes', '(Total) Storage', 'Connected to',
-                    'Created', 'Modified'
-                ])
-                for dc in datacenters['items']:
-                    try:
-                        dc_inv = get_dc_inventory(pbclient, dc)
-                        if verbose:
-                            print("DC %s has %i inventory entries" % (dc['id'], len(dc_inv)))
-                        for row in dc_inv:
-                            csvwriter.writerow(row)
-                    except Exception:
-                        traceback.print_exc()
-                        exit(2)
-                # end for(datacenters)
+            collections.update(['servers', 'volumes'])
+        if args.show_networks:
+            collections.update(['servers', 'lans'])
+        depths = dict((collection, DEPTHS[collection]) for collection in collections)
+        inventory = crawl(
+            pbclient, datacenter_ids=None if datacenterid in (None, '*') else [datacenterid],
+            max_workers=args.workers, depths=depths,
+            account=args.show_images or args.show_ipblocks)
+        print("retrieved %i datacenters " % len(inventory.datacenters))
+        if verbose:
+            print("found %s" % inventory.counts())
+        for dcid, collection, error in inventory.errors:
+            print("failed to get %s of DC %s: %s" % (collection, dcid, error.content))
+        if inventory.errors:
+            exit(2)
+
+        if datacenterid is not None:
+            write_csv("pb_datacenter_inventory.csv", [
+                'DCID', 'DCName', 'Loc', 'RscType', 'RscID', 'RscName', 'State', 'LicType',
+                'Cores', 'RAM', '# NICs', '# Volumes', '(Total) Storage', 'Connected to',
+                'Created', 'Modified'
+            ], [row for dc in inventory.datacenters for row in get_dc_inventory(inventory, dc)])
 
         if args.show_images:
-            with open("pb_datacenter_images.csv", 'w') as csvfile:
-                csvwriter = csv.writer(csvfile, delimiter=';', lineterminator='\n')
-                csvwriter.writerow([
-                    'Visibility', 'Loc', 'RscType', 'SubType', 'RscID', 'RscName',
-                    'State', 'LicType', 'Size', 'Created', 'Modified'
-                ])
-                img_inv = get_images(pbclient)
-                for row in img_inv:
-                    csvwriter.writerow(row)
-                snap_inv = get_snapshots(pbclient)
-                for row in snap_inv:
-                    csvwriter.writerow(row)
+            write_csv("pb_datacenter_images.csv", [
+                'Visibility', 'Loc', 'RscType', 'SubType', 'RscID', 'RscName',
+                'State', 'LicType', 'Size', 'Created', 'Modified'
+            ], get_images(inventory))
 
         if args.show_ipblocks:
-            with open("pb_datacenter_ipblocks.csv", 'w') as csvfile:
-                csvwriter = csv.writer(csvfile, delimiter=';', lineterminator='\n')
-                csvwriter.writerow([
-                    'Loc', 'RscType', 'RscID', 'State', 'Size', 'IP addresses'])
-                ipblocks = get_ipblocks(pbclient)
-                for row in ipblocks:
-                    csvwriter.writerow(row)
-
-        # file is automatically closed after with block
+            write_csv("pb_datacenter_ipblocks.csv", [
+                'Loc', 'RscType', 'RscID', 'State', 'Size', 'IP addresses'
+            ], get_ipblocks(inventory))
+
         if args.show_networks:
-            # the default depth=1 is sufficient, higher values don't provide more details
-            datacenters = pbclient.list_datacenters()
-            print("retrieved %i datacenters " % len(datacenters['items']))
-            with open("pb_datacenter_networks.csv", 'w') as csvfile:
-                csvwriter = csv.writer(csvfile, delimiter=';', lineterminator='\n')
-                csvwriter.writerow([
-                    'DCID', 'DCName', 'Loc',
-                    'LAN ID', 'LAN name', 'public', 'State', '# NICs',
-                    'NIC ID', 'MAC address', 'DHCP', 'IP(s)', 'NIC name', 'Firewall',
-                    'Connected to', 'ID', 'Name'])
-
-                for dc in datacenters['items']:
-                    try:
-                        dc_net = get_dc_network(pbclient, dc)
-                        if verbose:
-                            print("DC %s has %i network entries" % (dc['id'], len(dc_net)))
-                        for row in dc_net:
-                            csvwriter.writerow(row)
-                    except Exception:
-                        traceback.print_exc()
-                        exit(2)
-                # end for(datacenters)
-
-        # just for fun:
-#         if args.show_requests:
-#             get_requests(pbclient)
+            write_csv("pb_datacenter_networks.csv", [
+                'DCID', 'DCName', 'Loc',
+                'LAN ID', 'LAN name', 'public', 'State', '# NICs',
+                'NIC ID', 'MAC address', 'DHCP', 'IP(s)', 'NIC name', 'Firewall',
+                'Connected to', 'ID', 'Name'
+            ], [row for dc in inventory.datacenters for row in get_dc_network(inventory, dc)])
+
         print("%s finished w/o errors" % program_name)
         return 0
     except KeyboardInterrupt:
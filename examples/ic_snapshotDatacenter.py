@@ -49,6 +49,7 @@ import json
 from base64 import b64decode, b64encode
 
 from ionosenterprise.client import IonosEnterpriseService
+from ionosenterprise.errors import ICFailedRequest, ICTimeoutError
 
 
 __all__ = []
@@ -162,62 +163,34 @@ def wait_for_request(pbclient, request_id,
 # end wait_for_request()
 
 
-def wait_for_requests(pbclient, request_ids=None,
-                      timeout=0, initial_wait=5, scaleup=10):
+def wait_for_requests(pbclient, request_ids=None, timeout=0):
     '''
     Waits for a list of requests to finish until timeout.
     timeout==0 is interpreted as infinite wait time.
     Returns a dict of request_id -> result.
     result is a tuple (return code, request status, message) where return code
     0  : request successful
-    1  : request failed
+    1  : request failed, or its status could not be read
     -1 : timeout exceeded
-    The wait_period is increased every scaleup steps to adjust for long
-    running requests.
+    The requests are polled together by pbclient.wait_for_all(), on the
+    polling schedule of the client.
     '''
     done = dict()
     if not request_ids:
         print("empty request list")
         return done
-    total_wait = 0
-    wait_period = initial_wait
-    next_scaleup = scaleup * wait_period
-    wait = True
-    while wait:
-        for request_id in request_ids:
-            if request_id in done:
-                continue
-            request_status = pbclient.get_request(request_id, status=True)
-            state = request_status['metadata']['status']
-            if state == "DONE":
-                done[request_id] = (0, state, request_status['metadata']['message'])
-                print("Request '{}' is in state '{}'.".format(request_id, state))
-            if state == 'FAILED':
-                done[request_id] = (1, state, request_status['metadata']['message'])
-                print("Request '{}' is in state '{}'.".format(request_id, state))
-        # end for(request_ids)
-        if len(done) == len(request_ids):
-            wait = False
+    results = pbclient.wait_for_all(request_ids, timeout=timeout or None)
+    for request_id, result in zip(request_ids, results):
+        if isinstance(result, ICTimeoutError):
+            done[request_id] = (-1, 'RUNNING', "request not finished before timeout")
+        elif isinstance(result, ICFailedRequest):
+            done[request_id] = (1, 'FAILED', result.msg)
+        elif isinstance(result, Exception):
+            done[request_id] = (1, 'UNKNOWN', "request status not readable: {}"
+                                .format(getattr(result, 'content', result)))
         else:
-            print("{} of {} requests are finished. Sleeping for {} seconds..."
-                  .format(len(done), len(request_ids), wait_period))
-            sleep(wait_period)
-            total_wait += wait_period
-            if timeout != 0 and total_wait > timeout:
-                wait = False
-            next_scaleup -= wait_period
-            if next_scaleup == 0:
-                wait_period += initial_wait
-                next_scaleup = scaleup * wait_period
-                print("scaling up wait_period to {}, next change in {} seconds"
-                      .format(wait_period, next_scaleup))
-        # end if/else(done)
-    # end while(wait)
-    if len(done) != len(request_ids):
-        for request_id in request_ids:
-            if request_id in done:
-                continue
-            done[request_id] = (-1, state, "request not finished before timeout")
+            done[request_id] = (0, 'DONE', result['message'])
+        print("Request '{}' is in state '{}'.".format(request_id, done[request_id][1]))
     return done
 # end wait_for_requests()
 
@@ -318,22 +291,21 @@ def wait_for_server(pbclient=None, dc_id=None, serverid=None,
         raise ValueError("argument 'dc_id' must not be None")
     if serverid is None:
         raise ValueError("argument 'serverid' must not be None")
-    total_sleep_time = 0
-    seconds = 5
-    while total_sleep_time < timeout:
-        sleep(seconds)
-        total_sleep_time += seconds
-        if total_sleep_time == 60:
-            # Increase polling interval after one minute
-            seconds = 10
-        elif total_sleep_time == 600:
-            # Increase polling interval after 10 minutes
-            seconds = 20
-        server = getServerStates(pbclient, dc_id, serverid)
-        if server[indicator] == state:
-            break
-    # end while(total_sleep_time)
-    return server
+    if indicator == 'vmstate':
+        def reached(server):
+            return server is not None and server['properties']['vmState'] == state
+    else:
+        def reached(server):
+            return server is not None and server['metadata']['state'] == state
+    # polls one listing of the servers of the data center
+    server = pbclient.wait_for_states(dc_id, {serverid: reached}, timeout=timeout)[serverid]
+    if isinstance(server, Exception):
+        # timed out, return the current states
+        return getServerStates(pbclient, dc_id, serverid)
+    return dict(id=server['id'],
+                name=server['properties']['name'],
+                state=server['metadata']['state'],
+                vmstate=server['properties']['vmState'])
 # end wait_for_server()
 
 
@@ -0,0 +1,335 @@
+# Copyright 2015-2019 IONOS
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+asyncio client for the Ionos Enterprise API.
+
+AsyncIonosEnterpriseService offers every method of IonosEnterpriseService
+as a coroutine. The requests are built by the regular resource methods,
+so arguments, error types and returned dicts are the same; only the HTTP
+transport is replaced by a pooled aiohttp session.
+"""
+
+import asyncio
+import json
+import logging
+import ssl
+import time
+
+import certifi
+import ionoscloud
+from ionoscloud.exceptions import ApiException
+from six.moves.urllib.parse import urlencode
+
+from coreadaptor.IonosCoreProxy import IonosCoreProxy
+
+try:
+    import aiohttp
+    HAS_AIOHTTP = True
+except ImportError:
+    HAS_AIOHTTP = False
+
+from ionosenterprise import API_HOST
+from ionosenterprise.client import IonosEnterpriseService, HAS_KEYRING
+from ionosenterprise.errors import ICFailedRequest, ICTimeoutError
+from ionosenterprise.polling import FixedPolling
+from ionosenterprise.requests import IonosEnterpriseRequests
+from ionosenterprise.utils import find_item_by_name
+
+
+class _RequestCapture(Exception):
+    """Carries the HTTP request a resource method wanted to send."""
+    def __init__(self, method, url, query_params, headers, post_params, body):
+        super(_RequestCapture, self).__init__(method, url)
+        self.method = method
+        self.url = url
+        self.query_params = query_params
+        self.headers = headers
+        self.post_params = post_params
+        self.body = body
+        self.response_type = None
+
+
+class _CaptureApiClient(ionoscloud.ApiClient):
+    """
+    ApiClient that raises the prepared request instead of sending it.
+
+    Every raised request is also appended to ``captured``, so a method
+    that catches the first one and goes on to another request is noticed.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super(_CaptureApiClient, self).__init__(*args, **kwargs)
+        self.captured = []
+
+    def call_api(self, *args, **kwargs):  # pylint: disable=arguments-differ
+        try:
+            return super(_CaptureApiClient, self).call_api(*args, **kwargs)
+        except _RequestCapture as capture:
+            capture.response_type = kwargs.get('response_type')
+            raise
+
+    def request(self, method, url, query_params=None, headers=None,
+                post_params=None, body=None, _preload_content=True,
+                _request_timeout=None):
+        capture = _RequestCapture(method, url, query_params, headers, post_params, body)
+        self.captured.append(capture)
+        raise capture
+
+
+class _RequestBuilder(IonosEnterpriseService):
+    """Synchronous service whose API calls are captured, not sent."""
+
+    def _create_api_client(self):
+        api_client = super(_RequestBuilder, self)._create_api_client()
+        capture_client = _CaptureApiClient(api_client.configuration)
+        capture_client.user_agent = api_client.user_agent
+        return capture_client
+
+
+class _Response(object):
+    """Minimal response object for ApiClient.deserialize()."""
+    def __init__(self, data):
+        self.data = data
+
+
+class AsyncIonosEnterpriseService(object):
+    """
+        asyncio variant of IonosEnterpriseService
+
+        Takes the same arguments as IonosEnterpriseService and additionally:
+
+        :param      pool_size: Maximum number of simultaneous connections.
+        :type       pool_size: ``int``
+
+        :param      timeout: Total timeout of a single request in seconds.
+        :type       timeout: ``float``
+
+        :param      polling: Polling strategy of wait_for_completion(), see
+                             IonosEnterpriseService.
+        :type       polling: ``AdaptivePolling``
+    """
+
+    def __init__(self, username=None, password=None, host_base=API_HOST,
+                 host_cert=None, ssl_verify=True, headers=None, client_user_agent=None,
+                 use_config=True, use_keyring=HAS_KEYRING, config_filename=None,
+                 pool_size=100, timeout=None, polling=None):
+        if not HAS_AIOHTTP:
+            raise Exception("Missing dependency for the asyncio client. Please install "
+                            "the 'aiohttp' Python module.")
+        self._builder = _RequestBuilder(
+            username=username, password=password, host_base=host_base, host_cert=host_cert,
+            ssl_verify=ssl_verify, headers=headers, client_user_agent=client_user_agent,
+            use_config=use_config, use_keyring=use_keyring, config_filename=config_filename,
+            polling=polling)
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self._session = None
+
+    @property
+    def username(self):
+        return self._builder.username
+
+    @property
+    def host_base(self):
+        return self._builder.host_base
+
+    @property
+    def polling(self):
+        return self._builder.polling
+
+    def _ssl_context(self):
+        verify = self._builder.verify
+        if verify is False:
+            return False
+        context = ssl.create_default_context(
+            cafile=verify if isinstance(verify, str) else certifi.where())
+        cert = self._builder.host_cert
+        if cert:
+            if isinstance(cert, (tuple, list)):
+                context.load_cert_chain(*cert)
+            else:
+                context.load_cert_chain(cert)
+        return context
+
+    def get_session(self):
+        """
+        Returns the aiohttp session, creating it on first use.
+
+        Must be called from within the running event loop.
+        """
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.pool_size, ssl=self._ssl_context())
+            timeout = aiohttp.ClientTimeout(total=self.timeout)
+            self._session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+        return self._session
+
+    async def close(self):
+        """
+        Closes the pooled connections.
+        """
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    def _capture(self, name, args, kwargs):
+        # Only the first request of a call is captured, the builder cannot
+        # go on without its response. A call that issues more than one
+        # request is refused before anything is sent.
+        captured = self._builder.get_api_client().captured
+        del captured[:]
+        try:
+            getattr(self._builder, name)(*args, **kwargs)
+        except _RequestCapture:
+            pass
+        if not captured:
+            raise Exception("'{}' did not issue an API request".format(name))
+        if len(captured) > 1:
+            raise Exception("'{}' issued {} API requests, the asyncio client can only "
+                            "send a single one per call".format(name, len(captured)))
+        return captured[0]
+
+    async def _send(self, capture):
+        method = capture.method.upper()
+        url = capture.url
+        headers = dict(capture.headers or {})
+        headers.update(self._builder.headers)
+        if 'Content-Type' not in headers:
+            headers['Content-Type'] = 'application/json'
+        if capture.query_params:
+            url += '?' + urlencode(capture.query_params)
+
+        data = None
+        if method in ['POST', 'PUT', 'PATCH', 'OPTIONS', 'DELETE']:
+            if 'json' in headers['Content-Type'].lower():
+                if capture.body is not None:
+                    data = json.dumps(capture.body)
+            elif capture.post_params:
+                data = urlencode(capture.post_params)
+
+        async with self.get_session().request(method, url, data=data,
+                                              headers=headers) as response:
+            body = await response.read()
+            return response.status, response.reason, response.headers, body, url
+
+    async def _call(self, name, args, kwargs):
+        func = getattr(IonosEnterpriseRequests, name)
+        try:
+            capture = self._capture(name, args, kwargs)
+            status, reason, headers, body, url = await self._send(capture)
+            if not 200 <= status <= 299:
+                error = ApiException(status=status, reason=reason)
+                error.body = body.decode('utf-8')
+                error.url = url
+                raise error
+        except Exception as e:
+            raise IonosCoreProxy.cast_exception(e)
+
+        track = getattr(self.polling, 'track', None)
+        if track is not None and capture.method.upper() != 'GET':
+            track(capture.method, capture.url, headers.get('location'))
+
+        return_data = None
+        if capture.response_type:
+            return_data = self._builder.get_api_client().deserialize(
+                _Response(body.decode('utf-8')), capture.response_type)
+        return IonosCoreProxy.handle_response_operations(func, (return_data, status, headers))
+
+    async def get_datacenter_by_name(self, name, depth=1):
+        """
+        Retrieves a data center by its name.
+
+        See IonosEnterpriseService.get_datacenter_by_name().
+        """
+        all_data_centers = (await self.list_datacenters(depth=1))['items']
+        data_center = find_item_by_name(all_data_centers, lambda i: i['properties']['name'], name)
+        if not data_center:
+            raise NameError("No data center found with name "
+                            "containing '{name}'.".format(name=name))
+        if len(data_center) > 1:
+            raise NameError("Found {n} data centers with the name '{name}': {names}".format(
+                n=len(data_center),
+                name=name,
+                names=", ".join(d['properties']['name'] for d in data_center)
+            ))
+        if depth <= 1:
+            return data_center[0]
+        return await self.get_datacenter(data_center[0]['id'], depth=depth)
+
+    async def wait_for_completion(self, response, timeout=3600, initial_wait=None,
+                                  scaleup=None):
+        """
+        Poll resource request status until resource is provisioned.
+
+        Takes the same arguments as IonosEnterpriseService.wait_for_completion()
+        and polls on the same schedules.
+        """
+        if 'requestId' not in response:
+            return
+        request_id = response['requestId']
+        polling = self.polling
+        if initial_wait is not None or scaleup is not None:
+            polling = FixedPolling(5 if initial_wait is None else initial_wait,
+                                   10 if scaleup is None else scaleup)
+        schedule = polling.begin(request_id)
+        logger = logging.getLogger(__name__)
+        if timeout:
+            timeout = time.time() + timeout
+        while True:
+            delay = schedule.next_delay()
+            if delay:
+                await asyncio.sleep(
+                    delay if not timeout else max(0, min(delay, timeout - time.time())))
+            request = await self.get_request(request_id, status=True)
+            if request['metadata']['status'] == 'DONE':
+                schedule.finish()
+                break
+            elif request['metadata']['status'] == 'FAILED':
+                raise ICFailedRequest(
+                    'Request {0} failed to complete: {1}'.format(
+                        request_id, request['metadata']['message']),
+                    request_id)
+
+            if timeout and time.time() > timeout:
+                raise ICTimeoutError('Timed out waiting for request {0}.'.format(request_id),
+                                     request_id)
+            logger.info("Request %s is in state '%s'.", request_id, request['metadata']['status'])
+
+
+def _api_method(name):
+    async def method(self, *args, **kwargs):
+        return await self._call(name, args, kwargs)  # pylint: disable=protected-access
+    func = getattr(IonosEnterpriseRequests, name)
+    method.__name__ = name
+    method.__doc__ = func.__doc__
+    return method
+
+
+def _api_method_names():
+    for name in dir(IonosEnterpriseRequests):
+        if name.startswith('_') or hasattr(AsyncIonosEnterpriseService, name):
+            continue
+        # every API call is wrapped by IonosCoreProxy.process_response
+        if hasattr(getattr(IonosEnterpriseRequests, name), '__wrapped__'):
+            yield name
+
+
+for _name in _api_method_names():
+    setattr(AsyncIonosEnterpriseService, _name, _api_method(_name))
@@ -0,0 +1,118 @@
+# Copyright 2015-2019 IONOS
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from concurrent.futures import ThreadPoolExecutor
+
+from ionosenterprise.errors import ICError, ICRequestError
+
+DEFAULT_MAX_WORKERS = 8
+
+
+def _call_args(args):
+    """
+    Split one item of a map() iterable into positional and keyword arguments.
+
+    Tuples are passed as positional arguments, dicts as keyword arguments
+    and every other value as the single positional argument.
+    """
+    if isinstance(args, tuple):
+        return args, {}
+    if isinstance(args, dict):
+        return (), args
+    return (args,), {}
+
+
+class Batch(object):
+    """
+    Runs SDK calls concurrently on a bounded thread pool.
+
+    Failed calls do not abort the batch: their ICError (or ICRequestError)
+    is returned in place of the result. Other exceptions are raised when
+    the results are collected.
+
+    :param      client: The client to run the calls with.
+    :type       client: ``IonosEnterpriseService``
+
+    :param      max_workers: Maximum number of concurrent calls.
+    :type       max_workers: ``int``
+
+    """
+
+    def __init__(self, client, max_workers=DEFAULT_MAX_WORKERS):
+        self.client = client
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._futures = []
+
+    def _resolve(self, method):
+        if callable(method):
+            return method
+        return getattr(self.client, method)
+
+    @staticmethod
+    def _guarded(func, args, kwargs):
+        try:
+            return func(*args, **kwargs)
+        except (ICError, ICRequestError) as e:
+            return e
+
+    def submit(self, method, *args, **kwargs):
+        """
+        Schedules a call and returns its ``concurrent.futures.Future``.
+
+        :param      method: Name of a client method or any callable.
+        :type       method: ``str`` or ``function``
+
+        """
+        future = self._executor.submit(self._guarded, self._resolve(method), args, kwargs)
+        self._futures.append(future)
+        return future
+
+    def map(self, method, iterable_of_args):
+        """
+        Schedules one call per item and returns their futures in order.
+
+        Tuples are passed as positional arguments, dicts as keyword
+        arguments and every other item as the only argument.
+        """
+        futures = []
+        for item in iterable_of_args:
+            args, kwargs = _call_args(item)
+            futures.append(self.submit(method, *args, **kwargs))
+        return futures
+
+    def results(self):
+        """
+        Waits for all submitted calls and returns their results in order.
+        """
+        return [future.result() for future in self._futures]
+
+    def close(self, cancel=False):
+        """
+        Shuts the thread pool down after the running calls finished.
+
+        :param      cancel: Drop the calls that have not started yet.
+        :type       cancel: ``bool``
+
+        """
+        if cancel:
+            for future in self._futures:
+                future.cancel()
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close(cancel=exc_type is not None)
@@ -0,0 +1,465 @@
+# Copyright 2015-2019 IONOS
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+In-memory cache of API read responses.
+
+A ResponseCache is passed to IonosEnterpriseService(response_cache=...).
+Successful GET responses are kept per URL and query (which includes the
+resource id and depth) until their TTL expires. Every other request
+invalidates the cached responses of its own path, of the resources below
+it and of the parent resources and collections above it.
+
+With depth_aware=True the entities contained in deep responses are
+stored by their href as well, so shallower reads of any of them are
+answered from the cache.
+
+With revalidate=True expired responses are not dropped but revalidated
+with their etag, which saves the transfer and parsing of unchanged data.
+"""
+
+import collections
+import io
+import json
+import threading
+import time
+
+from ionoscloud.exceptions import ApiException
+from six.moves.urllib.parse import urljoin, urlparse
+
+# request status polls must always reach the API
+DEFAULT_TTLS = {
+    'requests': 0,
+}
+
+
+class CachedResponse(io.IOBase):
+    """
+    A fresh response object for every cache hit.
+
+    The ApiClient decodes the body of the response in place, so cached
+    responses must not be handed out twice.
+    """
+
+    def __init__(self, status, reason, data, headers):
+        self.status = status
+        self.reason = reason
+        self.data = data
+        self.headers = headers
+
+    def getheaders(self):
+        return self.headers
+
+    def getheader(self, name, default=None):
+        return self.headers.get(name, default)
+
+
+def _header(headers, name):
+    name = name.lower()
+    for key, value in headers.items():
+        if key.lower() == name:
+            return value
+    return None
+
+
+def _etag(document):
+    return (document.get('metadata') or {}).get('etag')
+
+
+def _reference(document):
+    return dict((k, document[k]) for k in ('id', 'type', 'href') if k in document)
+
+
+def _is_collection(document):
+    return document.get('type') == 'collection' or 'items' in document
+
+
+def view(resource, depth):
+    """
+    Returns the resource as the API would return it with the given depth.
+
+    A resource at depth d contains its child collections at depth d - 1;
+    a negative depth leaves only the reference (id, type and href).
+    """
+    if depth < 0:
+        return _reference(resource)
+    result = dict((k, v) for k, v in resource.items() if k != 'entities')
+    if 'entities' in resource:
+        result['entities'] = dict((name, view_collection(collection, depth - 1))
+                                  for name, collection in resource['entities'].items())
+    return result
+
+
+def view_collection(collection, depth):
+    """
+    Returns the collection as the API would return it with the given depth.
+
+    A collection at depth d contains its items at depth d - 1.
+    """
+    if depth < 0:
+        return _reference(collection)
+    result = dict((k, v) for k, v in collection.items() if k != 'items')
+    if 'items' in collection:
+        result['items'] = [view(item, depth - 1) for item in collection['items']]
+    return result
+
+
+class EntityStore(object):
+    """
+    Resources and collections of API responses, stored by href path.
+
+    Every entity is kept with the depth it was received with, so a
+    get_datacenter(dc, depth=5) response can answer a later
+    get_server(dc, server, depth=1) or list_nics(dc, server).
+
+    :param      ttl_for: Returns the time to live for a path.
+    :type       ttl_for: ``function``
+
+    :param      max_size: Maximum number of stored entities.
+    :type       max_size: ``int``
+
+    """
+
+    def __init__(self, ttl_for, max_size=10000):
+        self.ttl_for = ttl_for
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._entities = collections.OrderedDict()
+
+    def add(self, document, depth):
+        """
+        Stores a response document and everything it contains.
+
+        :param      document: The decoded response of a GET request.
+        :type       document: ``dict``
+
+        :param      depth: The depth the document was requested with.
+        :type       depth: ``int``
+
+        """
+        now = time.time()
+        with self._lock:
+            self._add(document, depth, now)
+            while len(self._entities) > self.max_size:
+                self._entities.popitem(last=False)
+
+    def _add(self, document, depth, now):
+        if depth < 0 or not isinstance(document, dict) or 'href' not in document:
+            return
+        path = urlparse(document['href']).path.rstrip('/')
+        ttl = self.ttl_for(path)
+        if not ttl:
+            return
+        entry = self._entities.get(path)
+        if entry is None or entry[1] <= depth or entry[2] < now:
+            self._entities[path] = (document, depth, now + ttl)
+            self._entities.move_to_end(path)
+        if _is_collection(document):
+            for item in document.get('items') or []:
+                self._add(item, depth - 1, now)
+        else:
+            for collection in (document.get('entities') or {}).values():
+                self._add(collection, depth - 1, now)
+
+    def get(self, path, depth):
+        """
+        Returns the document of the path at the given depth, or None.
+        """
+        path = path.rstrip('/')
+        with self._lock:
+            entry = self._entities.get(path)
+            if entry is None:
+                return None
+            document, stored_depth, expires = entry
+            if expires < time.time():
+                del self._entities[path]
+                return None
+            if stored_depth < depth:
+                return None
+            self._entities.move_to_end(path)
+        if _is_collection(document):
+            return view_collection(document, depth)
+        return view(document, depth)
+
+    def invalidate(self, path):
+        path = path.rstrip('/')
+        with self._lock:
+            stale = [key for key in self._entities if _related(key, path)]
+            for key in stale:
+                del self._entities[key]
+        return len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._entities.clear()
+
+
+class ResponseCache(object):
+    """
+    Thread-safe TTL and LRU bounded cache of GET responses.
+
+    :param      ttl: Default time to live of a response in seconds.
+    :type       ttl: ``float``
+
+    :param      ttls: Time to live per resource type, e.g.
+                      ``{'servers': 10, 'images': 3600}``. The type is
+                      the last collection name in the path that has an
+                      entry. A TTL of 0 disables caching of the type.
+    :type       ttls: ``dict``
+
+    :param      max_size: Maximum number of cached responses.
+    :type       max_size: ``int``
+
+    :param      depth_aware: Also answer reads from the entities contained
+                             in deeper cached responses.
+    :type       depth_aware: ``bool``
+
+    :param      revalidate: Revalidate expired responses by their etags
+                            instead of downloading them again.
+    :type       revalidate: ``bool``
+
+    """
+
+    def __init__(self, ttl=30, ttls=None, max_size=1000, depth_aware=False,
+                 revalidate=False):
+        self.ttl = ttl
+        self.ttls = dict(DEFAULT_TTLS)
+        self.ttls.update(ttls or {})
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._entries = collections.OrderedDict()
+        self.entities = None
+        if depth_aware:
+            self.entities = EntityStore(self.ttl_for, max_size=max_size * 10)
+        self.revalidate = revalidate
+        self.hits = 0
+        self.entity_hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.revalidated = 0
+        self.refetched_items = 0
+
+    @staticmethod
+    def key(url, query_params=None):
+        return url, tuple(sorted((str(k), str(v)) for k, v in (query_params or [])))
+
+    @staticmethod
+    def _depth(key):
+        """
+        Returns the depth of a request without other query parameters, or None.
+        """
+        params = dict(key[1])
+        if set(params) - {'depth'}:
+            return None
+        try:
+            return int(params.get('depth', 0))
+        except ValueError:
+            return None
+
+    def ttl_for(self, path):
+        """
+        Returns the time to live of the responses of a path.
+        """
+        for segment in reversed(path.strip('/').split('/')):
+            if segment in self.ttls:
+                return self.ttls[segment]
+        return self.ttl
+
+    def get(self, key):
+        """
+        Returns a CachedResponse for the key, or None.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] < time.time():
+                if not self.revalidate:
+                    del self._entries[key]
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return CachedResponse(*entry[2:])
+
+        depth = self._depth(key) if self.entities is not None else None
+        if depth is not None:
+            document = self.entities.get(urlparse(key[0]).path, depth)
+            if document is not None:
+                with self._lock:
+                    self.entity_hits += 1
+                return CachedResponse(200, 'OK', json.dumps(document).encode('utf-8'),
+                                      {'Content-Type': 'application/json'})
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key, response):
+        """
+        Stores a response of the API client under the key.
+        """
+        path = urlparse(key[0]).path
+        ttl = self.ttl_for(path)
+        if not ttl or self.max_size <= 0:
+            return
+        entry = (path, time.time() + ttl, response.status, response.reason, response.data,
+                 dict(response.getheaders()))
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+        depth = self._depth(key) if self.entities is not None else None
+        if depth is not None and response.status == 200:
+            try:
+                document = json.loads(response.data)
+            except ValueError:
+                return
+            self.entities.add(document, depth)
+
+    def fetch(self, key, query_params, send):
+        """
+        Requests a response that get() did not return and caches it.
+
+        An expired response is revalidated: with an If-None-Match request
+        if an etag is known, otherwise, for collections with depth >= 2,
+        by listing the collection with depth=1 and downloading only the
+        items whose metadata.etag changed.
+
+        :param      key: The cache key of the request.
+        :type       key: ``tuple``
+
+        :param      query_params: The query parameters of the request.
+        :type       query_params: ``list``
+
+        :param      send: Sends a GET request, called as
+                          send(url, query_params, extra_headers=None).
+        :type       send: ``function``
+
+        """
+        entry = None
+        if self.revalidate:
+            with self._lock:
+                entry = self._entries.get(key)
+        response = None
+        if entry is not None:
+            response = self._revalidate(key, entry, query_params, send)
+        if response is None:
+            response = send(key[0], query_params)
+            self.put(key, response)
+        return response
+
+    def _touch(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries[key] = (entry[0], time.time() + self.ttl_for(entry[0])) + entry[2:]
+                self._entries.move_to_end(key)
+            self.revalidated += 1
+
+    def _revalidate(self, key, entry, query_params, send):
+        try:
+            document = json.loads(entry[4])
+        except ValueError:
+            return None
+        if not isinstance(document, dict):
+            return None
+
+        etag = _header(entry[5], 'ETag')
+        if etag is None and _etag(document):
+            etag = '"{}"'.format(_etag(document))
+        if etag is not None:
+            try:
+                response = send(key[0], query_params, {'If-None-Match': etag})
+            except ApiException as e:
+                if e.status != 304:
+                    raise
+                self._touch(key)
+                return CachedResponse(*entry[2:])
+            self.put(key, response)
+            return response
+
+        depth = self._depth(key)
+        if 'items' in document and depth is not None and depth >= 2:
+            return self._revalidate_collection(key, document, depth, send)
+        return None
+
+    def _revalidate_collection(self, key, document, depth, send):
+        listing = json.loads(send(key[0], [('depth', 1)]).data)
+        cached = dict((item.get('id'), item) for item in document['items'])
+        items = []
+        refetched = 0
+        for item in listing.get('items') or []:
+            old = cached.get(item.get('id'))
+            if old is not None and _etag(old) is not None and _etag(old) == _etag(item):
+                items.append(old)
+                continue
+            url = urljoin(key[0], item['href'])
+            items.append(json.loads(send(url, [('depth', depth - 1)]).data))
+            refetched += 1
+
+        with self._lock:
+            self.refetched_items += refetched
+        if refetched == 0 and len(items) == len(document['items']):
+            self._touch(key)
+        document = dict(document)
+        document['items'] = items
+        response = CachedResponse(200, 'OK', json.dumps(document).encode('utf-8'),
+                                  {'Content-Type': 'application/json'})
+        self.put(key, response)
+        return response
+
+    def invalidate(self, url):
+        """
+        Drops the responses of the URL, its children and its parents.
+        """
+        path = urlparse(url).path.rstrip('/')
+        with self._lock:
+            stale = [key for key, entry in self._entries.items()
+                     if _related(entry[0].rstrip('/'), path)]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += len(stale)
+        if self.entities is not None:
+            self.entities.invalidate(path)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        if self.entities is not None:
+            self.entities.clear()
+
+    def stats(self):
+        """
+        Returns the hit and miss counters and the current size as a dict.
+        """
+        with self._lock:
+            requests = self.hits + self.entity_hits + self.misses
+            hits = self.hits + self.entity_hits
+            return {
+                'hits': hits,
+                'entity_hits': self.entity_hits,
+                'misses': self.misses,
+                'hit_ratio': hits / requests if requests else 0.0,
+                'invalidations': self.invalidations,
+                'revalidated': self.revalidated,
+                'refetched_items': self.refetched_items,
+                'size': len(self._entries),
+            }
+
+
+def _related(cached, changed):
+    """Whether one of the two paths contains the other."""
+    return cached == changed or cached.startswith(changed + '/') or \
+        changed.startswith(cached + '/')
@@ -12,13 +12,17 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import concurrent.futures
 import getpass
 import logging
 import os
 import re
+import sys
+import threading
+import time
 import requests
+import requests.adapters
 import six
-import ionoscloud
 from coreadaptor.IonosCoreProxy import IonosCoreProxy
 
 try:
@@ -41,11 +45,29 @@ from ionosenterprise.errors import (
     ICNotFoundError,
     ICValidationError,
     ICRateLimitExceededError,
-    ICError
+    ICError,
+    ICFailedRequest,
+    ICTimeoutError
 )
 
 from .utils import ask
 
+from .batch import Batch, DEFAULT_MAX_WORKERS
+
+from .singleflight import SingleFlight
+
+from .codec import get_json_backend
+
+from .keymap import camel_case
+
+from .resolver import NameResolver
+
+from .waiters import RequestWaiter, StateWatcher
+
+from .operations import Operation
+
+from .polling import FixedPolling
+
 from .requests import IonosEnterpriseRequests
 
 from .items import * # NOQA
@@ -61,7 +83,13 @@ class IonosEnterpriseService(IonosEnterpriseRequests):
 
     def __init__(self, username=None, password=None, host_base=API_HOST,
                  host_cert=None, ssl_verify=True, headers=None, client_user_agent=None,
-                 use_config=True, use_keyring=HAS_KEYRING, config_filename=None):
+                 use_config=True, use_keyring=HAS_KEYRING, config_filename=None,
+                 pool_size=None, pool_connections=requests.adapters.DEFAULT_POOLSIZE,
+                 pool_maxsize=None, max_retries=requests.adapters.DEFAULT_RETRIES,
+                 rate_limiter=None, retry_policy=None, single_flight=False,
+                 response_cache=None, json_backend=None,
+                 raw_bodies=False, name_ttl=60, polling=None,
+                 operations=False):
         if headers is None:
             headers = dict()
         self._config = None
@@ -76,6 +104,29 @@ class IonosEnterpriseService(IonosEnterpriseRequests):
         self.user_agent = '{}/{}'.format(_LIBRARY_NAME, __version__)
         if client_user_agent:
             self.user_agent = client_user_agent + ' ' + self.user_agent
+        self.pool_size = pool_size
+        self._api_client = None
+        self._api_instances = dict()
+        self._api_client_lock = threading.Lock()
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize or pool_size or requests.adapters.DEFAULT_POOLSIZE
+        self.max_retries = max_retries
+        self._session = None
+        self._session_lock = threading.Lock()
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
+        self.single_flight = SingleFlight() if single_flight else None
+        self.response_cache = response_cache
+        self.json_backend = get_json_backend(json_backend) if json_backend else None
+        self.raw_bodies = raw_bodies
+        self.name_resolver = NameResolver(self, ttl=name_ttl)
+        self.polling = polling if polling is not None else FixedPolling()
+        self.operations = operations
+        # polls the requests of the Operations in the background thread
+        self.request_waiter = None
+        if operations:
+            self.request_waiter = RequestWaiter(self)
+            self.request_waiter.start()
 
     def _read_config(self, filename=None):
         """
@@ -207,7 +258,7 @@ class IonosEnterpriseService(IonosEnterpriseRequests):
     @IonosCoreProxy.cast_exceptions
     def wait_for(
         fn_check, fn_request, timeout=3600, initial_wait=5,
-        scaleup=10, console_print=None
+        scaleup=10, console_print=None, polling=None, key=None
     ):
         """
         Poll resource request status until resource is provisioned.
@@ -227,20 +278,52 @@ class IonosEnterpriseService(IonosEnterpriseRequests):
         :param      scaleup: Double polling interval every scaleup steps, which will be doubled.
         :type       scaleup: ``int``
 
+        :param      polling: Polling strategy replacing initial_wait and
+                             scaleup, e.g. the `polling` of a service.
+        :type       polling: ``AdaptivePolling``
+
+        :param      key: Type of the awaited operation, the polling
+                         strategy learns its duration under this key.
+        :type       key: ``str``
+
         """
-        ionoscloud.api_client.ApiClient.wait_for(
-            fn_check,
-            fn_request,
-            timeout,
-            initial_wait,
-            scaleup,
-            console_print)
+        if polling is None:
+            polling = FixedPolling(initial_wait, scaleup)
+        schedule = polling.begin(key=key)
+        logger = logging.getLogger(__name__)
+        if timeout:
+            timeout = time.time() + timeout
+        while True:
+            delay = schedule.next_delay()
+            if delay:
+                logger.info("Sleeping for %i seconds...", delay)
+                time.sleep(delay if not timeout else max(0, min(delay, timeout - time.time())))
+            if console_print is not None:
+                sys.stdout.write(console_print)
+                sys.stdout.flush()
+
+            resp = fn_request()
+            if fn_check(resp):
+                schedule.finish()
+                break
+
+            if timeout and time.time() > timeout:
+                request_id = resp.get('requestId') if isinstance(resp, dict) else None
+                raise ICTimeoutError('Timed out waiting for request {0}.'.format(request_id),
+                                     request_id)
+
+        if console_print is not None:
+            print('')
 
     @IonosCoreProxy.cast_exceptions
-    def wait_for_completion(self, response, timeout=3600, initial_wait=5, scaleup=10):
+    def wait_for_completion(self, response, timeout=3600, initial_wait=None, scaleup=None):
         """
         Poll resource request status until resource is provisioned.
 
+        The status is polled on the schedule of the `polling` strategy
+        of the service, or of FixedPolling(initial_wait, scaleup) if one
+        of them is given.
+
         :param      response: A response dict, which needs to have a 'requestId' item.
         :type       response: ``dict``
 
@@ -254,9 +337,283 @@ class IonosEnterpriseService(IonosEnterpriseRequests):
         :type       scaleup: ``int``
 
         """
-        if 'requestId' in response:
-            self.get_api_client()\
-                .wait_for_completion(response['requestId'], timeout, initial_wait, scaleup)
+        if isinstance(response, Operation):
+            try:
+                response.result(timeout)
+            except concurrent.futures.TimeoutError:
+                raise ICTimeoutError(
+                    'Timed out waiting for request {0}.'.format(response.request_id),
+                    response.request_id)
+            return
+        if 'requestId' not in response:
+            return
+        request_id = response['requestId']
+        polling = self.polling
+        if initial_wait is not None or scaleup is not None:
+            polling = FixedPolling(5 if initial_wait is None else initial_wait,
+                                   10 if scaleup is None else scaleup)
+        schedule = polling.begin(request_id)
+        logger = logging.getLogger(__name__)
+        if timeout:
+            timeout = time.time() + timeout
+        while True:
+            delay = schedule.next_delay()
+            if delay:
+                time.sleep(delay if not timeout else max(0, min(delay, timeout - time.time())))
+            request = self.get_request(request_id, status=True)
+            if request['metadata']['status'] == 'DONE':
+                schedule.finish()
+                break
+            elif request['metadata']['status'] == 'FAILED':
+                raise ICFailedRequest(
+                    'Request {0} failed to complete: {1}'.format(
+                        request_id, request['metadata']['message']),
+                    request_id)
+
+            if timeout and time.time() > timeout:
+                raise ICTimeoutError('Timed out waiting for request {0}.'.format(request_id),
+                                     request_id)
+            logger.info("Request %s is in state '%s'.", request_id, request['metadata']['status'])
+
+    def wait_for_all(self, responses, timeout=3600, interval=None):
+        """
+        Poll the status of many requests until all of them are finished.
+
+        The requests are tracked by one RequestWaiter: with more than a
+        few due, their statuses are read from one listing of the requests
+        instead of one call per request.
+
+        Returns the status metadata of the requests in the order of the
+        responses, None for responses without 'requestId'. A failed
+        request returns its ICFailedRequest, one that is not finished in
+        time its ICTimeoutError and one whose status cannot be read the
+        error of reading it, e.g. an ICNotFoundError, instead of aborting
+        the other waits.
+
+        :param      responses: Response dicts or request IDs.
+        :type       responses: ``list``
+
+        :param      timeout: Maximum waiting time in seconds. None means infinite waiting time.
+        :type       timeout: ``int``
+
+        :param      interval: Polling interval in seconds. None polls on the
+                              schedules of the `polling` strategy.
+        :type       interval: ``int``
+
+        """
+        waiter = RequestWaiter(self, interval=interval, timeout=timeout)
+        futures = [waiter.add(response) for response in responses]
+        waiter.run()
+        return [future.exception() or future.result() for future in futures]
+
+    def wait_for_datacenter_idle(self, datacenter_id, responses=None, timeout=3600,
+                                 polling=None, key=None):
+        """
+        Poll the state of a data center until it is AVAILABLE.
+
+        A data center is BUSY while any of its provisioning requests is
+        queued or running, so one depth=0 read of the data center per poll
+        waits for any number of changes inside it. The state is polled on
+        the schedule of the `polling` strategy of the service.
+
+        With `responses`, the statuses of their requests are checked once
+        the data center is AVAILABLE, and it is polled on until all of
+        them are finished; this also covers requests that had not made the
+        data center BUSY yet. Returns the status metadata of the requests
+        in the order of the responses, as wait_for_all() does, with the
+        ICFailedRequest of a failed request instead of its status.
+
+        :param      datacenter_id: The unique ID of the data center.
+        :type       datacenter_id: ``str``
+
+        :param      responses: Response dicts or request IDs of requests
+                               inside the data center.
+        :type       responses: ``list``
+
+        :param      timeout: Maximum waiting time in seconds. None means infinite waiting time.
+        :type       timeout: ``int``
+
+        :param      polling: Polling strategy, default the `polling` of the service.
+        :type       polling: ``AdaptivePolling``
+
+        :param      key: Type of the awaited changes, the polling strategy
+                         learns their duration under this key.
+        :type       key: ``str``
+
+        """
+        if polling is None:
+            polling = self.polling
+        schedule = polling.begin(key=key)
+        logger = logging.getLogger(__name__)
+        # checks all pending requests whenever it is polled
+        waiter = RequestWaiter(self, interval=0, timeout=None)
+        futures = [waiter.add(response) for response in responses or []]
+        url = '{0}/datacenters/{1}'.format(self.host_base, datacenter_id)
+        deadline = time.time() + timeout if timeout else None
+        while True:
+            delay = schedule.next_delay()
+            if deadline is not None:
+                delay = max(0, min(delay, deadline - time.time()))
+            time.sleep(delay)
+            if self.response_cache is not None:
+                # the data center and its contents change while it is BUSY
+                self.response_cache.invalidate(url)
+            state = self.get_datacenter(datacenter_id, depth=0)['metadata']['state']
+            logger.info("Data center %s is in state '%s'.", datacenter_id, state)
+            if state == 'AVAILABLE' and not waiter.poll():
+                schedule.finish()
+                return [future.exception() or future.result() for future in futures]
+            if deadline is not None and time.time() > deadline:
+                raise ICTimeoutError(
+                    'Timed out waiting for data center {0}.'.format(datacenter_id), None)
+
+    def wait_for_states(self, datacenter_id, predicates, timeout=3600, polling=None, key=None,
+                        collection='servers'):
+        """
+        Poll the servers of a data center until each is in the state its
+        predicate asks for.
+
+        The servers are listed once per poll with list_servers(depth=1),
+        however many are watched, and each is released as soon as its
+        predicate is true, e.g.
+
+            client.wait_for_states(datacenter_id, dict(
+                (server_id, lambda server: server['properties']['vmState'] == 'RUNNING')
+                for server_id in server_ids))
+
+        A predicate is called with None if its server is not in the
+        listing. Returns a dict of the server dicts by ID, with the
+        ICTimeoutError of a server not in its state in time, or the
+        exception raised by its predicate, instead.
+
+        :param      datacenter_id: The unique ID of the data center.
+        :type       datacenter_id: ``str``
+
+        :param      predicates: Functions of the server dict by server ID.
+        :type       predicates: ``dict``
+
+        :param      timeout: Maximum waiting time in seconds. None means infinite waiting time.
+        :type       timeout: ``int``
+
+        :param      polling: Polling strategy, default the `polling` of the service.
+        :type       polling: ``AdaptivePolling``
+
+        :param      key: Type of the awaited changes, the polling strategy
+                         learns their duration under this key.
+        :type       key: ``str``
+
+        :param      collection: Other resources of the data center to
+                                watch instead, e.g. 'volumes'.
+        :type       collection: ``str``
+
+        """
+        watcher = StateWatcher(self, datacenter_id, collection=collection, timeout=timeout,
+                               polling=polling, key=key)
+        futures = [(resource_id, watcher.watch(resource_id, predicate))
+                   for resource_id, predicate in predicates.items()]
+        watcher.run()
+        return dict((resource_id, future.exception() or future.result())
+                    for resource_id, future in futures)
+
+    def get_session(self):
+        """
+        Returns the requests session used by _perform_request.
+
+        The session is created on first use and keeps its connections
+        alive until close() is called.
+        """
+        session = self._session
+        if session is None:
+            with self._session_lock:
+                session = self._session
+                if session is None:
+                    session = self._create_session()
+                    self._session = session
+        return session
+
+    def _create_session(self):
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=self.pool_connections,
+                                                pool_maxsize=self.pool_maxsize,
+                                                max_retries=self.max_retries)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.verify = self.verify
+        session.cert = self.host_cert
+        return session
+
+    def close(self):
+        """
+        Closes the pooled connections of this service and cancels its
+        outstanding operations.
+        """
+        if self.request_waiter is not None:
+            self.request_waiter.cancel()
+        super(IonosEnterpriseService, self).close()
+        with self._session_lock:
+            session = self._session
+            self._session = None
+        if session is not None:
+            session.close()
+
+    def batch(self, max_workers=DEFAULT_MAX_WORKERS):
+        """
+        Returns a Batch to run many calls of this client concurrently.
+
+        The calls share the connection pool of this client, so set
+        `pool_size` to at least `max_workers`.
+
+        :param      max_workers: Maximum number of concurrent calls.
+        :type       max_workers: ``int``
+
+        """
+        return Batch(self, max_workers=max_workers)
+
+    def map(self, method, iterable_of_args, max_workers=DEFAULT_MAX_WORKERS):
+        """
+        Calls a method for every item concurrently and returns the results in order.
+
+        Tuples are passed as positional arguments, dicts as keyword arguments
+        and every other item as the only argument. Failed calls return their
+        ICError instead of aborting the other calls.
+
+        :param      method: Name of a client method or any callable.
+        :type       method: ``str`` or ``function``
+
+        :param      iterable_of_args: Arguments for every call.
+        :type       iterable_of_args: ``iterable``
+
+        :param      max_workers: Maximum number of concurrent calls.
+        :type       max_workers: ``int``
+
+        """
+        with self.batch(max_workers=max_workers) as batch:
+            batch.map(method, iterable_of_args)
+            return batch.results()
+
+    def resolve(self, kind, scope, name):
+        """
+        Returns the ID of a resource by its name.
+
+        The names are cached per kind and scope for `name_ttl` seconds and
+        refreshed with depth=0 listings after requests of this client that
+        create, rename or delete resources. The name is matched like in
+        get_datacenter_by_name(); a NameError is raised if no or more than
+        one resource matches.
+
+        :param      kind: 'datacenter', 'server', 'lan' or 'image'.
+        :type       kind: ``str``
+
+        :param      scope: The data center ID for servers and LANs, the
+                           location or None for images, None for data
+                           centers.
+        :type       scope: ``str``
+
+        :param      name: The name to search for.
+        :type       name: ``str``
+
+        """
+        return self.name_resolver.resolve(kind, scope, name)
 
     def _wrapped_request(self, method, url,
                          params=None,
@@ -271,24 +628,55 @@ class IonosEnterpriseService(IonosEnterpriseRequests):
                          hooks=None,
                          stream=None):
 
-        headers.update(self.headers)
-        session = requests.Session()
-        return session.request(method, url, params, data, headers, cookies,
-                               files, auth, timeout, allow_redirects, proxies,
-                               hooks, stream, self.verify, self.host_cert)
+        request_headers = dict(headers or {})
+        request_headers.update(self.headers)
+        state = None
+        if self.retry_policy is not None:
+            state = self.retry_policy.begin(method)
+        while True:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            try:
+                response = self.get_session().request(
+                    method, url, params, data, request_headers, cookies, files, auth, timeout,
+                    allow_redirects, proxies, hooks, stream, self.verify, self.host_cert)
+            except requests.exceptions.ConnectionError as e:
+                if state is None:
+                    raise
+                delay = state.retry_delay(error=e)
+                if delay is None:
+                    raise state.finish(e)
+            else:
+                if state is None:
+                    return response
+                delay = None
+                if not response.ok:
+                    delay = state.retry_delay(status=response.status_code,
+                                              headers=response.headers)
+                if delay is None:
+                    state.finish(failed=not response.ok)
+                    response.retries = state.retries
+                    response.retry_time = state.backoff_time
+                    return response
+                response.close()
+            state.sleep(delay)
+
+    def _decode_json(self, response):
+        if self.json_backend is None:
+            return response.json()
+        return self.json_backend.loads(response.content)
 
     def _perform_request(self, url, method='GET', data=None, headers=None):
-        if headers is None:
-            headers = dict()
+        headers = dict(headers or {})
 
         auth = (self.username, self.password)
 
         url = self._build_url(url)
         headers.update({'User-Agent': self.user_agent})
         if method in ['POST', 'PUT']:
+            headers.update({'Content-Type': 'application/json'})
             response = self._wrapped_request(method, url, auth=auth, data=data,
                                              headers=headers)
-            headers.update({'Content-Type': 'application/json'})
         elif method in ['POST-ACTION-JSON', 'POST-ACTION']:
             headers.update({'Content-Type': 'application/x-www-form-urlencoded; charset=UTF-8'})
             response = self._wrapped_request('POST', url, auth=auth, data=data,
@@ -308,18 +696,22 @@ class IonosEnterpriseService(IonosEnterpriseRequests):
 
         try:
             if not response.ok:
-                err = response.json()
+                err = self._decode_json(response)
                 code = err['httpStatus']
                 msg = err['messages']
                 if response.status_code == 401:
-                    raise ICNotAuthorizedError(code, msg, url)
-                if response.status_code == 404:
-                    raise ICNotFoundError(code, msg, url)
-                if response.status_code == 422:
-                    raise ICValidationError(code, msg, url)
-                if response.status_code == 429:
-                    raise ICRateLimitExceededError(code, msg, url)
-                raise ICError(code, msg, url)
+                    error = ICNotAuthorizedError(code, msg, url)
+                elif response.status_code == 404:
+                    error = ICNotFoundError(code, msg, url)
+                elif response.status_code == 422:
+                    error = ICValidationError(code, msg, url)
+                elif response.status_code == 429:
+                    error = ICRateLimitExceededError(code, msg, url)
+                else:
+                    error = ICError(code, msg, url)
+                error.retries = getattr(response, 'retries', 0)
+                error.retry_time = getattr(response, 'retry_time', 0.0)
+                raise error
 
         except ValueError:
             raise Exception('Failed to parse the response', response.text)
@@ -329,7 +721,7 @@ class IonosEnterpriseService(IonosEnterpriseRequests):
             # set json_response to dict to return the request ID
             json_response = dict()
         else:
-            json_response = response.json()
+            json_response = self._decode_json(response)
 
         if 'location' in response.headers:
             json_response['requestId'] = self._request_id(response.headers)
@@ -379,10 +771,4 @@ class IonosEnterpriseService(IonosEnterpriseRequests):
         """
         Convert Python snake case back to mixed case.
         """
-        def camelcase():
-            yield str.lower
-            while True:
-                yield str.capitalize
-
-        c = camelcase()
-        return "".join(next(c)(x) if x else '_' for x in value.split("_"))
+        return camel_case(value)
@@ -0,0 +1,124 @@
+# Copyright 2015-2019 IONOS
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+JSON codecs for encoding request bodies and decoding responses.
+
+IonosEnterpriseService(json_backend='orjson') decodes the response bytes
+with orjson without turning them into a str first and encodes request
+bodies with orjson. 'ujson', 'json' and 'auto' (the fastest installed)
+are accepted as well; a backend that is not installed falls back to the
+json module of the standard library.
+"""
+
+import json
+import logging
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    import ujson
+    HAS_UJSON = True
+except ImportError:
+    HAS_UJSON = False
+
+
+class RawBytes(bytes):
+    """
+    Response body that stays bytes when the ApiClient decodes it.
+
+    The JSON backends parse bytes directly, so decoding the body to a
+    str first would only copy it.
+    """
+
+    def decode(self, *args, **kwargs):  # pylint: disable=arguments-differ,unused-argument
+        return self
+
+
+class EncodedBody(bytes):
+    """Request body that has already been encoded as JSON."""
+
+
+class JsonBackend(object):
+    """The json module of the standard library."""
+
+    name = 'json'
+
+    @staticmethod
+    def loads(data):
+        if isinstance(data, bytes):
+            # json.loads() would call RawBytes.decode()
+            data = bytes.decode(data, 'utf-8')
+        return json.loads(data)
+
+    @staticmethod
+    def dumps(obj):
+        return json.dumps(obj).encode('utf-8')
+
+
+class OrjsonBackend(JsonBackend):
+    name = 'orjson'
+
+    @staticmethod
+    def loads(data):
+        if isinstance(data, bytes):
+            # orjson only accepts exact bytes, a memoryview does not copy
+            data = memoryview(data)
+        return orjson.loads(data)
+
+    @staticmethod
+    def dumps(obj):
+        return orjson.dumps(obj)
+
+
+class UjsonBackend(JsonBackend):
+    name = 'ujson'
+
+    @staticmethod
+    def loads(data):
+        return ujson.loads(data)
+
+    @staticmethod
+    def dumps(obj):
+        return ujson.dumps(obj, ensure_ascii=False).encode('utf-8')
+
+
+def get_json_backend(name):
+    """
+    Returns the JSON backend for a name.
+
+    :param      name: 'orjson', 'ujson', 'json' or 'auto' for the fastest
+                      installed one. Objects with loads() and dumps() are
+                      returned unchanged.
+    :type       name: ``str``
+
+    """
+    if not isinstance(name, str):
+        return name
+    if name == 'auto':
+        name = 'orjson' if HAS_ORJSON else 'ujson' if HAS_UJSON else 'json'
+    if name == 'orjson' and HAS_ORJSON:
+        return OrjsonBackend()
+    if name == 'ujson' and HAS_UJSON:
+        return UjsonBackend()
+    if name not in ('json', 'orjson', 'ujson'):
+        raise ValueError("Unknown JSON backend '{}'".format(name))
+    if name != 'json':
+        logging.getLogger(__name__).warning(
+            "The '%s' Python module is not installed, using 'json' instead.", name)
+    return JsonBackend()
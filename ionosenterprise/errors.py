@@ -15,6 +15,11 @@
 
 class ICError(Exception):
     """Base error for this module."""
+
+    # number of retries and seconds spent in backoff before the error was raised
+    retries = 0
+    retry_time = 0.0
+
     def __init__(self, resp, content, uri=None):  # pylint: disable=super-init-not-called
         self.resp = resp
         self.content = content
@@ -0,0 +1,271 @@
+# Copyright 2015-2019 IONOS
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Inventory of the resources of an account.
+
+crawl() lists the data centers and then the servers, volumes, LANs and
+load balancers of all of them concurrently, with a bounded number of
+requests in flight. Every collection is listed once with a depth that
+includes everything the inventory needs, so the number of requests does
+not grow with the number of resources:
+
+    from ionosenterprise.inventory import crawl
+
+    inventory = crawl(client, max_workers=32)
+    for server in inventory.of_type('server'):
+        print(server.name, [nic.name for nic in inventory.children(server.id, 'nic')])
+"""
+
+import collections
+import operator
+
+from .batch import Batch, DEFAULT_MAX_WORKERS
+from .utils import NameIndex
+
+# depth of the listing of each collection of a data center
+DEPTHS = collections.OrderedDict([
+    # servers with the properties of their volumes and NICs
+    ('servers', 3),
+    ('volumes', 1),
+    # the NICs are related to their LAN by the NIC property 'lan'
+    ('lans', 1),
+    # load balancers with the references of their balanced NICs
+    ('loadbalancers', 2),
+])
+
+# depth of the listing of each collection of the account
+ACCOUNT_DEPTHS = collections.OrderedDict([
+    ('images', 1),
+    ('snapshots', 1),
+    ('ipblocks', 1),
+])
+
+_TYPES = {
+    'datacenters': 'datacenter',
+    'servers': 'server',
+    'volumes': 'volume',
+    'nics': 'nic',
+    'lans': 'lan',
+    'loadbalancers': 'loadbalancer',
+    'images': 'image',
+    'snapshots': 'snapshot',
+    'ipblocks': 'ipblock',
+}
+
+Resource = collections.namedtuple('Resource', [
+    'id', 'type', 'name', 'datacenter_id', 'parent_id', 'properties', 'metadata'])
+Resource.__doc__ = """
+One resource of an Inventory.
+
+``datacenter_id`` is None for the resources of the account (data centers,
+images, snapshots and IP blocks). ``parent_id`` is the server a NIC
+belongs to or a volume is attached to, otherwise None.
+"""
+
+
+def _items(response):
+    return response.get('items') or []
+
+
+class Inventory(object):
+    """
+    The resources found by crawl(), indexed by ID, type, data center and
+    parent.
+
+    Calls that failed do not abort the crawl, their errors are collected
+    in ``errors`` as (data center ID or None, collection, ICError) tuples.
+    """
+
+    def __init__(self):
+        self.resources = []
+        self.errors = []
+        self._by_id = {}
+        self._by_type = collections.defaultdict(list)
+        self._by_datacenter = collections.defaultdict(list)
+        self._children = collections.defaultdict(list)
+        self._name_indexes = {}
+
+    def add(self, resource_type, document, datacenter_id=None, parent_id=None):
+        """
+        Adds a resource from its API response document and returns it.
+        """
+        properties = document.get('properties') or {}
+        resource = Resource(document['id'], resource_type, properties.get('name'),
+                            datacenter_id, parent_id, properties, document.get('metadata') or {})
+        self.resources.append(resource)
+        self._by_id.setdefault(resource.id, []).append(resource)
+        self._by_type[resource_type].append(resource)
+        self._by_datacenter[(datacenter_id, resource_type)].append(resource)
+        if parent_id is not None:
+            self._children[parent_id].append(resource)
+        self._name_indexes.clear()
+        return resource
+
+    def get(self, resource_id, datacenter_id=None):
+        """
+        Returns the resource with the ID, or None.
+
+        LAN IDs are only unique within a data center, pass its ID to get
+        a LAN.
+        """
+        for resource in self._by_id.get(resource_id, ()):
+            if datacenter_id is None or resource.datacenter_id == datacenter_id:
+                return resource
+        return None
+
+    def of_type(self, resource_type, datacenter_id=None):
+        """
+        Returns the resources of a type, e.g. 'server', in the order found.
+
+        :param      resource_type: The type of the resources.
+        :type       resource_type: ``str``
+
+        :param      datacenter_id: Only return the resources of this data center.
+        :type       datacenter_id: ``str``
+
+        """
+        if datacenter_id is None:
+            return list(self._by_type.get(resource_type, ()))
+        return list(self._by_datacenter.get((datacenter_id, resource_type), ()))
+
+    def children(self, parent_id, resource_type=None):
+        """
+        Returns the NICs and attached volumes of a server.
+        """
+        return [resource for resource in self._children.get(parent_id, ())
+                if resource_type is None or resource.type == resource_type]
+
+    def find(self, resource_type, name, datacenter_id=None):
+        """
+        Returns the resources of a type matching the name.
+
+        The name is matched like in find_item_by_name(); the NameIndex of
+        each type and data center is built on first use.
+        """
+        key = (resource_type, datacenter_id)
+        index = self._name_indexes.get(key)
+        if index is None:
+            index = self._name_indexes[key] = NameIndex(
+                [resource for resource in self.of_type(resource_type, datacenter_id)
+                 if resource.name is not None], operator.attrgetter('name'))
+        return index.find(name)
+
+    def counts(self):
+        """
+        Returns the number of resources per type.
+        """
+        return dict((resource_type, len(resources))
+                    for resource_type, resources in self._by_type.items())
+
+    @property
+    def datacenters(self):
+        return self.of_type('datacenter')
+
+    def __len__(self):
+        return len(self.resources)
+
+    def __iter__(self):
+        return iter(self.resources)
+
+
+def _add_datacenter(inventory, datacenter_id, listings):
+    # NICs and attachments are taken from the servers, the volumes
+    # themselves from their own listing which has all of them
+    attached = {}
+    for server in _items(listings.get('servers') or {}):
+        inventory.add('server', server, datacenter_id)
+        entities = server.get('entities') or {}
+        for volume in _items(entities.get('volumes') or {}):
+            attached[volume['id']] = server['id']
+        for nic in _items(entities.get('nics') or {}):
+            inventory.add('nic', nic, datacenter_id, server['id'])
+    for volume in _items(listings.get('volumes') or {}):
+        inventory.add('volume', volume, datacenter_id, attached.get(volume['id']))
+    for collection, listing in listings.items():
+        if collection not in ('servers', 'volumes'):
+            for document in _items(listing):
+                inventory.add(_TYPES.get(collection, collection), document, datacenter_id)
+
+
+def crawl(client, datacenter_ids=None, max_workers=DEFAULT_MAX_WORKERS, depths=None,
+          account=True):
+    """
+    Returns the Inventory of the account, see the module.
+
+    The calls run on a Batch, so create the client with a `pool_size` of
+    at least `max_workers`.
+
+    :param      client: The client to crawl with.
+    :type       client: ``IonosEnterpriseService``
+
+    :param      datacenter_ids: Only crawl these data centers, default all.
+    :type       datacenter_ids: ``list``
+
+    :param      max_workers: Maximum number of concurrent calls.
+    :type       max_workers: ``int``
+
+    :param      depths: Depths of the collections of the data centers,
+                        replacing DEPTHS. A collection missing in the dict
+                        is not listed.
+    :type       depths: ``dict``
+
+    :param      account: Also list the images, snapshots and IP blocks.
+    :type       account: ``bool``
+
+    """
+    if depths is None:
+        depths = DEPTHS
+    inventory = Inventory()
+    with Batch(client, max_workers=max_workers) as batch:
+        account_futures = []
+        if account:
+            account_futures = [(collection, batch.submit('list_' + collection, depth=depth))
+                               for collection, depth in ACCOUNT_DEPTHS.items()]
+
+        if datacenter_ids is None:
+            datacenters = _items(client.list_datacenters(depth=1))
+        else:
+            datacenters = [future.result() for future in batch.map(
+                'get_datacenter', [{'datacenter_id': datacenter_id, 'depth': 0}
+                                   for datacenter_id in datacenter_ids])]
+
+        futures = []
+        for datacenter in datacenters:
+            if isinstance(datacenter, Exception):
+                inventory.errors.append((None, 'datacenters', datacenter))
+                continue
+            inventory.add('datacenter', datacenter)
+            futures.append((datacenter['id'], [
+                (collection, batch.submit('list_' + collection, datacenter['id'], depth=depth))
+                for collection, depth in depths.items()]))
+
+        for datacenter_id, listings in futures:
+            results = {}
+            for collection, future in listings:
+                result = future.result()
+                if isinstance(result, Exception):
+                    inventory.errors.append((datacenter_id, collection, result))
+                else:
+                    results[collection] = result
+            _add_datacenter(inventory, datacenter_id, results)
+
+        for collection, future in account_futures:
+            result = future.result()
+            if isinstance(result, Exception):
+                inventory.errors.append((None, collection, result))
+                continue
+            for document in _items(result):
+                inventory.add(_TYPES[collection], document)
+    return inventory
@@ -0,0 +1,156 @@
+# Copyright 2015-2019 IONOS
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Translation of the keyword arguments of update_* methods to API fields.
+
+A KeyMap is built once per ionoscloud properties model from its
+attribute_map and accepts both the snake case attribute names and the
+mixed case JSON keys. Fields the model does not know are rejected with
+an ICValidationError before a request is sent.
+"""
+
+import re
+import threading
+
+import ionoscloud
+
+from ionosenterprise.errors import ICValidationError
+
+_MAX_CAMEL_CASES = 10000
+_camel_cases = {}
+
+_NESTED_TYPE = re.compile(r'^(?:list\[)?(\w+)\]?$')
+
+# further accepted names of fields, per model
+ALIASES = {
+    'GroupProperties': {'create_datacenter': 'create_data_center'},
+}
+
+
+def camel_case(name):
+    """
+    Converts Python snake case to mixed case, e.g. 'sec_auth_protection'
+    to 'secAuthProtection'. The results are memoized.
+    """
+    camel = _camel_cases.get(name)
+    if camel is None:
+        parts = []
+        first = True
+        for part in name.split('_'):
+            if not part:
+                parts.append('_')
+            elif first:
+                parts.append(part.lower())
+                first = False
+            else:
+                parts.append(part.capitalize())
+        camel = ''.join(parts)
+        if len(_camel_cases) >= _MAX_CAMEL_CASES:
+            _camel_cases.clear()
+        _camel_cases[name] = camel
+    return camel
+
+
+class KeyMap(object):
+    """
+    Field names of one ionoscloud properties model.
+
+    :param      model: The ionoscloud model, e.g. ``VolumeProperties``.
+    :type       model: ``type``
+
+    """
+
+    def __init__(self, model):
+        self.name = model.__name__
+        self.keys = {}
+        self.attributes = {}
+        self._types = {}
+        for attr, key in model.attribute_map.items():
+            for name in (attr, key):
+                self.keys[name] = key
+                self.attributes[name] = attr
+            self._types[key] = model.openapi_types[attr]
+        for alias, attr in ALIASES.get(self.name, {}).items():
+            self.keys[alias] = model.attribute_map[attr]
+            self.attributes[alias] = attr
+
+    def _nested(self, key):
+        match = _NESTED_TYPE.match(self._types[key])
+        model = getattr(ionoscloud.models, match.group(1), None) if match else None
+        if model is None or not hasattr(model, 'attribute_map'):
+            return None
+        return keymap(model)
+
+    def _unknown(self, name):
+        return ICValidationError(422, [{'message': "Unknown field '{}' for {}".format(
+            name, self.name)}])
+
+    def _value(self, key, value):
+        if isinstance(value, (dict, list)):
+            nested = self._nested(key)
+            if nested is not None:
+                if isinstance(value, dict):
+                    return nested.to_keys(value)
+                return [nested.to_keys(item) if isinstance(item, dict) else item
+                        for item in value]
+        return value
+
+    def to_keys(self, fields):
+        """
+        Returns the fields with the JSON keys of the API.
+
+        Nested objects, also in lists, are translated with the map of
+        their model.
+        """
+        keys = self.keys
+        result = {}
+        for name, value in fields.items():
+            try:
+                key = keys[name]
+            except KeyError:
+                raise self._unknown(name)
+            result[key] = self._value(key, value)
+        return result
+
+    def to_attributes(self, fields):
+        """
+        Returns the fields with the attribute names, to create the model.
+        """
+        attributes = self.attributes
+        result = {}
+        for name, value in fields.items():
+            try:
+                attr = attributes[name]
+            except KeyError:
+                raise self._unknown(name)
+            result[attr] = self._value(self.keys[name], value)
+        return result
+
+
+_keymaps = {}
+_keymaps_lock = threading.Lock()
+
+
+def keymap(model):
+    """
+    Returns the KeyMap of an ionoscloud model, created on first use.
+    """
+    result = _keymaps.get(model)
+    if result is None:
+        with _keymaps_lock:
+            result = _keymaps.get(model)
+            if result is None:
+                result = _keymaps[model] = KeyMap(model)
+    return result
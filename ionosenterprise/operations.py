@@ -0,0 +1,92 @@
+# Copyright 2015-2019 IONOS
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Futures of provisioning requests.
+
+With IonosEnterpriseService(operations=True), every call that creates,
+updates or deletes a resource, or starts an action such as
+start_server(), returns an Operation instead of the response dict. The
+requests of all outstanding operations of a service are polled by its
+RequestWaiter, in the one background thread of the process:
+
+    from concurrent.futures import FIRST_EXCEPTION, wait
+
+    client = IonosEnterpriseService(..., operations=True)
+    operations = [client.create_volume(datacenter_id, volume) for volume in volumes]
+    done, not_done = wait(operations, timeout=600, return_when=FIRST_EXCEPTION)
+"""
+
+from concurrent.futures import Future
+
+
+class Operation(Future):
+    """
+    A concurrent.futures.Future of the request of a call.
+
+    The Future is resolved with the response dict when the request is
+    DONE; a failed request sets an ICFailedRequest, one that does not
+    finish within the timeout of the waiter an ICTimeoutError. The
+    response is also available right away, as the ``response``
+    attribute and through item access, e.g. ``operation['id']``.
+
+    :param      response: The response of the call.
+    :type       response: ``dict``
+
+    :param      request_id: The ID of the request, None if the call did
+                            not start one.
+    :type       request_id: ``str``
+
+    """
+
+    def __init__(self, response, request_id=None):
+        super(Operation, self).__init__()
+        self.response = response
+        self.request_id = request_id
+        # metadata of the request status once it is DONE
+        self.status = None
+
+    @classmethod
+    def start(cls, service, response, request_id=None):
+        """
+        Returns the Operation of a response, polled by the waiter of the
+        service.
+        """
+        if not isinstance(response, dict):
+            # the actions return True
+            response = {'requestId': request_id} if request_id is not None else {}
+        operation = cls(response, request_id)
+        service.request_waiter.add(request_id, future=operation)
+        return operation
+
+    def set_result(self, result):
+        """
+        Resolves the Operation with the response; `result` is the status
+        metadata of the request.
+        """
+        self.status = result
+        super(Operation, self).set_result(self.response)
+
+    def __getitem__(self, key):
+        return self.response[key]
+
+    def __contains__(self, key):
+        return key in self.response
+
+    def get(self, key, default=None):
+        return self.response.get(key, default)
+
+    def __repr__(self):
+        return '<Operation request_id={!r} state={}>'.format(
+            self.request_id, 'done' if self.done() else 'pending')
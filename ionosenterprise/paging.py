@@ -0,0 +1,132 @@
+# Copyright 2015-2019 IONOS
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Lazy iteration over API collections.
+
+Every list_* method of the service has an iter_* counterpart yielding
+the items of the collection. Collections that support offset and limit
+are fetched page by page, and the next page is requested in the
+background while the items of the current one are processed.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from coreadaptor.IonosApiClient import extra_query_params
+from ionosenterprise.streaming import iter_stream
+
+DEFAULT_PAGE_SIZE = 100
+
+# list methods whose endpoint accepts offset and limit
+PAGED_METHODS = frozenset([
+    'list_datacenters',
+    'list_lans',
+    'list_loadbalancers',
+    'list_nics',
+    'list_requests',
+    'list_servers',
+    'list_volumes',
+])
+
+
+def iter_pages(fetch, page_size=DEFAULT_PAGE_SIZE, prefetch=True):
+    """
+    Yields the items of a collection fetched page by page.
+
+    :param      fetch: Returns the collection dict for fetch(offset, limit).
+    :type       fetch: ``function``
+
+    :param      page_size: Number of items per request.
+    :type       page_size: ``int``
+
+    :param      prefetch: Request the next page while the current one is
+                          being processed.
+    :type       prefetch: ``bool``
+
+    """
+    if page_size < 1:
+        raise ValueError("page_size must be at least one")
+    executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+    try:
+        offset = 0
+        page = fetch(offset, page_size)
+        while True:
+            items = page.get('items') or []
+            last = len(items) < page_size
+            offset += len(items)
+            future = None
+            if not last and executor is not None:
+                future = executor.submit(fetch, offset, page_size)
+            for item in items:
+                yield item
+            if last:
+                return
+            page = future.result() if future is not None else fetch(offset, page_size)
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+
+def _iter_items(list_method, args, kwargs):
+    for item in list_method(*args, **kwargs).get('items') or []:
+        yield item
+
+
+def _iter_method(name):
+    def method(self, *args, **kwargs):
+        page_size = kwargs.pop('page_size', DEFAULT_PAGE_SIZE)
+        prefetch = kwargs.pop('prefetch', True)
+        stream = kwargs.pop('stream', False)
+        list_method = getattr(self, name)
+        if stream:
+            return iter_stream(list_method, args, kwargs)
+        if name not in PAGED_METHODS:
+            # the endpoint returns the whole collection at once
+            return _iter_items(list_method, args, kwargs)
+
+        def fetch(offset, limit):
+            with extra_query_params(offset=offset, limit=limit):
+                return list_method(*args, **kwargs)
+        return iter_pages(fetch, page_size=page_size, prefetch=prefetch)
+
+    method.__name__ = 'iter_' + name[len('list_'):]
+    method.__doc__ = """
+        Iterates over the items of {name}().
+
+        Takes the arguments of {name}() and additionally:
+
+        :param      page_size: Number of items per request.
+        :type       page_size: ``int``
+
+        :param      prefetch: Request the next page in the background.
+        :type       prefetch: ``bool``
+
+        :param      stream: Fetch the collection with one request and decode
+                            the items while they arrive.
+        :type       stream: ``bool``
+
+        """.format(name=name)
+    return method
+
+
+def add_iter_methods(cls):
+    """
+    Adds an iter_* method for every list_* method of the class.
+    """
+    for name in dir(cls):
+        if name.startswith('list_') and callable(getattr(cls, name)):
+            iter_name = 'iter_' + name[len('list_'):]
+            if not hasattr(cls, iter_name):
+                setattr(cls, iter_name, _iter_method(name))
+    return cls
@@ -0,0 +1,307 @@
+# Copyright 2015-2019 IONOS
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Polling schedules for waiting on provisioning requests.
+
+A polling strategy is passed to IonosEnterpriseService(polling=...).
+wait_for_completion() asks it when to poll the status of a request.
+FixedPolling, the default, is the schedule of earlier versions: a fixed
+interval that is doubled after a number of polls. AdaptivePolling learns
+how long each type of operation takes, e.g. 'PATCH servers/nics', and
+polls around the time the request is expected to be finished.
+
+A strategy implements begin(request_id, key), which returns a schedule
+with next_delay() and finish(). A strategy that learns from the
+requests of the service also implements track(method, url, location),
+called for every request that changes a resource.
+"""
+
+import collections
+import logging
+import random
+import re
+import threading
+import time
+
+from six.moves.urllib.parse import urlparse
+
+# a resource ID: a UUID or a number such as the ID of a LAN
+_ID = re.compile(r'^([0-9a-fA-F]{8}-[-0-9a-fA-F]+|\d+)$')
+_VERSION = re.compile(r'^v\d+$')
+_REQUEST_ID = re.compile(r'/requests/([-A-Fa-f0-9]+)/')
+
+
+def operation_type(method, url):
+    """
+    Returns the type of the operation of a request by its method and the
+    last two resource types of its URL, e.g. 'POST datacenters/volumes'
+    for creating and 'POST servers/volumes' for attaching a volume.
+    """
+    segments = urlparse(url).path.strip('/').split('/')
+    for position, segment in enumerate(segments):
+        if _VERSION.match(segment):
+            segments = segments[position + 1:]
+            break
+    names = [segment for segment in segments if not _ID.match(segment)]
+    return '{} {}'.format(method.upper(), '/'.join(names[-2:]))
+
+
+class FixedPolling(object):
+    """
+    Poll at once, then every `initial_wait` seconds. The interval is
+    doubled after `scaleup` times the interval, the number of steps until
+    the next doubling is doubled as well.
+
+    :param      initial_wait: Initial polling interval in seconds.
+    :type       initial_wait: ``int``
+
+    :param      scaleup: Double polling interval every scaleup steps, which will be doubled.
+                         None keeps the interval.
+    :type       scaleup: ``int``
+
+    """
+
+    def __init__(self, initial_wait=5, scaleup=10):
+        self.initial_wait = initial_wait
+        self.scaleup = scaleup
+
+    def begin(self, request_id=None, key=None):
+        """
+        Returns the schedule of one wait for a request or another operation.
+        """
+        return _FixedSchedule(self.initial_wait, self.scaleup, request_id or key)
+
+
+class _FixedSchedule(object):
+
+    def __init__(self, wait_period, scaleup, name=None):
+        self.name = name
+        self.wait_period = wait_period
+        self.scaleup = scaleup
+        self.next_increase = time.time() + wait_period * scaleup \
+            if scaleup is not None else None
+        self.polls = 0
+
+    def next_delay(self):
+        self.polls += 1
+        if self.polls == 1:
+            return 0
+        current_time = time.time()
+        if self.next_increase is not None and current_time > self.next_increase:
+            self.wait_period *= 2
+            self.next_increase = current_time + self.wait_period * self.scaleup
+            self.scaleup *= 2
+            logging.getLogger(__name__).debug(
+                'Polling %s every %s seconds from now on.', self.name, self.wait_period)
+        return self.wait_period
+
+    def finish(self):
+        pass
+
+
+class AdaptivePolling(object):
+    """
+    Poll near the expected completion time of each type of operation.
+
+    Like the retransmission timer of TCP, the latency of an operation
+    type is estimated by exponentially weighted moving averages of the
+    observed latencies and of their deviation from the estimate. The
+    first poll of a request is sent when the estimate less half the
+    deviation has passed since the request was sent, varied by a random
+    `jitter` so that many waits do not poll at the same time. If the
+    request is not finished yet, polls follow at intervals growing from
+    half the deviation. Operations without an estimate are polled at
+    intervals growing from `min_wait`. No interval exceeds `max_wait`.
+
+    :param      min_wait: Minimum polling interval in seconds.
+    :type       min_wait: ``float``
+
+    :param      max_wait: Maximum polling interval in seconds.
+    :type       max_wait: ``float``
+
+    :param      jitter: Fraction by which the time of the first poll is
+                        varied at random.
+    :type       jitter: ``float``
+
+    :param      weight: Weight of a new observation in the estimate.
+    :type       weight: ``float``
+
+    :param      backoff: Factor by which the interval grows after a poll
+                         of an unfinished request.
+    :type       backoff: ``float``
+
+    :param      estimates: Initial latency estimates in seconds by
+                           operation type, with a deviation of a quarter
+                           of the estimate.
+    :type       estimates: ``dict``
+
+    :param      max_tracked: Maximum number of requests remembered until
+                             they are waited for.
+    :type       max_tracked: ``int``
+
+    """
+
+    def __init__(self, min_wait=1.0, max_wait=60.0, jitter=0.05, weight=0.3, backoff=1.5,
+                 estimates=None, max_tracked=10000):
+        self.min_wait = min_wait
+        self.max_wait = max_wait
+        self.jitter = jitter
+        self.weight = weight
+        self.backoff = backoff
+        self.max_tracked = max_tracked
+        self._lock = threading.Lock()
+        # operation type -> (latency, deviation)
+        self._estimates = dict((key, (latency, latency / 4.0))
+                               for key, latency in (estimates or {}).items())
+        # request ID -> (operation type, time the request was sent)
+        self._tracked = collections.OrderedDict()
+        self.waits = 0
+        self.polls = 0
+
+    def track(self, method, url, location):
+        """
+        Remembers the type and start of the request with the Location
+        header `location`.
+        """
+        match = _REQUEST_ID.search(location or '')
+        if match is None:
+            return
+        with self._lock:
+            self._tracked[match.group(1)] = (operation_type(method, url), time.time())
+            while len(self._tracked) > self.max_tracked:
+                self._tracked.popitem(last=False)
+
+    def begin(self, request_id=None, key=None):
+        """
+        Returns the schedule of one wait.
+
+        :param      request_id: The request to wait for. Its operation type
+                                and start are known if the request was
+                                sent by a service using this strategy.
+        :type       request_id: ``str``
+
+        :param      key: The operation type, overriding the tracked one.
+                         Waits without a type are not learned from.
+        :type       key: ``str``
+
+        """
+        started = None
+        with self._lock:
+            self.waits += 1
+            tracked = self._tracked.pop(request_id, None) if request_id else None
+        if tracked is not None:
+            key = key or tracked[0]
+            started = tracked[1]
+        return _AdaptiveSchedule(self, key, started or time.time())
+
+    def estimate(self, key):
+        """
+        Returns the latency estimate of an operation type, or None.
+        """
+        with self._lock:
+            estimate = self._estimates.get(key)
+        return estimate[0] if estimate is not None else None
+
+    def deviation(self, key):
+        """
+        Returns the estimated deviation of the latency of an operation
+        type, or None.
+        """
+        with self._lock:
+            estimate = self._estimates.get(key)
+        return estimate[1] if estimate is not None else None
+
+    def observe(self, key, latency):
+        """
+        Adds an observed latency of an operation type to its estimate.
+        """
+        with self._lock:
+            estimate = self._estimates.get(key)
+            if estimate is None:
+                self._estimates[key] = (latency, latency / 4.0)
+            else:
+                mean, deviation = estimate
+                self._estimates[key] = (
+                    mean + self.weight * (latency - mean),
+                    deviation + self.weight * (abs(latency - mean) - deviation))
+
+    def _count_poll(self):
+        with self._lock:
+            self.polls += 1
+
+    def stats(self):
+        """
+        Returns the counters and the latency estimates as a dict.
+        """
+        with self._lock:
+            return {
+                'waits': self.waits,
+                'polls': self.polls,
+                'estimates': dict((key, estimate[0])
+                                  for key, estimate in self._estimates.items()),
+            }
+
+
+class _AdaptiveSchedule(object):
+
+    def __init__(self, polling, key, started):
+        self.polling = polling
+        self.key = key
+        self.started = started
+        # times since the start at which the last two polls were sent; the
+        # previous one found the request unfinished
+        self.polled = None
+        self.unfinished = None
+        self._wait = None
+
+    def next_delay(self):
+        polling = self.polling
+        polling._count_poll()  # pylint: disable=protected-access
+        delay = self._next_delay(polling, time.time() - self.started)
+        self.unfinished = self.polled
+        self.polled = time.time() - self.started + delay
+        return delay
+
+    def _next_delay(self, polling, elapsed):
+        if self._wait is not None:
+            delay = self._wait
+            self._wait = min(polling.max_wait, self._wait * polling.backoff)
+            return delay
+
+        mean = polling.estimate(self.key) if self.key is not None else None
+        if mean is None:
+            self._wait = min(polling.max_wait, polling.min_wait * polling.backoff)
+            return polling.min_wait
+        deviation = polling.deviation(self.key)
+        self._wait = min(polling.max_wait, max(polling.min_wait, deviation / 2.0))
+        expected = (mean - deviation / 2.0) * (1 + random.uniform(-polling.jitter, polling.jitter))
+        return max(0.0, expected - elapsed)
+
+    def finish(self):
+        """
+        Called when the request was found finished.
+        """
+        if self.key is None or self.polled is None:
+            return
+        polling = self.polling
+        # the request finished between the last two polls
+        finished = self.polled
+        if self.unfinished is None:
+            # finished before the first poll; assume it finished within the
+            # jitter, so that estimates that are too high come down
+            unfinished = finished * (1 - 2 * polling.jitter)
+        else:
+            unfinished = self.unfinished
+        polling.observe(self.key, (unfinished + finished) / 2.0)
@@ -0,0 +1,160 @@
+# Copyright 2015-2019 IONOS
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Client side rate limiting of API requests.
+
+A limiter is passed to IonosEnterpriseService(rate_limiter=...) and every
+request of the service waits for a token before it is sent. The same
+limiter object can be shared by several clients.
+"""
+
+import os
+import threading
+import time
+
+try:
+    import fcntl
+    HAS_FCNTL = True
+except ImportError:
+    HAS_FCNTL = False
+
+
+class RateLimiter(object):
+    """
+    Thread-safe token bucket.
+
+    The bucket holds up to `burst` tokens and is refilled with `rate`
+    tokens per second. Every request takes one token; if none is left,
+    the caller sleeps until its token is due. Waiting callers are served
+    in the order they arrived.
+
+    :param      rate: Sustained number of requests per second.
+    :type       rate: ``float``
+
+    :param      burst: Number of requests that may be sent at once.
+    :type       burst: ``int``
+
+    """
+
+    def __init__(self, rate, burst=1):
+        if rate <= 0:
+            raise ValueError("rate must be greater than zero")
+        if burst < 1:
+            raise ValueError("burst must be at least one")
+        self.rate = float(rate)
+        self.burst = burst
+        self._lock = threading.Lock()
+        self._tokens = float(burst)
+        self._updated = time.time()
+        self._stats_lock = threading.Lock()
+        self.requests = 0
+        self.delayed = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def _take(self, tokens, updated, now):
+        """
+        Takes one token from a bucket with the given state.
+
+        Returns the new state and the time to wait for the token. The
+        token count becomes negative while callers are waiting, which
+        reserves the next tokens in arrival order.
+        """
+        tokens = min(float(self.burst), tokens + (now - updated) * self.rate) - 1
+        wait = -tokens / self.rate if tokens < 0 else 0.0
+        return tokens, now, wait
+
+    def _reserve(self):
+        with self._lock:
+            self._tokens, self._updated, wait = self._take(self._tokens, self._updated,
+                                                           time.time())
+        return wait
+
+    def acquire(self):
+        """
+        Blocks until the next request may be sent.
+
+        Returns the number of seconds the caller waited.
+        """
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+        with self._stats_lock:
+            self.requests += 1
+            if wait > 0:
+                self.delayed += 1
+                self.total_wait += wait
+                self.max_wait = max(self.max_wait, wait)
+        return wait
+
+    def stats(self):
+        """
+        Returns the waiting statistics of this process as a dict.
+        """
+        with self._stats_lock:
+            return {
+                'requests': self.requests,
+                'delayed': self.delayed,
+                'total_wait': self.total_wait,
+                'max_wait': self.max_wait,
+                'average_wait': self.total_wait / self.requests if self.requests else 0.0,
+            }
+
+
+class FileRateLimiter(RateLimiter):
+    """
+    Token bucket shared by all processes using the same state file.
+
+    The bucket state is kept in `path` and updated under an exclusive
+    file lock, so cron jobs and workers on one host can share the rate
+    limit of a contract. Only available on POSIX systems.
+
+    :param      rate: Sustained number of requests per second.
+    :type       rate: ``float``
+
+    :param      burst: Number of requests that may be sent at once.
+    :type       burst: ``int``
+
+    :param      path: Path of the file holding the bucket state.
+    :type       path: ``str``
+
+    """
+
+    def __init__(self, rate, burst=1, path=None):
+        if not HAS_FCNTL:
+            raise Exception("FileRateLimiter needs the 'fcntl' module, "
+                            "which is not available on this platform.")
+        if path is None:
+            raise ValueError("path must be given")
+        super(FileRateLimiter, self).__init__(rate, burst)
+        self.path = path
+
+    def _reserve(self):
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            state = os.read(fd, 64).split()
+            now = time.time()
+            try:
+                tokens, updated = float(state[0]), float(state[1])
+            except (IndexError, ValueError):
+                tokens, updated = float(self.burst), now
+            tokens, updated, wait = self._take(tokens, updated, now)
+            os.lseek(fd, 0, os.SEEK_SET)
+            os.ftruncate(fd, 0)
+            os.write(fd, '{!r} {!r}'.format(tokens, updated).encode('ascii'))
+        finally:
+            os.close(fd)
+        return wait
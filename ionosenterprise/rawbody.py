@@ -0,0 +1,95 @@
+# Copyright 2015-2019 IONOS
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Request bodies sent without the ionoscloud model round trip.
+
+The create_* methods build their request bodies as camelCase dicts (see
+requests/dicts.py). By default these dicts are wrapped in ionoscloud
+models, which the ApiClient turns back into dicts before encoding them.
+With IonosEnterpriseService(raw_bodies=True) the dicts are validated here
+and handed to the transport as they are.
+"""
+
+import six
+
+from ionosenterprise.errors import ICValidationError
+
+_SCALARS = six.string_types + six.integer_types + (float, bool, type(None))
+
+
+class RawBody(dict):
+    """
+    A request body the ApiClient sends without sanitizing it.
+    """
+
+
+def _invalid(message, path):
+    return ICValidationError(422, [{'message': '{} at {}'.format(message, path)}])
+
+
+def _check_value(value, path):
+    if isinstance(value, _SCALARS):
+        return
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if not isinstance(key, six.string_types):
+                raise _invalid('Key {!r} is not a string'.format(key), path)
+            _check_value(item, '{}.{}'.format(path, key))
+    elif isinstance(value, (list, tuple)):
+        for i, item in enumerate(value):
+            _check_value(item, '{}[{}]'.format(path, i))
+    else:
+        raise _invalid('{} value is not JSON serializable'.format(type(value).__name__), path)
+
+
+def validate_resource(resource, path='body'):
+    """
+    Checks a resource dict with 'properties' and optional 'entities'.
+
+    Entities must be collections of resources, i.e. dicts with a list of
+    'items'. Items that only reference an existing resource by 'id' are
+    accepted without properties.
+
+    :param      resource: The request body.
+    :type       resource: ``dict``
+
+    """
+    if not isinstance(resource, dict):
+        raise _invalid('Expected an object', path)
+    properties = resource.get('properties')
+    if properties is None and 'id' not in resource:
+        raise _invalid("Missing 'properties'", path)
+    if properties is not None and not isinstance(properties, dict):
+        raise _invalid("'properties' is not an object", path)
+    for key, value in resource.items():
+        if key == 'entities':
+            if not isinstance(value, dict):
+                raise _invalid("'entities' is not an object", path)
+            for name, collection in value.items():
+                items = collection.get('items') if isinstance(collection, dict) else None
+                if not isinstance(items, list):
+                    raise _invalid("Missing 'items' list", '{}.entities.{}'.format(path, name))
+                for i, item in enumerate(items):
+                    validate_resource(item, '{}.entities.{}.items[{}]'.format(path, name, i))
+        else:
+            _check_value(value, '{}.{}'.format(path, key))
+
+
+def raw_body(resource):
+    """
+    Validates a resource dict and returns it as RawBody.
+    """
+    validate_resource(resource)
+    return RawBody(resource)
@@ -1,3 +1,4 @@
+import urllib3
 from coreadaptor.AuthAdaptor import AuthAdaptor
 from ionosenterprise import __version__
 from .dicts import dicts
@@ -25,8 +26,10 @@ from .k8s_nodepools import k8s_nodepools
 from .pccs import pccs
 from .backupunit import backupunit
 from .s3key import s3key
+from ..paging import add_iter_methods
 
 
+@add_iter_methods
 class IonosEnterpriseRequests(
     dicts,
     datacenter,
@@ -55,12 +58,66 @@ class IonosEnterpriseRequests(
     s3key
 ):
     def get_api_client(self):
-        auth_adaptor = AuthAdaptor(self.username, self.password).get_api_client()
-        auth_adaptor.user_agent = "ionos-cloud-sdk-python-compat/%s" % __version__
-        return auth_adaptor
+        """
+        Returns the ApiClient shared by all calls of this service.
+
+        The client and its connection pool are created on first use and
+        kept until close() is called, so consecutive calls reuse open
+        (TLS) connections. The client is safe to use from several threads.
+        """
+        api_client = self._api_client
+        if api_client is None:
+            with self._api_client_lock:
+                api_client = self._api_client
+                if api_client is None:
+                    api_client = self._create_api_client()
+                    self._api_client = api_client
+        return api_client
+
+    def _create_api_client(self):
+        retries = None
+        if self.retry_policy is not None:
+            # all retries, of connection errors too, are left to the policy
+            retries = urllib3.Retry(total=0, respect_retry_after_header=False)
+        api_client = AuthAdaptor(self.username, self.password, host=self.host_base,
+                                 verify_ssl=self.verify, cert_file=self.host_cert,
+                                 pool_size=self.pool_size, retries=retries).get_api_client()
+        api_client.user_agent = "ionos-cloud-sdk-python-compat/%s" % __version__
+        api_client.rate_limiter = self.rate_limiter
+        api_client.retry_policy = self.retry_policy
+        api_client.response_cache = self.response_cache
+        api_client.name_resolver = self.name_resolver
+        api_client.polling = self.polling
+        api_client.json_backend = self.json_backend
+        return api_client
 
     def get_api_instance(self, apiClass):
-        return apiClass(self.get_api_client())
+        api_instance = self._api_instances.get(apiClass)
+        if api_instance is None:
+            api_instance = self._api_instances.setdefault(apiClass,
+                                                          apiClass(self.get_api_client()))
+        return api_instance
+
+    def close(self):
+        """
+        Closes the pooled connections of this service.
+
+        The service can still be used afterwards; a new connection pool
+        is created on the next call.
+        """
+        with self._api_client_lock:
+            api_client = self._api_client
+            self._api_client = None
+            self._api_instances = dict()
+        if api_client is not None:
+            api_client.close()
+            api_client.rest_client.pool_manager.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
 
 __all__ = ['IonosEnterpriseRequests']
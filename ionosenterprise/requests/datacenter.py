@@ -1,5 +1,6 @@
 import ionoscloud
 from coreadaptor.IonosCoreProxy import IonosCoreProxy
+from ionosenterprise.keymap import keymap
 from ..utils import find_item_by_name
 
 
@@ -30,7 +31,6 @@ class datacenter:
                 datacenter_id, depth=depth, response_type='object'
             )
 
-    @IonosCoreProxy.process_response
     def get_datacenter_by_name(self, name, depth=1):
         """
         Retrieves a data center by its name.
@@ -52,7 +52,8 @@ class datacenter:
         :param      depth: The depth of the response data.
         :type       depth: ``int``
         """
-        all_data_centers = self.list_datacenters(depth=depth)['items']
+        # the names are listed at depth 1, only a deeper match is fetched again
+        all_data_centers = self.list_datacenters(depth=1)['items']
         data_center = find_item_by_name(all_data_centers, lambda i: i['properties']['name'], name)
         if not data_center:
             raise NameError("No data center found with name "
@@ -63,7 +64,9 @@ class datacenter:
                 name=name,
                 names=", ".join(d['properties']['name'] for d in data_center)
             ))
-        return data_center[0]
+        if depth <= 1:
+            return data_center[0]
+        return self.get_datacenter(data_center[0]['id'], depth=depth)
 
     @IonosCoreProxy.process_response
     def delete_datacenter(self, datacenter_id):
@@ -180,11 +183,7 @@ class datacenter:
                 "entities": entities
             }
 
-        if 'entities' not in raw:
-            datacenter = ionoscloud.models.Datacenter(properties=raw['properties'])
-        else:
-            datacenter = ionoscloud.models.Datacenter(
-                properties=raw['properties'], entities=raw['entities'])
+        datacenter = self._request_body(ionoscloud.models.Datacenter, raw)
 
         return self.get_api_instance(ionoscloud.DataCenterApi)\
             .datacenters_post_with_http_info(datacenter, response_type='object')
@@ -198,10 +197,7 @@ class datacenter:
         :type       datacenter_id: ``str``
 
         """
-        data = {}
-
-        for attr, value in kwargs.items():
-            data[self._underscore_to_camelcase(attr)] = value
+        data = keymap(ionoscloud.models.DatacenterProperties).to_keys(kwargs)
 
         return self.get_api_instance(ionoscloud.DataCenterApi) \
             .datacenters_put_with_http_info(
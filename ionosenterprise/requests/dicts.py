@@ -1,413 +1,350 @@
-class dicts:
-    @staticmethod
-    def _create_lan_dict(lan):
-        items = []
-        entities = dict()
+from ionosenterprise.rawbody import raw_body
+
+# When a field is put into the properties of a request body.
+ALWAYS = 'always'
+IF_SET = 'set'
+IF_NOT_NONE = 'not_none'
+IF_NO_IMAGE = 'no_image'
+
+
+def _lower_str(value):
+    return str(value).lower()
+
+
+def _reference(value):
+    return {"id": value}
+
+
+# (attribute of the item, key in the properties, condition, coercion or None),
+# in the order of the keys in the request body. Required attributes that are
+# not provided are omitted to receive a meaningful error message from the API.
+LAN_FIELDS = (
+    ('name', 'name', ALWAYS, None),
+    ('public', 'public', IF_NOT_NONE, _lower_str),
+    ('pcc', 'pcc', IF_NOT_NONE, None),
+)
+
+LOADBALANCER_FIELDS = (
+    ('name', 'name', IF_SET, None),
+    ('ip', 'ip', IF_SET, None),
+    ('dhcp', 'dhcp', IF_NOT_NONE, _lower_str),
+)
+
+NIC_FIELDS = (
+    ('name', 'name', ALWAYS, None),
+    ('lan', 'lan', IF_SET, None),
+    ('nat', 'nat', IF_SET, None),
+    ('ips', 'ips', IF_SET, None),
+    ('dhcp', 'dhcp', IF_NOT_NONE, None),
+    ('firewall_active', 'firewallActive', IF_NOT_NONE, None),
+)
+
+FIREWALL_RULE_FIELDS = (
+    ('name', 'name', IF_SET, None),
+    ('protocol', 'protocol', IF_SET, None),
+    ('source_mac', 'sourceMac', IF_SET, None),
+    ('source_ip', 'sourceIp', IF_SET, None),
+    ('target_ip', 'targetIp', IF_SET, None),
+    ('port_range_start', 'portRangeStart', IF_SET, None),
+    ('port_range_end', 'portRangeEnd', IF_SET, None),
+    ('icmp_type', 'icmpType', IF_SET, None),
+    ('icmp_code', 'icmpCode', IF_SET, None),
+)
+
+SERVER_FIELDS = (
+    ('name', 'name', ALWAYS, None),
+    ('ram', 'ram', IF_SET, None),
+    ('cores', 'cores', IF_SET, None),
+    ('availability_zone', 'availabilityZone', IF_SET, None),
+    ('boot_cdrom', 'bootCdrom', IF_SET, None),
+    ('boot_volume_id', 'bootVolume', IF_SET, _reference),
+    ('cpu_family', 'cpuFamily', IF_SET, None),
+)
+
+VOLUME_FIELDS = (
+    ('name', 'name', ALWAYS, None),
+    ('size', 'size', IF_SET, int),
+    ('availability_zone', 'availabilityZone', IF_SET, None),
+    ('image', 'image', IF_SET, None),
+    ('image_alias', 'imageAlias', IF_SET, None),
+    ('bus', 'bus', IF_SET, None),
+    ('disk_type', 'type', IF_SET, None),
+    ('licence_type', 'licenceType', IF_NO_IMAGE, None),
+    ('image_password', 'imagePassword', IF_SET, None),
+    ('ssh_keys', 'sshKeys', IF_SET, None),
+)
+
+GROUP_FIELDS = (
+    ('name', 'name', IF_SET, None),
+    ('reserve_ip', 'reserveIp', IF_SET, None),
+    ('create_snapshot', 'createSnapshot', IF_SET, None),
+    ('create_datacenter', 'createDataCenter', IF_SET, None),
+    ('access_activity_log', 'accessActivityLog', IF_SET, None),
+)
+
+USER_FIELDS = (
+    ('firstname', 'firstname', IF_SET, None),
+    ('lastname', 'lastname', IF_SET, None),
+    ('email', 'email', IF_SET, None),
+    ('password', 'password', IF_SET, None),
+    ('administrator', 'administrator', IF_SET, None),
+    ('force_sec_auth', 'forceSecAuth', IF_SET, None),
+)
+
+PRIVATECROSSCONNECT_FIELDS = (
+    ('name', 'name', IF_SET, None),
+    ('description', 'description', IF_SET, None),
+)
+
+BACKUPUNIT_FIELDS = (
+    ('name', 'name', IF_SET, None),
+    ('password', 'password', IF_SET, None),
+    ('email', 'email', IF_SET, None),
+)
+
+
+# The builders below are the tables above written out as straight-line code,
+# which is faster than any loop over a table. tests/test_dicts.py checks
+# each of them against its table.
+
+def _lan_properties(lan):
+    properties = {"name": lan.name}
+    if lan.public is not None:
+        properties["public"] = _lower_str(lan.public)
+    if lan.pcc is not None:
+        properties["pcc"] = lan.pcc
+    return properties
+
+
+def _loadbalancer_properties(loadbalancer):
+    properties = {}
+    if loadbalancer.name:
+        properties["name"] = loadbalancer.name
+    if loadbalancer.ip:
+        properties["ip"] = loadbalancer.ip
+    if loadbalancer.dhcp is not None:
+        properties["dhcp"] = _lower_str(loadbalancer.dhcp)
+    return properties
+
+
+def _group_properties(group):
+    properties = {}
+    if group.name:
+        properties["name"] = group.name
+    if group.reserve_ip:
+        properties["reserveIp"] = group.reserve_ip
+    if group.create_snapshot:
+        properties["createSnapshot"] = group.create_snapshot
+    if group.create_datacenter:
+        properties["createDataCenter"] = group.create_datacenter
+    if group.access_activity_log:
+        properties["accessActivityLog"] = group.access_activity_log
+    return properties
+
+
+def _user_properties(user):
+    properties = {}
+    if user.firstname:
+        properties["firstname"] = user.firstname
+    if user.lastname:
+        properties["lastname"] = user.lastname
+    if user.email:
+        properties["email"] = user.email
+    if user.password:
+        properties["password"] = user.password
+    if user.administrator:
+        properties["administrator"] = user.administrator
+    if user.force_sec_auth:
+        properties["forceSecAuth"] = user.force_sec_auth
+    return properties
+
+
+def _privatecrossconnect_properties(privatecrossconnect):
+    properties = {}
+    if privatecrossconnect.name:
+        properties["name"] = privatecrossconnect.name
+    if privatecrossconnect.description:
+        properties["description"] = privatecrossconnect.description
+    return properties
+
+
+def _backupunit_properties(backupunit):
+    properties = {}
+    if backupunit.name:
+        properties["name"] = backupunit.name
+    if backupunit.password:
+        properties["password"] = backupunit.password
+    if backupunit.email:
+        properties["email"] = backupunit.email
+    return properties
+
+
+def _resource(properties, entities):
+    if not entities:
+        return {"properties": properties}
+    return {"properties": properties, "entities": entities}
+
+
+def _firewall_rule(rule):
+    properties = {}
+    if rule.name:
+        properties["name"] = rule.name
+    if rule.protocol:
+        properties["protocol"] = rule.protocol
+    if rule.source_mac:
+        properties["sourceMac"] = rule.source_mac
+    if rule.source_ip:
+        properties["sourceIp"] = rule.source_ip
+    if rule.target_ip:
+        properties["targetIp"] = rule.target_ip
+    if rule.port_range_start:
+        properties["portRangeStart"] = rule.port_range_start
+    if rule.port_range_end:
+        properties["portRangeEnd"] = rule.port_range_end
+    if rule.icmp_type:
+        properties["icmpType"] = rule.icmp_type
+    if rule.icmp_code:
+        properties["icmpCode"] = rule.icmp_code
+    return {"properties": properties}
+
+
+def _volume(volume):
+    properties = {"name": volume.name}
+    if volume.size:
+        properties["size"] = int(volume.size)
+    if volume.availability_zone:
+        properties["availabilityZone"] = volume.availability_zone
+    image = volume.image
+    if image:
+        properties["image"] = image
+    image_alias = volume.image_alias
+    if image_alias:
+        properties["imageAlias"] = image_alias
+    if volume.bus:
+        properties["bus"] = volume.bus
+    if volume.disk_type:
+        properties["type"] = volume.disk_type
+    # the licence type of an image is taken from the image
+    if image is None and image_alias is None:
+        properties["licenceType"] = volume.licence_type
+    if volume.image_password:
+        properties["imagePassword"] = volume.image_password
+    if volume.ssh_keys:
+        properties["sshKeys"] = volume.ssh_keys
+    return {"properties": properties}
+
+
+def _nic(nic):
+    properties = {"name": nic.name}
+    if nic.lan:
+        properties["lan"] = nic.lan
+    if nic.nat:
+        properties["nat"] = nic.nat
+    if nic.ips:
+        properties["ips"] = nic.ips
+    if nic.dhcp is not None:
+        properties["dhcp"] = nic.dhcp
+    if nic.firewall_active is not None:
+        properties["firewallActive"] = nic.firewall_active
+    if nic.firewall_rules:
+        return {"properties": properties,
+                "entities": {"firewallrules": {"items": [_firewall_rule(rule)
+                                                         for rule in nic.firewall_rules]}}}
+    return {"properties": properties}
+
+
+def _server(server):
+    properties = {"name": server.name}
+    if server.ram:
+        properties["ram"] = server.ram
+    if server.cores:
+        properties["cores"] = server.cores
+    if server.availability_zone:
+        properties["availabilityZone"] = server.availability_zone
+    if server.boot_cdrom:
+        properties["bootCdrom"] = server.boot_cdrom
+    if server.boot_volume_id:
+        properties["bootVolume"] = _reference(server.boot_volume_id)
+    if server.cpu_family:
+        properties["cpuFamily"] = server.cpu_family
+
+    entities = {}
+    volume_items = []
+
+    if server.create_volumes:
+        volume_items = [_volume(volume) for volume in server.create_volumes]
+        entities["volumes"] = {"items": volume_items}
+
+    if server.nics:
+        entities["nics"] = {"items": [_nic(nic) for nic in server.nics]}
+
+    # Attach Existing Volume(s)
+    if server.attach_volumes:
+        volume_items.extend({"id": volume} for volume in server.attach_volumes)
+        entities["volumes"] = {"items": volume_items}
+
+    if entities:
+        return {"properties": properties, "entities": entities}
+    return {"properties": properties}
 
-        properties = {
-            "name": lan.name
-        }
 
-        # Optional Properties
-        if lan.public is not None:
-            properties['public'] = str(lan.public).lower()
+class dicts:
+    def _request_body(self, model, raw):
+        """
+        Returns the request body for a dict built by one of the methods below.
 
-        if lan.pcc is not None:
-            properties['pcc'] = lan.pcc
+        The dict is wrapped in the ionoscloud model, or validated and sent
+        as is if the service was created with raw_bodies=True.
+        """
+        if getattr(self, 'raw_bodies', False):
+            return raw_body(raw)
+        return model(**raw)
 
+    @staticmethod
+    def _create_lan_dict(lan):
+        entities = None
         if lan.nics:
-            for nic in lan.nics:
-                nics_properties = {
-                    "id": nic
-                }
-                items.append(nics_properties)
-
-            item_entities = {
-                "items": items
-            }
-
-            nics_entities = {
-                "nics": item_entities
-            }
-
-            entities.update(nics_entities)
-
-        if not entities:
-            raw = {
-                "properties": properties,
-            }
-        else:
-            raw = {
-                "properties": properties,
-                "entities": entities
-            }
-
-        return raw
+            entities = {"nics": {"items": [_reference(nic) for nic in lan.nics]}}
+        return _resource(_lan_properties(lan), entities)
 
     @staticmethod
     def _create_loadbalancer_dict(loadbalancer):
-        items = []
-        entities = dict()
-
-        properties = {}
-
-        if loadbalancer.name:
-            properties['name'] = loadbalancer.name
-
-        # Optional Properties
-        if loadbalancer.ip:
-            properties['ip'] = loadbalancer.ip
-        if loadbalancer.dhcp is not None:
-            properties['dhcp'] = str(loadbalancer.dhcp).lower()
-
+        entities = None
         if loadbalancer.balancednics:
-            for nic in loadbalancer.balancednics:
-                balancednic_properties = {
-                    "id": nic
-                }
-                items.append(balancednic_properties)
-
-            item_entities = {
-                "items": items
-            }
-
-            balancednics_entities = {
-                "balancednics": item_entities
-            }
-
-            entities.update(balancednics_entities)
-
-        if not loadbalancer.balancednics:
-            raw = {
-                "properties": properties,
-            }
-        else:
-            raw = {
-                "properties": properties,
-                "entities": entities
-            }
-
-        return raw
+            entities = {"balancednics": {"items": [_reference(nic)
+                                                   for nic in loadbalancer.balancednics]}}
+        return _resource(_loadbalancer_properties(loadbalancer), entities)
 
     @staticmethod
     def _create_k8s_dict(cluster_name):
-        properties = {
-            "name": cluster_name
-        }
-
-        raw = {
-            "properties": properties,
-        }
-
-        return raw
+        return {"properties": {"name": cluster_name}}
 
     def _create_nic_dict(self, nic):
-        items = []
-
-        properties = {
-            "name": nic.name
-        }
-
-        if nic.lan:
-            properties['lan'] = nic.lan
-
-        # Optional Properties
-        if nic.nat:
-            properties['nat'] = nic.nat
-
-        if nic.ips:
-            properties['ips'] = nic.ips
-
-        if nic.dhcp is not None:
-            properties['dhcp'] = nic.dhcp
-
-        if nic.firewall_active is not None:
-            properties['firewallActive'] = nic.firewall_active
-
-        if nic.firewall_rules:
-            for rule in nic.firewall_rules:
-                items.append(self._create_firewallrules_dict(rule))
-
-        rules = {
-            "items": items
-        }
-
-        entities = {
-            "firewallrules": rules
-        }
-
-        if not nic.firewall_rules:
-            raw = {
-                "properties": properties,
-            }
-        else:
-            raw = {
-                "properties": properties,
-                "entities": entities
-            }
-
-        return raw
+        return _nic(nic)
 
     @staticmethod
     def _create_firewallrules_dict(rule):
-        properties = {}
-
-        if rule.name:
-            properties['name'] = rule.name
-
-        if rule.protocol:
-            properties['protocol'] = rule.protocol
-
-        if rule.source_mac:
-            properties['sourceMac'] = rule.source_mac
-
-        if rule.source_ip:
-            properties['sourceIp'] = rule.source_ip
-
-        if rule.target_ip:
-            properties['targetIp'] = rule.target_ip
-
-        if rule.port_range_start:
-            properties['portRangeStart'] = rule.port_range_start
-
-        if rule.port_range_end:
-            properties['portRangeEnd'] = rule.port_range_end
-
-        if rule.icmp_type:
-            properties['icmpType'] = rule.icmp_type
-
-        if rule.icmp_code:
-            properties['icmpCode'] = rule.icmp_code
-
-        raw = {
-            "properties": properties
-        }
-
-        return raw
+        return _firewall_rule(rule)
 
     def _create_server_dict(self, server):
-        volume_items = []
-        nic_items = []
-        entities = dict()
-
-        properties = {
-            "name": server.name
-        }
-
-        # Omit required attributes, if not provided,
-        # to receive a proper error message.
-        if server.ram:
-            properties['ram'] = server.ram
-
-        if server.cores:
-            properties['cores'] = server.cores
-
-        # Optional Properties
-        if server.availability_zone:
-            properties['availabilityZone'] = server.availability_zone
-
-        if server.boot_cdrom:
-            properties['bootCdrom'] = server.boot_cdrom
-
-        if server.boot_volume_id:
-            boot_volume = {
-                "id": server.boot_volume_id
-            }
-            properties['bootVolume'] = boot_volume
-
-        if server.cpu_family:
-            properties['cpuFamily'] = server.cpu_family
-
-        if server.create_volumes:
-            for volume in server.create_volumes:
-                volume_items.append(self._create_volume_dict(volume))
-
-            volumes = {
-                "items": volume_items
-            }
-
-            volume_entities = {
-                "volumes": volumes
-            }
-
-            entities.update(volume_entities)
-
-        if server.nics:
-            for nic in server.nics:
-                nic_items.append(self._create_nic_dict(nic))
-
-            nics = {
-                "items": nic_items
-            }
-
-            nic_entities = {
-                "nics": nics
-            }
-            entities.update(nic_entities)
-
-        # Attach Existing Volume(s)
-        if server.attach_volumes:
-            for volume in server.attach_volumes:
-                volume_properties = {
-                    "id": volume
-                }
-                volume_items.append(volume_properties)
-
-            volumes = {
-                "items": volume_items
-            }
-
-            volume_entities = {
-                "volumes": volumes
-            }
-
-            entities.update(volume_entities)
-
-        if not entities:
-            raw = {
-                "properties": properties,
-            }
-        else:
-            raw = {
-                "properties": properties,
-                "entities": entities
-            }
-
-        return raw
+        return _server(server)
 
     @staticmethod
     def _create_volume_dict(volume):
-        properties = {
-            "name": volume.name
-        }
-
-        # Omit 'size' attributes, if not provided,
-        # to receive a proper error message.
-        if volume.size:
-            properties['size'] = int(volume.size)
-
-        # Optional Properties
-        if volume.availability_zone:
-            properties['availabilityZone'] = volume.availability_zone
-
-        if volume.image:
-            properties['image'] = volume.image
-
-        if volume.image_alias:
-            properties['imageAlias'] = volume.image_alias
-
-        if volume.bus:
-            properties['bus'] = volume.bus
-
-        if volume.disk_type:
-            properties['type'] = volume.disk_type
-
-        if volume.image is None and volume.image_alias is None:
-            properties['licenceType'] = volume.licence_type
-
-        # if volume.licence_type:
-        #     properties['licenceType'] = volume.licence_type
-
-        if volume.image_password:
-            properties['imagePassword'] = volume.image_password
-
-        if volume.ssh_keys:
-            properties['sshKeys'] = volume.ssh_keys
-
-        raw = {
-            "properties": properties
-        }
-
-        return raw
+        return _volume(volume)
 
     @staticmethod
     def _create_group_dict(group):
-        properties = {}
-
-        if group.name:
-            properties['name'] = group.name
-
-        # Optional Properties
-        if group.reserve_ip:
-            properties['reserveIp'] = group.reserve_ip
-
-        if group.create_snapshot:
-            properties['createSnapshot'] = group.create_snapshot
-
-        if group.create_datacenter:
-            properties['createDataCenter'] = \
-                group.create_datacenter
-
-        if group.access_activity_log:
-            properties['accessActivityLog'] = \
-                group.access_activity_log
-
-        raw = {
-            "properties": properties
-        }
-
-        return raw
+        return {"properties": _group_properties(group)}
 
     @staticmethod
     def _create_user_dict(user):
-        properties = {}
-
-        if user.firstname:
-            properties['firstname'] = user.firstname
-
-        if user.lastname:
-            properties['lastname'] = user.lastname
-
-        if user.email:
-            properties['email'] = user.email
-
-        if user.password:
-            properties['password'] = user.password
-
-        # Optional Properties
-        if user.administrator:
-            properties['administrator'] = user.administrator
-
-        if user.force_sec_auth:
-            properties['forceSecAuth'] = user.force_sec_auth
-
-        raw = {
-            "properties": properties
-        }
-
-        return raw
+        return {"properties": _user_properties(user)}
 
     @staticmethod
     def _create_privatecrossconnect_dict(privatecrossconnect):
-        properties = {}
-
-        if privatecrossconnect.name:
-            properties['name'] = privatecrossconnect.name
-
-        if privatecrossconnect.description:
-            properties['description'] = privatecrossconnect.description
-
-        raw = {
-            "properties": properties
-        }
-
-        return raw
+        return {"properties": _privatecrossconnect_properties(privatecrossconnect)}
 
     @staticmethod
     def _create_backupunit_dict(backupunit):
-        properties = {}
-
-        if backupunit.name:
-            properties['name'] = backupunit.name
-
-        if backupunit.password:
-            properties['password'] = backupunit.password
-
-        if backupunit.email:
-            properties['email'] = backupunit.email
-
-        raw = {
-            "properties": properties
-        }
-
-        return raw
+        return {"properties": _backupunit_properties(backupunit)}
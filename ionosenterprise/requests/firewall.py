@@ -1,5 +1,6 @@
 import ionoscloud
 from coreadaptor.IonosCoreProxy import IonosCoreProxy
+from ionosenterprise.keymap import keymap
 
 
 class firewall:
@@ -126,9 +127,8 @@ class firewall:
         if firewall_rule.icmp_code:
             properties['icmpCode'] = firewall_rule.icmp_code
 
-        firewallRule = ionoscloud.models.FirewallRule(
-            properties=properties
-        )
+        firewallRule = self._request_body(ionoscloud.models.FirewallRule,
+                                          {'properties': properties})
         return self.get_api_instance(ionoscloud.NicApi) \
             .datacenters_servers_nics_firewallrules_post_with_http_info(
             datacenter_id, server_id, nic_id, firewallRule, response_type='object')
@@ -152,27 +152,7 @@ class firewall:
         :type       firewall_rule_id: ``str``
 
         """
-        data = {}
-
-        for attr, value in kwargs.items():
-            data[self._underscore_to_camelcase(attr)] = value
-
-            if attr == 'source_mac':
-                data['sourceMac'] = value
-            elif attr == 'source_ip':
-                data['sourceIp'] = value
-            elif attr == 'target_ip':
-                data['targetIp'] = value
-            elif attr == 'port_range_start':
-                data['portRangeStart'] = value
-            elif attr == 'port_range_end':
-                data['portRangeEnd'] = value
-            elif attr == 'icmp_type':
-                data['icmpType'] = value
-            elif attr == 'icmp_code':
-                data['icmpCode'] = value
-            else:
-                data[self._underscore_to_camelcase(attr)] = value
+        data = keymap(ionoscloud.models.FirewallruleProperties).to_keys(kwargs)
 
         return self.get_api_instance(ionoscloud.NicApi) \
             .datacenters_servers_nics_firewallrules_patch_with_http_info(
@@ -1,5 +1,6 @@
 import ionoscloud
 from coreadaptor.IonosCoreProxy import IonosCoreProxy
+from ionosenterprise.keymap import keymap
 
 
 class group:
@@ -57,14 +58,8 @@ class group:
         :type       group_id: ``str``
 
         """
-        properties = {}
-
-        # make the key camel-case transformable
-        if 'create_datacenter' in kwargs:
-            kwargs['create_data_center'] = kwargs.pop('create_datacenter')
-
-        for attr, value in kwargs.items():
-            properties[self._underscore_to_camelcase(attr)] = value
+        # create_datacenter is accepted as well, see keymap.ALIASES
+        properties = keymap(ionoscloud.models.GroupProperties).to_keys(kwargs)
 
         return self.get_api_instance(ionoscloud.UserManagementApi)\
             .um_groups_put_with_http_info(
@@ -1,5 +1,6 @@
 import ionoscloud
 from coreadaptor.IonosCoreProxy import IonosCoreProxy
+from ionosenterprise.keymap import keymap
 
 
 class image:
@@ -44,10 +45,7 @@ class image:
         Replace all properties of an image.
 
         """
-        data = {}
-
-        for attr, value in kwargs.items():
-            data[self._underscore_to_camelcase(attr)] = value
+        data = keymap(ionoscloud.models.ImageProperties).to_keys(kwargs)
 
         return self.get_api_instance(ionoscloud.ImageApi)\
             .images_patch_with_http_info(image_id, ionoscloud.models.Image(properties=data),
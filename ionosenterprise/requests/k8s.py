@@ -1,5 +1,6 @@
 import ionoscloud
 from coreadaptor.IonosCoreProxy import IonosCoreProxy
+from ionosenterprise.keymap import keymap
 
 
 class k8s:
@@ -73,11 +74,7 @@ class k8s:
         :type       k8s_cluster_id: ``str``
 
         """
-
-        data = {}
-
-        for attr, value in kwargs.items():
-            data[self._underscore_to_camelcase(attr)] = value
+        data = keymap(ionoscloud.models.KubernetesClusterProperties).to_keys(kwargs)
 
         kubernetesCluster = ionoscloud.models.KubernetesCluster(
             properties=data
@@ -1,5 +1,6 @@
 import ionoscloud
 from coreadaptor.IonosCoreProxy import IonosCoreProxy
+from ionosenterprise.keymap import keymap
 
 
 class loadbalancer:
@@ -67,10 +68,11 @@ class loadbalancer:
 
         return self.get_api_instance(ionoscloud.LoadBalancerApi)\
             .datacenters_loadbalancers_post_with_http_info(datacenter_id,
-                                                           ionoscloud.models.Loadbalancer(
-                                                                **self._create_loadbalancer_dict(
-                                                                    loadbalancer
-                                                                )
+                                                           self._request_body(
+                                                               ionoscloud.models.Loadbalancer,
+                                                               self._create_loadbalancer_dict(
+                                                                   loadbalancer
+                                                               )
                                                            ))
 
     @IonosCoreProxy.process_response
@@ -86,12 +88,9 @@ class loadbalancer:
         :type       loadbalancer_id: ``str``
 
         """
-        data = {}
+        data = keymap(ionoscloud.models.LoadbalancerProperties).to_attributes(kwargs)
 
-        for attr, value in kwargs.items():
-            data[self._underscore_to_camelcase(attr)] = value
-
-        loadbalancer = ionoscloud.models.LoadbalancerProperties(**kwargs)
+        loadbalancer = ionoscloud.models.LoadbalancerProperties(**data)
 
         return self.get_api_instance(ionoscloud.LoadBalancerApi)\
             .datacenters_loadbalancers_patch_with_http_info(
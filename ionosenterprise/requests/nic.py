@@ -1,5 +1,6 @@
 import ionoscloud
 from coreadaptor.IonosCoreProxy import IonosCoreProxy
+from ionosenterprise.keymap import keymap
 
 
 class nic:
@@ -88,8 +89,9 @@ class nic:
         return self.get_api_instance(ionoscloud.NicApi)\
             .datacenters_servers_nics_post_with_http_info(datacenter_id,
                                                           server_id,
-                                                          ionoscloud.models.Nic(
-                                                              **self._create_nic_dict(nic)
+                                                          self._request_body(
+                                                              ionoscloud.models.Nic,
+                                                              self._create_nic_dict(nic)
                                                           ),
                                                           response_type='object')
 
@@ -108,10 +110,7 @@ class nic:
         :type       nic_id: ``str``
 
         """
-        data = {}
-
-        for attr, value in kwargs.items():
-            data[self._underscore_to_camelcase(attr)] = value
+        data = keymap(ionoscloud.models.NicProperties).to_keys(kwargs)
 
         return self.get_api_instance(ionoscloud.NicApi)\
             .datacenters_servers_nics_patch_with_http_info(datacenter_id, server_id, nic_id,
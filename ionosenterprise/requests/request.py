@@ -24,11 +24,29 @@ class request:
             .requests_find_by_id_with_http_info(request_id, response_type='object')
 
     @IonosCoreProxy.process_response
-    def list_requests(self, depth=1):
+    def list_requests(self, depth=1, status=None, created_after=None, created_before=None):
         """
         Retrieves a list of requests available in the account.
 
+        :param      depth: The depth of the response data. With depth=2
+                           the items include the status of the requests.
+        :type       depth: ``int``
+
+        :param      status: Only list requests with this status, one of
+                            QUEUED, RUNNING, DONE or FAILED.
+        :type       status: ``str``
+
+        :param      created_after: Only list requests created after this
+                                   date, e.g. '2020-01-01T00:00:00Z'.
+        :type       created_after: ``str``
+
+        :param      created_before: Only list requests created before this date.
+        :type       created_before: ``str``
+
         """
 
         return self.get_api_instance(ionoscloud.RequestApi)\
-            .requests_get_with_http_info(depth=depth, response_type='object')
+            .requests_get_with_http_info(depth=depth, filter_status=status,
+                                         filter_created_after=created_after,
+                                         filter_created_before=created_before,
+                                         response_type='object')
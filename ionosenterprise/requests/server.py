@@ -1,5 +1,6 @@
 import ionoscloud
 from coreadaptor.IonosCoreProxy import IonosCoreProxy
+from ionosenterprise.keymap import keymap
 
 
 class server:
@@ -67,9 +68,7 @@ class server:
         :type       server: ``dict``
 
         """
-        server = ionoscloud.models.Server(
-            **self._create_server_dict(server)
-        )
+        server = self._request_body(ionoscloud.models.Server, self._create_server_dict(server))
         return self.get_api_instance(ionoscloud.ServerApi)\
             .datacenters_servers_post_with_http_info(datacenter_id,
                                                      server, response_type='object')
@@ -86,19 +85,10 @@ class server:
         :type       server_id: ``str``
 
         """
-        data = {}
+        data = keymap(ionoscloud.models.ServerProperties).to_keys(kwargs)
 
-        for attr, value in kwargs.items():
-            if attr == 'boot_volume':
-                boot_volume_properties = {
-                    "id": value
-                }
-                boot_volume_entities = {
-                    "bootVolume": boot_volume_properties
-                }
-                data.update(boot_volume_entities)
-            else:
-                data[self._underscore_to_camelcase(attr)] = value
+        if 'boot_volume' in kwargs:
+            data['bootVolume'] = {"id": kwargs['boot_volume']}
 
         return self.get_api_instance(ionoscloud.ServerApi)\
             .datacenters_servers_patch_with_http_info(datacenter_id, server_id, data,
@@ -1,5 +1,6 @@
 import ionoscloud
 from coreadaptor.IonosCoreProxy import IonosCoreProxy
+from ionosenterprise.keymap import keymap
 
 
 class share:
@@ -51,10 +52,7 @@ class share:
         :type       resource_id: ``str``
 
         """
-        properties = {}
-
-        for attr, value in kwargs.items():
-            properties[self._underscore_to_camelcase(attr)] = value
+        properties = keymap(ionoscloud.models.GroupShareProperties).to_keys(kwargs)
 
         resource = ionoscloud.models.GroupShare(
             properties=properties
@@ -76,10 +74,7 @@ class share:
         :type       resource_id: ``str``
 
         """
-        properties = {}
-
-        for attr, value in kwargs.items():
-            properties[self._underscore_to_camelcase(attr)] = value
+        properties = keymap(ionoscloud.models.GroupShareProperties).to_keys(kwargs)
 
         group_share = ionoscloud.models.GroupShare(
             properties=properties
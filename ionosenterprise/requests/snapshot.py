@@ -1,5 +1,6 @@
 import ionoscloud
 from coreadaptor.IonosCoreProxy import IonosCoreProxy
+from ionosenterprise.keymap import keymap
 
 
 class snapshot:
@@ -48,10 +49,11 @@ class snapshot:
         :param      snapshot_id: The unique ID of the snapshot.
         :type       snapshot_id: ``str``
         """
+        data = keymap(ionoscloud.models.SnapshotProperties).to_attributes(kwargs)
 
         return self.get_api_instance(ionoscloud.SnapshotApi)\
             .snapshots_patch_with_http_info(snapshot_id,
-                                            ionoscloud.models.SnapshotProperties(**kwargs),
+                                            ionoscloud.models.SnapshotProperties(**data),
                                             response_type='object')
 
     @IonosCoreProxy.process_response
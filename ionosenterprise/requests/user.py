@@ -1,5 +1,6 @@
 import ionoscloud
 from coreadaptor.IonosCoreProxy import IonosCoreProxy
+from ionosenterprise.keymap import keymap
 
 
 class user:
@@ -56,10 +57,7 @@ class user:
         :type       user_id: ``str``
 
         """
-        properties = {}
-
-        for attr, value in kwargs.items():
-            properties[self._underscore_to_camelcase(attr)] = value
+        properties = keymap(ionoscloud.models.UserProperties).to_keys(kwargs)
 
         user = ionoscloud.models.User(properties=properties)
         return self.get_api_instance(ionoscloud.UserManagementApi)\
@@ -1,5 +1,6 @@
 import ionoscloud
 from coreadaptor.IonosCoreProxy import IonosCoreProxy
+from ionosenterprise.keymap import keymap
 
 
 class volume:
@@ -64,9 +65,7 @@ class volume:
 
         """
 
-        volume = ionoscloud.models.Volume(
-            **self._create_volume_dict(volume)
-        )
+        volume = self._request_body(ionoscloud.models.Volume, self._create_volume_dict(volume))
         return self.get_api_instance(ionoscloud.VolumeApi)\
             .datacenters_volumes_post_with_http_info(datacenter_id, volume)
 
@@ -82,10 +81,7 @@ class volume:
         :type       volume_id: ``str``
 
         """
-        data = {}
-
-        for attr, value in kwargs.items():
-            data[self._underscore_to_camelcase(attr)] = value
+        data = keymap(ionoscloud.models.VolumeProperties).to_attributes(kwargs)
 
         return self.get_api_instance(ionoscloud.VolumeApi)\
             .datacenters_volumes_patch_with_http_info(datacenter_id, volume_id,
@@ -0,0 +1,265 @@
+# Copyright 2015-2019 IONOS
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Resolution of resource names to IDs.
+
+IonosEnterpriseService.resolve('server', datacenter_id, name) looks the
+name up in a NameIndex of the servers of the data center. The names of
+a scope are listed once and kept until their TTL expires. Expired
+scopes are listed again with depth=1, so that resources renamed by other
+clients are picked up. Scopes invalidated by requests of the service are
+refreshed incrementally: the IDs are listed with depth=0 and only
+resources that are new or were changed are fetched.
+
+Every create, update or delete request of the service that can change
+the names of a scope invalidates it.
+"""
+
+import collections
+import operator
+import threading
+import time
+
+from six.moves.urllib.parse import urlparse
+
+from .utils import NameIndex
+
+# list(service, scope, depth) and get(service, scope, resource_id) call the
+# service; in_scope(scope, resource) filters the listing, None keeps all
+_Kind = collections.namedtuple('_Kind', 'collection description list get in_scope')
+
+
+def _image_location(location, image):
+    return location is None or image['properties'].get('location') == location
+
+
+KINDS = {
+    'datacenter': _Kind(
+        'datacenters', 'data center',
+        lambda service, scope, depth: service.list_datacenters(depth=depth),
+        lambda service, scope, resource_id: service.get_datacenter(resource_id, depth=0),
+        None),
+    'server': _Kind(
+        'servers', 'server',
+        lambda service, scope, depth: service.list_servers(scope, depth=depth),
+        lambda service, scope, resource_id: service.get_server(scope, resource_id, depth=0),
+        None),
+    'lan': _Kind(
+        'lans', 'LAN',
+        lambda service, scope, depth: service.list_lans(scope, depth=depth),
+        lambda service, scope, resource_id: service.get_lan(scope, resource_id, depth=0),
+        None),
+    # the scope of images is their location, None for all images
+    'image': _Kind(
+        'images', 'image',
+        lambda service, scope, depth: service.list_images(depth=depth),
+        lambda service, scope, resource_id: service.get_image(resource_id),
+        _image_location),
+}
+
+_KINDS_BY_COLLECTION = dict((kind.collection, name) for name, kind in KINDS.items())
+
+
+class _Scope(object):
+    """The names of one kind of resources in one scope."""
+
+    def __init__(self):
+        # ID -> name in the order of the listing, None outside of the scope
+        self.names = None
+        self.index = None
+        self.expires = 0
+        self.stale = False
+        self.forget = set()
+        self.lock = threading.Lock()
+
+
+class NameResolver(object):
+    """
+    Thread-safe cache of name indexes per kind and scope.
+
+    :param      service: The service that lists and fetches the resources.
+    :type       service: ``IonosEnterpriseService``
+
+    :param      ttl: Time in seconds after which the names of a scope are
+                     listed again.
+    :type       ttl: ``float``
+
+    :param      max_fetches: Maximum number of new resources of a refresh
+                             that are fetched one by one. With more, the
+                             scope is listed again with depth=1.
+    :type       max_fetches: ``int``
+
+    """
+
+    def __init__(self, service, ttl=60, max_fetches=10):
+        self.service = service
+        self.ttl = ttl
+        self.max_fetches = max_fetches
+        self._lock = threading.Lock()
+        self._scopes = {}
+        self.hits = 0
+        self.list_calls = 0
+        self.fetches = 0
+        self.invalidations = 0
+
+    def _scope(self, kind, scope):
+        with self._lock:
+            result = self._scopes.get((kind, scope))
+            if result is None:
+                result = self._scopes[(kind, scope)] = _Scope()
+            return result
+
+    def resolve(self, kind, scope, name):
+        """
+        Returns the ID of the resource of the kind in the scope with the name.
+
+        Raises a NameError if no or more than one resource was found, see
+        get_datacenter_by_name() for the matching of the name.
+        """
+        spec = KINDS.get(kind)
+        if spec is None:
+            raise ValueError("Unknown kind '{}', expected one of {}".format(
+                kind, ", ".join(sorted(KINDS))))
+        entry = self._scope(kind, scope)
+        with entry.lock:
+            self._refresh(spec, scope, entry)
+            items = entry.index.find(name)
+
+        if not items:
+            raise NameError("No {kind} found with name containing '{name}'.".format(
+                kind=spec.description, name=name))
+        if len(items) > 1:
+            raise NameError("Found {n} {kind}s with the name '{name}': {names}".format(
+                n=len(items), kind=spec.description, name=name,
+                names=", ".join(item[1] for item in items)))
+        return items[0][0]
+
+    def _refresh(self, spec, scope, entry):
+        with self._lock:
+            stale, forget = entry.stale, entry.forget
+            entry.stale, entry.forget = False, set()
+
+        expired = entry.expires < time.time()
+        if entry.names is not None and not (stale or forget or expired):
+            self._count('hits')
+            return
+        try:
+            # other clients may have renamed any resource of an expired scope
+            if entry.names is None or expired:
+                names = self._list(spec, scope)
+            else:
+                names = self._update(spec, scope, entry.names, forget)
+        except Exception:
+            # refresh again on the next call
+            with self._lock:
+                entry.stale = True
+                entry.forget.update(forget)
+            raise
+
+        entry.names = names
+        entry.expires = time.time() + self.ttl
+        entry.index = NameIndex([item for item in names.items() if item[1] is not None],
+                                operator.itemgetter(1))
+
+    def _update(self, spec, scope, names, forget):
+        self._count('list_calls')
+        ids = [item['id'] for item in spec.list(self.service, scope, 0)['items']]
+        new = [resource_id for resource_id in ids
+               if resource_id not in names or resource_id in forget]
+        if len(new) > self.max_fetches:
+            return self._list(spec, scope)
+        self._count('fetches', len(new))
+        fetched = dict((resource_id, self._name(spec, scope, spec.get(
+            self.service, scope, resource_id))) for resource_id in new)
+        return collections.OrderedDict(
+            (resource_id, fetched[resource_id] if resource_id in fetched else names[resource_id])
+            for resource_id in ids)
+
+    def _count(self, counter, count=1):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + count)
+
+    def _list(self, spec, scope):
+        self._count('list_calls')
+        return collections.OrderedDict(
+            (item['id'], self._name(spec, scope, item))
+            for item in spec.list(self.service, scope, 1)['items'])
+
+    @staticmethod
+    def _name(spec, scope, resource):
+        if spec.in_scope is not None and not spec.in_scope(scope, resource):
+            return None
+        return resource['properties'].get('name') or ''
+
+    def invalidate(self, method, url):
+        """
+        Invalidates the names a request to the URL can change.
+
+        A POST to a collection marks its scope for a refresh, any other
+        request to a resource drops the resource from the scopes of its
+        kind. Deleting a data center drops the scopes within it.
+
+        :param      method: The HTTP method of the request.
+        :type       method: ``str``
+
+        :param      url: The URL of the request.
+        :type       url: ``str``
+
+        """
+        segments = urlparse(url).path.strip('/').split('/')
+        for position in range(len(segments) - 1, max(len(segments) - 3, -1), -1):
+            kind = _KINDS_BY_COLLECTION.get(segments[position])
+            if kind is not None:
+                break
+        else:
+            return
+        parent = None
+        if position >= 2 and segments[position - 2] == 'datacenters':
+            parent = segments[position - 1]
+
+        with self._lock:
+            if position == len(segments) - 1:
+                if method != 'POST':
+                    return
+                scopes = [entry for (k, scope), entry in self._scopes.items()
+                          if k == kind and (parent is None or scope == parent)]
+                for entry in scopes:
+                    entry.stale = True
+            else:
+                resource_id = segments[position + 1]
+                scopes = [entry for (k, scope), entry in self._scopes.items() if k == kind]
+                for entry in scopes:
+                    entry.forget.add(resource_id)
+                if kind == 'datacenter' and method == 'DELETE':
+                    for key in [key for key in self._scopes if key[1] == resource_id]:
+                        del self._scopes[key]
+            self.invalidations += len(scopes)
+
+    def clear(self):
+        with self._lock:
+            self._scopes.clear()
+
+    def stats(self):
+        """
+        Returns the counters and the number of scopes as a dict.
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'list_calls': self.list_calls,
+                'fetches': self.fetches,
+                'invalidations': self.invalidations,
+                'scopes': len(self._scopes),
+            }
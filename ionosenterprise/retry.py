@@ -0,0 +1,253 @@
+# Copyright 2015-2019 IONOS
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Automatic retries of failed API requests.
+
+A RetryPolicy is passed to IonosEnterpriseService(retry_policy=...). Both
+transports of the service ask the policy whether and when to repeat a
+request that failed with a retryable status code or a connection error.
+"""
+
+import email.utils
+import random
+import threading
+import time
+
+import urllib3
+
+IDEMPOTENT_METHODS = ('GET', 'HEAD', 'OPTIONS', 'DELETE')
+
+
+def _parse_retry_after(value):
+    """
+    Returns the delay in seconds of a Retry-After header value.
+
+    The value is either a number of seconds or an HTTP date.
+    """
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    parsed = email.utils.parsedate_tz(value)
+    if parsed is None:
+        return None
+    return max(0.0, email.utils.mktime_tz(parsed) - time.time())
+
+
+def _not_sent(error):
+    """
+    Whether the connection failed before the request was sent, which
+    makes it safe to retry with any method.
+    """
+    # requests wraps the MaxRetryError of urllib3 in the first argument of
+    # its ConnectionError, and the MaxRetryError wraps the failure as reason
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        if isinstance(error, (urllib3.exceptions.NewConnectionError,
+                              urllib3.exceptions.ConnectTimeoutError)):
+            return True
+        if isinstance(error, urllib3.exceptions.MaxRetryError):
+            error = error.reason
+        elif error.args and isinstance(error.args[0], Exception):
+            error = error.args[0]
+        else:
+            return False
+    return False
+
+
+class RetryPolicy(object):
+    """
+    Retry with decorrelated jitter backoff.
+
+    The delay before a retry is drawn from [base_delay, 3 * previous delay]
+    and capped by max_delay. A Retry-After header or an exhausted
+    X-RateLimit-Remaining with X-RateLimit-Reset increases the delay to
+    what the server asked for. No retry is started that would end after
+    the deadline.
+
+    :param      max_retries: Maximum number of retries per request.
+    :type       max_retries: ``int``
+
+    :param      base_delay: Minimum delay between two attempts in seconds.
+    :type       base_delay: ``float``
+
+    :param      max_delay: Maximum delay between two attempts in seconds.
+    :type       max_delay: ``float``
+
+    :param      deadline: Maximum time in seconds from the first attempt
+                          until the last retry is started. None means
+                          no limit.
+    :type       deadline: ``float``
+
+    :param      status_codes: HTTP status codes that are retried.
+    :type       status_codes: ``tuple``
+
+    :param      retry_put_patch: Also retry PUT and PATCH requests. POST
+                                 requests are only retried if the
+                                 connection failed before they were sent.
+    :type       retry_put_patch: ``bool``
+
+    """
+
+    def __init__(self, max_retries=5, base_delay=0.5, max_delay=30.0, deadline=120.0,
+                 status_codes=(429, 500, 502, 503, 504), retry_put_patch=False):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self.status_codes = frozenset(status_codes)
+        self.retry_put_patch = retry_put_patch
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.retried_requests = 0
+        self.retries = 0
+        self.backoff_time = 0.0
+        self.exhausted = 0
+
+    def is_idempotent(self, method):
+        method = method.upper()
+        if method in IDEMPOTENT_METHODS:
+            return True
+        return self.retry_put_patch and method in ('PUT', 'PATCH')
+
+    def next_delay(self, previous):
+        """
+        Returns the next backoff delay (decorrelated jitter).
+        """
+        upper = max(self.base_delay, previous * 3)
+        return min(self.max_delay, random.uniform(self.base_delay, upper))
+
+    @staticmethod
+    def delay_from_headers(headers):
+        """
+        Returns the delay requested by the response headers, or None.
+        """
+        if not headers:
+            return None
+        value = headers.get('Retry-After')
+        if value is not None:
+            return _parse_retry_after(value)
+        remaining = headers.get('X-RateLimit-Remaining')
+        reset = headers.get('X-RateLimit-Reset')
+        if remaining is not None and reset is not None and remaining.strip() == '0':
+            try:
+                reset = float(reset)
+            except ValueError:
+                return None
+            # either seconds until the reset or the epoch time of the reset
+            if reset > time.time() - 86400:
+                reset -= time.time()
+            return max(0.0, reset)
+        return None
+
+    def begin(self, method):
+        """
+        Returns the RetryState for one request.
+        """
+        return RetryState(self, method)
+
+    def record(self, state, exhausted):
+        with self._lock:
+            self.requests += 1
+            if state.retries:
+                self.retried_requests += 1
+                self.retries += state.retries
+                self.backoff_time += state.backoff_time
+            if exhausted:
+                self.exhausted += 1
+
+    def stats(self):
+        """
+        Returns the retry metrics of this policy as a dict.
+        """
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'retried_requests': self.retried_requests,
+                'retries': self.retries,
+                'backoff_time': self.backoff_time,
+                'exhausted': self.exhausted,
+            }
+
+
+class RetryState(object):
+    """
+    Tracks the attempts of one request under a RetryPolicy.
+    """
+
+    def __init__(self, policy, method):
+        self.policy = policy
+        self.method = method
+        self.started = time.time()
+        self.retries = 0
+        self.backoff_time = 0.0
+        self._delay = 0.0
+
+    def retry_delay(self, status=None, headers=None, error=None):
+        """
+        Returns how long to wait before the next attempt, or None to give up.
+
+        :param      status: HTTP status code of the failed attempt.
+        :type       status: ``int``
+
+        :param      headers: Response headers of the failed attempt.
+        :type       headers: ``dict``
+
+        :param      error: Connection error of the failed attempt.
+        :type       error: ``Exception``
+
+        """
+        policy = self.policy
+        if not policy.is_idempotent(self.method) and not _not_sent(error):
+            return None
+        if error is None and status not in policy.status_codes:
+            return None
+        if self.retries >= policy.max_retries:
+            return None
+
+        self._delay = policy.next_delay(self._delay)
+        delay = self._delay
+        requested = policy.delay_from_headers(headers)
+        if requested is not None:
+            delay = max(delay, requested)
+
+        if policy.deadline is not None and \
+                time.time() + delay - self.started > policy.deadline:
+            return None
+        return delay
+
+    def sleep(self, delay):
+        time.sleep(delay)
+        self.retries += 1
+        self.backoff_time += delay
+
+    def finish(self, error=None, failed=False):
+        """
+        Records the outcome and attaches the retry counters to the error.
+
+        :param      error: The exception the request finally failed with.
+        :type       error: ``Exception``
+
+        :param      failed: The request finally failed with an error response.
+        :type       failed: ``bool``
+
+        """
+        failed = failed or error is not None
+        self.policy.record(self, exhausted=failed and self.retries > 0)
+        if error is not None:
+            error.retries = self.retries
+            error.retry_time = self.backoff_time
+        return error
@@ -0,0 +1,98 @@
+# Copyright 2015-2019 IONOS
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Coalescing of identical concurrent read calls.
+
+With IonosEnterpriseService(single_flight=True), threads calling the same
+get_* or list_* method with the same arguments at the same time share one
+API request.
+"""
+
+import copy
+import threading
+
+
+class _Call(object):
+    """One in-flight call and its outcome."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight(object):
+    """
+    Runs at most one call per key at a time.
+
+    Callers arriving while a call with the same key is running wait for
+    it and receive a deep copy of its result, or its exception.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.calls = 0
+        self.shared = 0
+
+    def do(self, key, fn, *args, **kwargs):
+        """
+        Calls fn(*args, **kwargs) unless a call with the same key is in flight.
+
+        :param      key: Hashable identity of the call.
+        :type       key: ``tuple``
+
+        :param      fn: The function performing the call.
+        :type       fn: ``function``
+
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                self.calls += 1
+                leader = True
+            else:
+                call.waiters += 1
+                self.shared += 1
+                leader = False
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result)
+
+        try:
+            call.result = fn(*args, **kwargs)
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        if call.waiters:
+            # the waiters copy the result, so it must not change under them
+            return copy.deepcopy(call.result)
+        return call.result
+
+    def stats(self):
+        """
+        Returns the number of executed and of shared calls as a dict.
+        """
+        with self._lock:
+            return {'calls': self.calls, 'shared': self.shared}
@@ -0,0 +1,149 @@
+# Copyright 2015-2019 IONOS
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Streaming decode of large collection responses.
+
+iter_*(..., stream=True) reads the response from the socket in chunks and
+decodes the entries of its "items" array one at a time, so only the
+current item and one chunk are held in memory instead of the whole body,
+its decoded text and the resulting objects.
+"""
+
+import codecs
+import json
+
+from coreadaptor.IonosApiClient import stream_response
+
+CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = ' \t\n\r'
+_decoder = json.JSONDecoder()
+
+
+class _Buffer(object):
+    """Decoded text of a chunked UTF-8 JSON document."""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._decode = codecs.getincrementaldecoder('utf-8')().decode
+        self.text = ''
+        self.pos = 0
+        self.eof = False
+
+    def _read(self, size):
+        """Reads until at least size characters are left after pos."""
+        parts = [self.text[self.pos:]]
+        length = len(parts[0])
+        while not self.eof and length < size:
+            try:
+                part = self._decode(next(self._chunks))
+            except StopIteration:
+                part = self._decode(b'', True)
+                self.eof = True
+            parts.append(part)
+            length += len(part)
+        self.text = ''.join(parts)
+        self.pos = 0
+
+    def peek(self):
+        """Skips whitespace and returns the next character, '' at the end."""
+        while True:
+            text = self.text
+            while self.pos < len(text) and text[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(text):
+                return text[self.pos]
+            if self.eof:
+                return ''
+            self._read(1)
+
+    def expect(self, char):
+        found = self.peek()
+        if found != char:
+            raise ValueError("Expected '{}' in streamed JSON, found '{}'".format(char, found))
+        self.pos += 1
+
+    def value(self):
+        """Decodes the next JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.text, self.pos)
+            except ValueError:
+                if self.eof:
+                    raise
+                self._read(2 * (len(self.text) - self.pos) + CHUNK_SIZE)
+                continue
+            if end == len(self.text) and not self.eof:
+                # a number may continue in the next chunk
+                self._read(len(self.text) - self.pos + 1)
+                continue
+            self.pos = end
+            return value
+
+
+def iter_json_items(chunks):
+    """
+    Yields the entries of the top level "items" array of a JSON object.
+
+    :param      chunks: The UTF-8 encoded document in pieces of any size.
+    :type       chunks: ``iterable`` of ``bytes``
+
+    """
+    buf = _Buffer(chunks)
+    buf.expect('{')
+    if buf.peek() == '}':
+        return
+    while True:
+        key = buf.value()
+        buf.expect(':')
+        if key == 'items':
+            buf.expect('[')
+            if buf.peek() == ']':
+                buf.pos += 1
+            else:
+                while True:
+                    yield buf.value()
+                    if buf.peek() == ']':
+                        buf.pos += 1
+                        break
+                    buf.expect(',')
+        else:
+            buf.value()
+        if buf.peek() == '}':
+            return
+        buf.expect(',')
+
+
+def iter_stream(list_method, args, kwargs, chunk_size=CHUNK_SIZE):
+    """
+    Calls a list method and yields the collection items while they arrive.
+    """
+    with stream_response() as target:
+        list_method(*args, **kwargs)
+    response = target.response
+    if response is None:
+        raise Exception("'{}' did not issue a GET request".format(list_method.__name__))
+    finished = False
+    try:
+        for item in iter_json_items(response.stream(chunk_size)):
+            yield item
+        finished = True
+    finally:
+        if finished:
+            response.release_conn()
+        else:
+            # the rest of the body is still on the connection
+            response.close()
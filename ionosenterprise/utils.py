@@ -12,7 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import re
+import bisect
 
 
 def ask(question, options, default):
@@ -51,6 +51,105 @@ def ask(question, options, default):
     return selected
 
 
+# step of find_item_by_name() without a match
+_NO_MATCH = 6
+
+
+class NameIndex(object):
+    """
+    Index over the names of a list of elements for repeated lookups.
+
+    The lookup keeps the relaxing order of find_item_by_name(), every
+    step returns the matching elements in the order of the list:
+
+    - exact name match (dict)
+    - case-insentive name match (dict)
+    - attribute starts with the name (sorted names)
+    - attribute starts with the name (case insensitive, sorted names)
+    - name appears in the attribute
+    - name appears in the attribute (case insensitive)
+
+    The structures of a step are built when a lookup first reaches it,
+    so a single exact lookup costs one pass over the list.
+
+    :param    list_: A list of elements
+    :type     list_: ``list``
+
+    :param    namegetter: Function that returns the name for a given
+                          element in the list
+    :type     namegetter: ``function``
+
+    """
+
+    def __init__(self, list_, namegetter):
+        self.items = list(list_)
+        self.names = [namegetter(i) for i in self.items]
+        self._exact = None
+        self._folded_names = None
+        self._folded = None
+        self._sorted = None
+        self._sorted_folded = None
+
+    @staticmethod
+    def _positions(names):
+        positions = {}
+        for position, name in enumerate(names):
+            positions.setdefault(name, []).append(position)
+        return positions
+
+    @staticmethod
+    def _prefixed(sorted_names, prefix):
+        positions = []
+        start = bisect.bisect_left(sorted_names, (prefix,))
+        for index in range(start, len(sorted_names)):
+            name, position = sorted_names[index]
+            if not name.startswith(prefix):
+                break
+            positions.append(position)
+        return sorted(positions)
+
+    def _casefolded(self):
+        if self._folded_names is None:
+            self._folded_names = [name.casefold() for name in self.names]
+        return self._folded_names
+
+    def find(self, name):
+        """
+        Returns the elements matching the name, see the class.
+
+        :param    name: Name to search for
+        :type     name: ``str``
+
+        """
+        if self._exact is None:
+            self._exact = self._positions(self.names)
+        positions = self._exact.get(name)
+
+        if not positions:
+            if self._folded is None:
+                self._folded = self._positions(self._casefolded())
+            positions = self._folded.get(name.casefold())
+
+        if not positions:
+            if self._sorted is None:
+                self._sorted = sorted((n, i) for i, n in enumerate(self.names))
+            positions = self._prefixed(self._sorted, name)
+
+        if not positions:
+            if self._sorted_folded is None:
+                self._sorted_folded = sorted((n, i) for i, n in enumerate(self._casefolded()))
+            positions = self._prefixed(self._sorted_folded, name.casefold())
+
+        if not positions:
+            positions = [i for i, n in enumerate(self.names) if name in n]
+
+        if not positions:
+            folded = name.casefold()
+            positions = [i for i, n in enumerate(self._casefolded()) if folded in n]
+
+        return [self.items[i] for i in positions]
+
+
 def find_item_by_name(list_, namegetter, name):
     """
     Find a item a given list by a matching name.
@@ -64,6 +163,9 @@ def find_item_by_name(list_, namegetter, name):
     - name appears in the attribute
     - name appears in the attribute (case insensitive)
 
+    The list is scanned once, keeping the elements of the best step found
+    so far. Use a NameIndex to look up several names in the same list.
+
     :param    list_: A list of elements
     :type     list_: ``list``
 
@@ -75,20 +177,41 @@ def find_item_by_name(list_, namegetter, name):
     :type     name: ``str``
 
     """
-    matching_items = [i for i in list_ if namegetter(i) == name]
-    if not matching_items:
-        prog = re.compile(re.escape(name) + '$', re.IGNORECASE)
-        matching_items = [i for i in list_ if prog.match(namegetter(i))]
-    if not matching_items:
-        prog = re.compile(re.escape(name))
-        matching_items = [i for i in list_ if prog.match(namegetter(i))]
-    if not matching_items:
-        prog = re.compile(re.escape(name), re.IGNORECASE)
-        matching_items = [i for i in list_ if prog.match(namegetter(i))]
-    if not matching_items:
-        prog = re.compile(re.escape(name))
-        matching_items = [i for i in list_ if prog.search(namegetter(i))]
-    if not matching_items:
-        prog = re.compile(re.escape(name), re.IGNORECASE)
-        matching_items = [i for i in list_ if prog.search(namegetter(i))]
+    folded = name.casefold()
+    best = _NO_MATCH
+    matching_items = []
+    for item in list_:
+        item_name = namegetter(item)
+        if item_name == name:
+            step = 0
+        elif best == 0:
+            continue
+        else:
+            # the steps after the best step found so far are skipped
+            item_folded = item_name.casefold()
+            if item_folded == folded:
+                step = 1
+            elif best == 1:
+                continue
+            elif item_name.startswith(name):
+                step = 2
+            elif best == 2:
+                continue
+            elif item_folded.startswith(folded):
+                step = 3
+            elif best == 3:
+                continue
+            elif name in item_name:
+                step = 4
+            elif best == 4:
+                continue
+            elif folded in item_folded:
+                step = 5
+            else:
+                continue
+        if step < best:
+            best = step
+            matching_items = [item]
+        elif step == best:
+            matching_items.append(item)
     return matching_items
@@ -0,0 +1,579 @@
+# Copyright 2015-2019 IONOS
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Waiting for many provisioning requests at once.
+
+wait_for_completion() polls the status of one request. A RequestWaiter
+tracks any number of requests with one shared poller: while only a few
+are due their statuses are fetched one by one, with more they are read
+from a single listing of the recent requests of the account, so
+waiting for 300 requests costs one call per tick instead of 300:
+
+    waiter = RequestWaiter(client)
+    futures = [waiter.add(client.create_volume(datacenter_id, volume))
+               for volume in volumes]
+    waiter.run()
+
+Every request resolves as soon as its status is DONE or FAILED. The
+requests are polled on the schedules of the polling strategy of the
+client, or at a fixed interval.
+
+A StateWatcher waits for resources of one data center to reach a state,
+e.g. for 200 servers to be stopped, with one listing of the servers of
+the data center per poll instead of one read per server:
+
+    watcher = StateWatcher(client, datacenter_id)
+    futures = [watcher.watch(server_id, lambda server: server['metadata']['state'] == 'INACTIVE')
+               for server_id in server_ids]
+    watcher.run()
+
+run() polls in the calling thread. start() hands the waiter to the
+background thread shared by all waiters of the process, which polls
+while any of them has pending requests.
+"""
+
+import collections
+import logging
+import threading
+import time
+from concurrent.futures import Future
+
+import six
+
+from ionosenterprise.errors import ICFailedRequest, ICTimeoutError
+from ionosenterprise.polling import FixedPolling
+
+_DATE_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+
+
+class _Pending(object):
+    """An added request, its polling schedule and deadline."""
+
+    def __init__(self, future, added, deadline, schedule):
+        self.future = future
+        self.added = added
+        self.deadline = deadline
+        self.schedule = schedule
+        self.next_poll = added + schedule.next_delay()
+
+
+def request_id(response):
+    """
+    Returns the request ID of a response dict, or the ID itself if it is a
+    string. None if the response has no request ID.
+    """
+    if response is None or isinstance(response, six.string_types):
+        return response
+    return response.get('requestId')
+
+
+def _copy_result(source, target):
+    if source.exception() is not None:
+        target.set_exception(source.exception())
+    else:
+        target.set_result(source.result())
+
+
+class RequestWaiter(object):
+    """
+    Waits for many requests with one shared poller, see the module.
+
+    :param      client: The client to poll with.
+    :type       client: ``IonosEnterpriseService``
+
+    :param      interval: Polling interval in seconds. None polls on the
+                          schedules of the `polling` strategy of the
+                          client.
+    :type       interval: ``float``
+
+    :param      timeout: Maximum waiting time in seconds per request. None
+                         means infinite waiting time.
+    :type       timeout: ``int``
+
+    :param      bulk_threshold: With more requests due than this, the
+                                statuses are read from one listing of the
+                                requests instead of one call per request.
+    :type       bulk_threshold: ``int``
+
+    :param      clock_skew: Seconds subtracted from the time a request was
+                            added when listing the requests created after
+                            it, to allow for the clock of the API and the
+                            time between sending a request and adding it.
+    :type       clock_skew: ``int``
+
+    :param      coalesce: Requests due within this many seconds are polled
+                          together with the ones that are due, so that
+                          requests sent one after the other share listings.
+    :type       coalesce: ``float``
+
+    """
+
+    def __init__(self, client, interval=None, timeout=3600, bulk_threshold=3, clock_skew=300,
+                 coalesce=0.5):
+        self.client = client
+        self.interval = interval
+        self.timeout = timeout
+        self.bulk_threshold = bulk_threshold
+        self.clock_skew = clock_skew
+        self.coalesce = coalesce
+        if interval is not None:
+            self.polling = FixedPolling(interval, scaleup=None)
+        else:
+            self.polling = client.polling
+        self._lock = threading.Lock()
+        self._pending = collections.OrderedDict()
+        self._background = False
+        self.polls = 0
+        self.listings = 0
+
+    def add(self, response, future=None):
+        """
+        Returns a Future of the status metadata of the request of a response.
+
+        The Future of a response without request ID is already resolved
+        with None. A failed request sets an ICFailedRequest, one that is
+        not finished within the timeout an ICTimeoutError, one whose
+        status cannot be read the error of get_request(), e.g. an
+        ICNotFoundError.
+
+        :param      response: A response dict with a 'requestId' item or
+                              a request ID.
+        :type       response: ``dict`` or ``str``
+
+        :param      future: The Future to resolve, default a new one.
+        :type       future: ``concurrent.futures.Future``
+
+        """
+        rid = request_id(response)
+        if rid is None:
+            future = future if future is not None else Future()
+            future.set_result(None)
+            return future
+        with self._lock:
+            pending = self._pending.get(rid)
+            if pending is not None and future is None:
+                future = pending.future
+            elif pending is None:
+                future = future if future is not None else Future()
+                now = time.time()
+                deadline = now + self.timeout if self.timeout is not None else None
+                self._pending[rid] = _Pending(future, now, deadline, self.polling.begin(rid))
+            elif pending.future is not future:
+                pending.future.add_done_callback(lambda source: _copy_result(source, future))
+            background = self._background
+        if background:
+            _POLLER.register(self)
+        return future
+
+    def __len__(self):
+        with self._lock:
+            return len(self._pending)
+
+    def next_poll(self):
+        """
+        Returns the time of the next poll or deadline, None if no request
+        is pending.
+        """
+        with self._lock:
+            times = [pending.next_poll for pending in self._pending.values()]
+            times.extend(pending.deadline for pending in self._pending.values()
+                         if pending.deadline is not None)
+        return min(times) if times else None
+
+    def poll(self):
+        """
+        Fetches the statuses of the requests that are due once and resolves
+        the finished ones. Returns the number of requests still pending.
+        """
+        now = time.time()
+        with self._lock:
+            pending = list(self._pending.items())
+        if any(entry.next_poll <= now for _, entry in pending):
+            due = [(rid, entry) for rid, entry in pending
+                   if entry.next_poll <= now + self.coalesce]
+            statuses = self._statuses(pending, due)
+            due = set(rid for rid, _ in due)
+            for rid, entry in pending:
+                status = statuses.get(rid)
+                if isinstance(status, Exception):
+                    self._settle(rid, status)
+                elif status is not None and status['status'] in ('DONE', 'FAILED'):
+                    if rid in due:
+                        # only polls on schedule tell the schedule the latency
+                        entry.schedule.finish()
+                    self._settle(rid, status)
+                elif rid in due:
+                    self._reschedule([(rid, entry)])
+        self._expire()
+        return len(self)
+
+    def _statuses(self, pending, due):
+        # a status that cannot be read is the result of its request only
+        statuses = {}
+        if len(due) > self.bulk_threshold:
+            try:
+                statuses = self._list(min(entry.added for _, entry in pending))
+            except Exception:  # pylint: disable=broad-except
+                logging.getLogger(__name__).warning(
+                    'Listing the requests failed, polling them one by one', exc_info=True)
+        for rid, _ in due:
+            if rid not in statuses:
+                self.polls += 1
+                try:
+                    statuses[rid] = self.client.get_request(rid, status=True)['metadata']
+                except Exception as error:  # pylint: disable=broad-except
+                    statuses[rid] = error
+        return statuses
+
+    @staticmethod
+    def _reschedule(due):
+        now = time.time()
+        for _, entry in due:
+            entry.next_poll = now + entry.schedule.next_delay()
+
+    def _list(self, added):
+        # the statuses of the requests created since the oldest pending
+        # one; requests missing from the listing are polled one by one.
+        # filter.status takes one status, and a listing of the DONE
+        # requests alone does not tell the FAILED ones from the running
+        # ones, so the listing is bounded by the creation time instead.
+        self.listings += 1
+        created_after = time.strftime(_DATE_FORMAT, time.gmtime(added - self.clock_skew))
+        listing = self.client.list_requests(depth=2, created_after=created_after)
+        statuses = {}
+        for item in listing.get('items') or []:
+            status = ((item.get('metadata') or {}).get('requestStatus') or {}).get('metadata')
+            if status and 'status' in status:
+                statuses[item['id']] = status
+        return statuses
+
+    def _settle(self, rid, status):
+        with self._lock:
+            pending = self._pending.pop(rid, None)
+        if pending is None:
+            return
+        if isinstance(status, Exception):
+            pending.future.set_exception(status)
+        elif status['status'] == 'DONE':
+            pending.future.set_result(status)
+        else:
+            pending.future.set_exception(ICFailedRequest(
+                'Request {0} failed to complete: {1}'.format(rid, status.get('message')), rid))
+
+    def _expire(self):
+        now = time.time()
+        with self._lock:
+            expired = [rid for rid, pending in self._pending.items()
+                       if pending.deadline is not None and pending.deadline < now]
+            expired = [(rid, self._pending.pop(rid)) for rid in expired]
+        for rid, pending in expired:
+            pending.future.set_exception(ICTimeoutError(
+                'Timed out waiting for request {0}.'.format(rid), rid))
+
+    def run(self):
+        """
+        Polls in the calling thread until no request is pending.
+        """
+        while self.poll():
+            next_poll = self.next_poll()
+            if next_poll is not None:
+                time.sleep(max(0.0, next_poll - time.time()))
+
+    def cancel(self):
+        """
+        Stops waiting for the pending requests and cancels their Futures.
+        """
+        with self._lock:
+            pending = list(self._pending.values())
+            self._pending.clear()
+        for entry in pending:
+            entry.future.cancel()
+
+    def start(self):
+        """
+        Polls in the shared background thread from now on, whenever a
+        request is pending.
+        """
+        with self._lock:
+            self._background = True
+            pending = bool(self._pending)
+        if pending:
+            _POLLER.register(self)
+
+
+class _Watch(object):
+    """A watched resource, the predicate of its state and the deadline."""
+
+    def __init__(self, resource_id, predicate, future, deadline):
+        self.resource_id = resource_id
+        self.predicate = predicate
+        self.future = future
+        self.deadline = deadline
+
+
+class StateWatcher(object):
+    """
+    Waits for resources of a data center to reach states, see the module.
+
+    Every poll lists the resources of the data center once and calls the
+    predicate of each watched resource with its dict, or with None if it
+    is not in the listing, e.g. because it was deleted. A resource is
+    released as soon as its predicate is true.
+
+    :param      client: The client to poll with.
+    :type       client: ``IonosEnterpriseService``
+
+    :param      datacenter_id: The unique ID of the data center.
+    :type       datacenter_id: ``str``
+
+    :param      collection: The resources of the data center to list, with
+                            the `list_` method of the same name, e.g.
+                            'servers' or 'volumes'.
+    :type       collection: ``str``
+
+    :param      timeout: Maximum waiting time in seconds per resource. None
+                         means infinite waiting time.
+    :type       timeout: ``int``
+
+    :param      polling: Polling strategy, default the `polling` of the client.
+    :type       polling: ``AdaptivePolling``
+
+    :param      key: Type of the awaited changes, the polling strategy
+                     learns their duration under this key.
+    :type       key: ``str``
+
+    :param      depth: The depth of the listing.
+    :type       depth: ``int``
+
+    """
+
+    def __init__(self, client, datacenter_id, collection='servers', timeout=3600,
+                 polling=None, key=None, depth=1):
+        self.client = client
+        self.datacenter_id = datacenter_id
+        self.collection = collection
+        self.timeout = timeout
+        self.polling = polling if polling is not None else client.polling
+        self.key = key
+        self.depth = depth
+        self._lock = threading.Lock()
+        self._watches = []
+        # one schedule for the listing, from the first watch until all
+        # watched resources are released
+        self._schedule = None
+        self._next_poll = None
+        self._background = False
+        self.listings = 0
+
+    def watch(self, resource_id, predicate):
+        """
+        Returns a Future of the resource dict once predicate(resource) is
+        true. An exception raised by the predicate is set on the Future, as
+        is an ICTimeoutError if the state is not reached within the timeout.
+
+        :param      resource_id: The unique ID of the resource.
+        :type       resource_id: ``str``
+
+        :param      predicate: Function of the resource dict, or None.
+        :type       predicate: ``function``
+
+        """
+        future = Future()
+        with self._lock:
+            now = time.time()
+            deadline = now + self.timeout if self.timeout is not None else None
+            self._watches.append(_Watch(resource_id, predicate, future, deadline))
+            if self._schedule is None:
+                self._schedule = self.polling.begin(key=self.key)
+                self._next_poll = now + self._schedule.next_delay()
+            background = self._background
+        if background:
+            _POLLER.register(self)
+        return future
+
+    def __len__(self):
+        with self._lock:
+            return len(self._watches)
+
+    def next_poll(self):
+        """
+        Returns the time of the next poll or deadline, None if no resource
+        is watched.
+        """
+        with self._lock:
+            if not self._watches:
+                return None
+            times = [watch.deadline for watch in self._watches if watch.deadline is not None]
+            times.append(self._next_poll)
+        return min(times)
+
+    def poll(self):
+        """
+        Lists the resources once if a poll is due and releases those in
+        their states. Returns the number of resources still watched.
+        """
+        with self._lock:
+            watches = list(self._watches)
+            due = self._next_poll is not None and self._next_poll <= time.time()
+        if watches and due:
+            try:
+                resources = self._list()
+            except Exception:
+                self._reschedule()
+                raise
+            for watch in watches:
+                resource = resources.get(watch.resource_id)
+                try:
+                    reached = watch.predicate(resource)
+                except Exception as e:  # pylint: disable=broad-except
+                    self._release(watch, exception=e)
+                    continue
+                if reached:
+                    self._release(watch, resource)
+            self._reschedule()
+        self._expire()
+        return len(self)
+
+    def _list(self):
+        self.listings += 1
+        cache = self.client.response_cache
+        if cache is not None:
+            # the watched states change without requests of this client
+            cache.invalidate('{0}/datacenters/{1}/{2}'.format(
+                self.client.host_base, self.datacenter_id, self.collection))
+        list_resources = getattr(self.client, 'list_' + self.collection)
+        listing = list_resources(self.datacenter_id, depth=self.depth)
+        return dict((item['id'], item) for item in listing.get('items') or [])
+
+    def _reschedule(self):
+        with self._lock:
+            schedule = self._schedule
+            if schedule is None:
+                return
+            if self._watches:
+                self._next_poll = time.time() + schedule.next_delay()
+                return
+            self._schedule = None
+            self._next_poll = None
+        schedule.finish()
+
+    def _release(self, watch, resource=None, exception=None):
+        with self._lock:
+            if watch not in self._watches:
+                return
+            self._watches.remove(watch)
+        if exception is not None:
+            watch.future.set_exception(exception)
+        else:
+            watch.future.set_result(resource)
+
+    def _expire(self):
+        now = time.time()
+        with self._lock:
+            expired = [watch for watch in self._watches
+                       if watch.deadline is not None and watch.deadline < now]
+        for watch in expired:
+            self._release(watch, exception=ICTimeoutError(
+                'Timed out waiting for the state of {0} {1}.'.format(
+                    self.collection, watch.resource_id), None))
+        with self._lock:
+            if expired and not self._watches:
+                # not finished, so the schedule does not learn from it
+                self._schedule = None
+                self._next_poll = None
+
+    def run(self):
+        """
+        Polls in the calling thread until no resource is watched.
+        """
+        while self.poll():
+            next_poll = self.next_poll()
+            if next_poll is not None:
+                time.sleep(max(0.0, next_poll - time.time()))
+
+    def cancel(self):
+        """
+        Stops watching and cancels the Futures of the watched resources.
+        """
+        with self._lock:
+            watches = list(self._watches)
+            del self._watches[:]
+            self._schedule = None
+            self._next_poll = None
+        for watch in watches:
+            watch.future.cancel()
+
+    def start(self):
+        """
+        Polls in the shared background thread from now on, whenever a
+        resource is watched.
+        """
+        with self._lock:
+            self._background = True
+            watching = bool(self._watches)
+        if watching:
+            _POLLER.register(self)
+
+
+class _BackgroundPoller(object):
+    """
+    The thread polling the started waiters and watchers of the process.
+
+    The thread ends when no request is pending and is started again by
+    the next request.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._waiters = []
+        self._thread = None
+
+    def register(self, waiter):
+        with self._condition:
+            if waiter not in self._waiters:
+                self._waiters.append(waiter)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run,
+                                                name='ionosenterprise-request-poller')
+                self._thread.daemon = True
+                self._thread.start()
+            self._condition.notify()
+
+    def _run(self):
+        logger = logging.getLogger(__name__)
+        while True:
+            with self._condition:
+                self._waiters = [waiter for waiter in self._waiters if len(waiter)]
+                next_polls = [next_poll for next_poll in
+                              (waiter.next_poll() for waiter in self._waiters)
+                              if next_poll is not None]
+                if not next_polls:
+                    self._thread = None
+                    return
+                wait = min(next_polls) - time.time()
+                if wait > 0:
+                    self._condition.wait(wait)
+                    continue
+                waiters = list(self._waiters)
+            for waiter in waiters:
+                next_poll = waiter.next_poll()
+                if next_poll is not None and next_poll <= time.time():
+                    try:
+                        waiter.poll()
+                    except Exception:  # pylint: disable=broad-except
+                        logger.exception('Polling the status of requests failed.')
+
+
+_POLLER = _BackgroundPoller()
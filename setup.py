@@ -93,6 +93,8 @@ setup(
                  'Topic :: Software Development :: Libraries :: Application Frameworks',
                  'Topic :: Internet :: WWW/HTTP'],
     extras_require={
+        'async': ['aiohttp>=3.6', 'certifi'],
+        'fast-json': ['orjson>=3.0'],
         'testing': ['pytest'],
     }
 )
@@ -0,0 +1,90 @@
+# Copyright 2015-2019 IONOS
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+A local stand-in for the Cloud API, for the tests that run without an account.
+
+A StubTestCase serves its ``handler`` on a free port during every test,
+and new_client() returns services that send their requests to it.
+"""
+
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+
+from ionosenterprise.client import IonosEnterpriseService
+
+PREFIX = '/cloudapi/v5/'
+
+
+class ThreadingServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Base class of the request handlers of the stand-in API."""
+
+    def respond(self, status, document=None, headers=None):
+        """Sends the document as JSON, or an empty body if it is None."""
+        body = json.dumps(document).encode('utf-8') if document is not None else b''
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class StubTestCase(unittest.TestCase):
+    """
+    Runs ``server_class`` with ``handler`` in a thread during every test.
+
+    The server is stopped after the tests' own cleanups, so the clients
+    of new_client() are closed first.
+    """
+
+    handler = None
+    server_class = HTTPServer
+    # keyword arguments of every client, overridden by those of new_client()
+    client_options = {}
+
+    def setUp(self):
+        self.server = self.server_class(('127.0.0.1', 0), self.handler)
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+    @property
+    def host_base(self):
+        return 'http://127.0.0.1:{}/cloudapi/v5'.format(self.server.server_port)
+
+    def new_client(self, **kwargs):
+        """
+        Returns a service for the stand-in API that is closed after the test.
+        """
+        options = dict(username='username', password='password', use_config=False,
+                       use_keyring=False, host_base=self.host_base)
+        options.update(self.client_options)
+        options.update(kwargs)
+        client = IonosEnterpriseService(**options)
+        self.addCleanup(client.close)
+        return client
@@ -0,0 +1,146 @@
+# Copyright 2015-2019 IONOS
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import unittest
+
+from ionosenterprise.aio import AsyncIonosEnterpriseService, HAS_AIOHTTP
+from ionosenterprise.client import IonosEnterpriseService
+from ionosenterprise.errors import ICNotFoundError
+from ionosenterprise.items import Volume
+from ionosenterprise.polling import AdaptivePolling
+
+if HAS_AIOHTTP:
+    from aiohttp import web
+
+REQUEST_ID = '4de93b77-cd06-4bd6-a5fc-e3e8b0ef5dff'
+
+
+async def server(request):
+    return web.json_response({
+        'id': request.match_info['server_id'],
+        'type': 'server',
+        'properties': {'name': 'server', 'cores': 1, 'ram': 1024}
+    })
+
+
+async def not_found(request):
+    return web.json_response({'httpStatus': 404, 'messages': [
+        {'errorCode': '309', 'message': 'Resource does not exist'}]}, status=404)
+
+
+async def start_server(request):
+    return web.Response(status=202, headers={
+        'Location': 'https://localhost/cloudapi/v5/requests/{}/status'.format(REQUEST_ID)})
+
+
+async def create_volume(request):
+    volume = await request.json()
+    volume['id'] = 'volume-id'
+    return web.json_response(volume, status=202, headers={
+        'Location': 'https://localhost/cloudapi/v5/requests/{}/status'.format(REQUEST_ID)})
+
+
+STATUS_POLLS = []
+
+
+async def request_status(request):
+    # RUNNING at the first poll, DONE afterwards
+    STATUS_POLLS.append(request.match_info['request_id'])
+    status = 'RUNNING' if len(STATUS_POLLS) == 1 else 'DONE'
+    return web.json_response({'id': request.match_info['request_id'] + '/status',
+                              'metadata': {'status': status, 'message': status}})
+
+
+@unittest.skipUnless(HAS_AIOHTTP, "aiohttp is not installed")
+class TestAsyncClient(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        app = web.Application()
+        app.router.add_get('/cloudapi/v5/datacenters/{dc_id}/servers/{server_id}', server)
+        app.router.add_get('/cloudapi/v5/datacenters/{dc_id}', not_found)
+        app.router.add_post('/cloudapi/v5/datacenters/{dc_id}/servers/{server_id}/start',
+                            start_server)
+        app.router.add_post('/cloudapi/v5/datacenters/{dc_id}/volumes', create_volume)
+        app.router.add_get('/cloudapi/v5/requests/{request_id}/status', request_status)
+        del STATUS_POLLS[:]
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.client = AsyncIonosEnterpriseService(
+            username='username', password='password',
+            host_base='http://127.0.0.1:{}/cloudapi/v5'.format(port),
+            use_config=False, use_keyring=False,
+            polling=AdaptivePolling(min_wait=0.01, max_wait=0.05, jitter=0))
+
+    async def asyncTearDown(self):
+        await self.client.close()
+        await self.runner.cleanup()
+
+    def test_same_methods(self):
+        for name in ('get_server', 'list_volumes', 'create_nic', 'list_k8s_clusters'):
+            self.assertTrue(asyncio.iscoroutinefunction(getattr(self.client, name)))
+            self.assertEqual(getattr(self.client, name).__doc__,
+                             getattr(IonosEnterpriseService, name).__doc__)
+
+    async def test_get(self):
+        servers = await asyncio.gather(*[
+            self.client.get_server('dc', 'server-{}'.format(i)) for i in range(20)])
+        self.assertEqual([s['id'] for s in servers], ['server-{}'.format(i) for i in range(20)])
+        self.assertEqual(servers[0]['properties']['cores'], 1)
+
+    async def test_error(self):
+        with self.assertRaises(ICNotFoundError) as context:
+            await self.client.get_datacenter('dc')
+        self.assertEqual(context.exception.resp, 404)
+
+    async def test_several_requests(self):
+        builder = self.client._builder
+
+        def two_requests():
+            try:
+                builder.get_datacenter('dc')
+            except Exception:
+                pass
+            return builder.get_datacenter('other-dc')
+        builder.two_requests = two_requests
+        with self.assertRaises(Exception) as context:
+            self.client._capture('two_requests', (), {})
+        self.assertIn('2 API requests', str(context.exception))
+        capture = self.client._capture('get_datacenter', ('dc',), {})
+        self.assertTrue(capture.url.endswith('/datacenters/dc'))
+
+    async def test_action(self):
+        self.assertTrue(await self.client.start_server('dc', 'server'))
+
+    async def test_create(self):
+        volume = await self.client.create_volume(
+            'dc', Volume(name='volume', size=10, image_alias='ubuntu:latest'))
+        self.assertEqual(volume['requestId'], REQUEST_ID)
+        self.assertEqual(volume['properties']['name'], 'volume')
+        self.assertEqual(volume['properties']['image_alias'], 'ubuntu:latest')
+
+    async def test_wait_for_completion(self):
+        volume = await self.client.create_volume(
+            '9f4e4b4c-0c5d-4f6c-8c3e-2d1b0a9e8f7a', Volume(name='volume', size=10))
+        await self.client.wait_for_completion(volume, timeout=5)
+        self.assertEqual(STATUS_POLLS, [REQUEST_ID] * 2)
+        # the request was tracked, the schedule learns its operation type
+        self.assertIsNotNone(self.client.polling.estimate('POST datacenters/volumes'))
+        self.assertEqual(self.client.polling.stats()['waits'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+# Copyright 2015-2019 IONOS
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import time
+import unittest
+
+from ionosenterprise.client import IonosEnterpriseService
+from ionosenterprise.errors import ICNotFoundError
+
+
+class FakeService(IonosEnterpriseService):
+    def __init__(self):
+        super(FakeService, self).__init__(username='username', password='password',
+                                          use_config=False, use_keyring=False)
+        self.lock = threading.Lock()
+        self.running = 0
+        self.max_running = 0
+
+    def get_server(self, datacenter_id, server_id, depth=1):
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(0.01)
+        with self.lock:
+            self.running -= 1
+        if server_id == 'missing':
+            raise ICNotFoundError(404, 'Resource does not exist', server_id)
+        return {'id': server_id, 'depth': depth}
+
+
+class TestBatch(unittest.TestCase):
+    def setUp(self):
+        self.client = FakeService()
+
+    def test_map_keeps_order(self):
+        ids = ['server-{}'.format(i) for i in range(40)]
+        results = self.client.map('get_server', [('dc', i) for i in ids], max_workers=4)
+        self.assertEqual([r['id'] for r in results], ids)
+        self.assertLessEqual(self.client.max_running, 4)
+        self.assertGreater(self.client.max_running, 1)
+
+    def test_map_arguments(self):
+        results = self.client.map(self.client.get_server, [
+            ('dc', 'a'),
+            {'datacenter_id': 'dc', 'server_id': 'b', 'depth': 3},
+        ])
+        self.assertEqual(results, [{'id': 'a', 'depth': 1}, {'id': 'b', 'depth': 3}])
+        self.assertEqual(self.client.map(len, ['abc', [1]]), [3, 1])
+
+    def test_map_errors(self):
+        results = self.client.map('get_server', [('dc', 'a'), ('dc', 'missing'), ('dc', 'c')])
+        self.assertEqual(results[0]['id'], 'a')
+        self.assertIsInstance(results[1], ICNotFoundError)
+        self.assertEqual(results[2]['id'], 'c')
+
+    def test_batch(self):
+        with self.client.batch(max_workers=2) as batch:
+            future = batch.submit('get_server', 'dc', 'a', depth=2)
+            batch.map('get_server', [('dc', 'b')])
+            results = batch.results()
+        self.assertEqual(future.result(), {'id': 'a', 'depth': 2})
+        self.assertEqual([r['id'] for r in results], ['a', 'b'])
+
+
+if __name__ == '__main__':
+    unittest.main()
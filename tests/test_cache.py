@@ -0,0 +1,263 @@
+# Copyright 2015-2019 IONOS
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+import unittest
+from urllib.parse import parse_qsl
+
+from helpers.stub import StubHandler, StubTestCase
+from ionosenterprise import cache
+from ionosenterprise.cache import ResponseCache
+
+REQUEST_ID = '2c4f2c4e-8b8f-4c7a-9bbc-2f0c3a4b5d6e'
+
+
+class ApiHandler(StubHandler):
+    """Returns a resource for every path and accepts every change."""
+
+    def _answer(self, status, document=None, location=None):
+        self.server.requests.append((self.command, self.path))
+        self.respond(status, document, {'Location': location} if location else None)
+
+    def do_GET(self):
+        path, _, query = self.path.partition('?')
+        if path in self.server.documents:
+            document = self.server.documents[path]
+            etag = '"{}"'.format((document.get('metadata') or {}).get('etag'))
+            if self.server.conditional and self.headers.get('If-None-Match') == etag:
+                self._answer(304)
+                return
+            depth = int(dict(parse_qsl(query)).get('depth', 0))
+            if 'items' in document:
+                self._answer(200, cache.view_collection(document, depth))
+            else:
+                self._answer(200, cache.view(document, depth))
+            return
+        self._answer(200, {'id': path.rsplit('/', 1)[-1], 'href': path,
+                           'metadata': {'status': 'DONE'}, 'items': []})
+
+    def do_DELETE(self):
+        self._answer(202, location='http://localhost/cloudapi/v5/requests/{}/status'.format(
+            REQUEST_ID))
+
+
+class CacheTestCase(StubTestCase):
+    handler = ApiHandler
+    depth_aware = False
+    revalidate = False
+
+    def setUp(self):
+        super(CacheTestCase, self).setUp()
+        self.server.requests = []
+        self.server.documents = {}
+        self.server.conditional = False
+        self.cache = ResponseCache(ttl=30, ttls={'servers': 0.2}, max_size=4,
+                                   depth_aware=self.depth_aware, revalidate=self.revalidate)
+        self.client = self.new_client(response_cache=self.cache)
+
+    def get_count(self):
+        return len([r for r in self.server.requests if r[0] == 'GET'])
+
+
+class TestResponseCache(CacheTestCase):
+    def test_hit(self):
+        first = self.client.get_datacenter('dc')
+        second = self.client.get_datacenter('dc', depth=1)
+        self.assertEqual(first, second)
+        self.assertIsNot(first, second)
+        self.assertEqual(self.get_count(), 1)
+        self.client.get_datacenter('dc', depth=2)
+        self.assertEqual(self.get_count(), 2)
+        stats = self.cache.stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 2))
+
+    def test_ttl_per_type(self):
+        self.client.get_server('dc', 'server')
+        self.client.get_server('dc', 'server')
+        self.assertEqual(self.get_count(), 1)
+        time.sleep(0.25)
+        self.client.get_server('dc', 'server')
+        self.assertEqual(self.get_count(), 2)
+
+    def test_requests_are_not_cached(self):
+        self.client.get_request(REQUEST_ID, status=True)
+        self.client.get_request(REQUEST_ID, status=True)
+        self.assertEqual(self.get_count(), 2)
+
+    def test_lru(self):
+        for i in range(5):
+            self.client.get_datacenter('dc{}'.format(i))
+        self.assertEqual(self.cache.stats()['size'], 4)
+        self.client.get_datacenter('dc0')
+        self.assertEqual(self.get_count(), 6)
+
+    def test_invalidation(self):
+        self.cache.max_size = 10
+        self.client.list_datacenters()
+        self.client.get_datacenter('dc')
+        self.client.get_datacenter('other')
+        self.client.list_servers('dc')
+        self.client.get_server('dc', 'server')
+        self.client.get_server('dc', 'server2')
+        self.assertEqual(self.cache.stats()['size'], 6)
+
+        response = self.client.delete_server('dc', 'server')
+        self.assertEqual(response['requestId'], REQUEST_ID)
+        # the server, its collection and its parents are gone, siblings are kept
+        self.assertEqual(self.cache.stats()['size'], 2)
+        self.client.get_datacenter('other')
+        self.client.get_server('dc', 'server2')
+        self.assertEqual(self.get_count(), 6)
+        self.client.list_servers('dc')
+        self.client.get_datacenter('dc')
+        self.assertEqual(self.get_count(), 8)
+
+
+def resource(href, kind, entities=None):
+    document = {'id': href.rsplit('/', 1)[-1], 'type': kind, 'href': href,
+                'metadata': {'etag': 'etag'}, 'properties': {'name': kind}}
+    if entities is not None:
+        document['entities'] = dict(
+            (name, {'id': href + '/' + name, 'type': 'collection',
+                    'href': href + '/' + name, 'items': items})
+            for name, items in entities.items())
+    return document
+
+
+class TestDepthAwareCache(CacheTestCase):
+    depth_aware = True
+
+    def setUp(self):
+        super(TestDepthAwareCache, self).setUp()
+        self.cache.max_size = 100
+        self.cache.ttls = {'requests': 0}
+        base = '/cloudapi/v5/datacenters/dc'
+        nic = resource(base + '/servers/s1/nics/n1', 'nic',
+                       {'firewallrules': [resource(base + '/servers/s1/nics/n1/firewallrules/f1',
+                                                   'firewall-rule')]})
+        server = resource(base + '/servers/s1', 'server',
+                          {'nics': [nic], 'volumes': []})
+        self.datacenter = resource(base, 'datacenter',
+                                   {'servers': [server], 'volumes': [], 'lans': []})
+
+    def test_view(self):
+        server = self.datacenter['entities']['servers']['items'][0]
+        self.assertEqual(cache.view(server, -1), {'id': 's1', 'type': 'server',
+                                                  'href': server['href']})
+        depth0 = cache.view(server, 0)
+        self.assertEqual(depth0['properties'], {'name': 'server'})
+        self.assertNotIn('items', depth0['entities']['nics'])
+        depth1 = cache.view(server, 1)
+        self.assertEqual(depth1['entities']['nics']['items'],
+                         [cache.view(server['entities']['nics']['items'][0], -1)])
+        self.assertEqual(cache.view(server, 4), server)
+
+    def test_shallow_reads_from_deep_response(self):
+        self.server.documents['/cloudapi/v5/datacenters/dc'] = self.datacenter
+        self.client.get_datacenter('dc', depth=5)
+        server = self.client.get_server('dc', 's1', depth=1)
+        self.assertEqual(server['id'], 's1')
+        self.assertEqual(server['entities']['nics']['items'][0],
+                         {'id': 'n1', 'type': 'nic',
+                          'href': '/cloudapi/v5/datacenters/dc/servers/s1/nics/n1'})
+        nics = self.client.list_nics('dc', 's1', depth=2)
+        self.assertEqual(nics['items'][0]['entities']['firewallrules']['items'][0]['id'], 'f1')
+        self.client.get_nic('dc', 's1', 'n1', depth=1)
+        self.client.get_datacenter('dc', depth=2)
+        self.assertEqual(self.get_count(), 1)
+        self.assertEqual(self.cache.stats()['entity_hits'], 4)
+
+        # deeper than the stored data
+        self.client.get_nic('dc', 's1', 'n1', depth=3)
+        # only referenced by the stored data
+        self.client.get_firewall_rule('dc', 's1', 'n1', 'f1')
+        self.assertEqual(self.get_count(), 3)
+
+    def test_invalidation_of_entities(self):
+        self.server.documents['/cloudapi/v5/datacenters/dc'] = self.datacenter
+        self.client.get_datacenter('dc', depth=5)
+        self.client.delete_nic('dc', 's1', 'n1')
+        self.client.get_firewall_rule('dc', 's1', 'n1', 'f1')
+        self.client.get_server('dc', 's1')
+        self.assertEqual(self.get_count(), 3)
+        # unrelated collections of the data center are kept
+        self.client.list_lans('dc', depth=1)
+        self.assertEqual(self.get_count(), 3)
+
+
+class TestRevalidation(CacheTestCase):
+    revalidate = True
+
+    def setUp(self):
+        super(TestRevalidation, self).setUp()
+        self.cache.max_size = 100
+        self.cache.ttl = 0.1
+        self.base = '/cloudapi/v5/datacenters/dc'
+
+    def volume(self, name, etag):
+        volume = resource(self.base + '/volumes/' + name, 'volume')
+        volume['metadata']['etag'] = etag
+        return volume
+
+    def expire(self):
+        time.sleep(0.15)
+
+    def test_not_modified(self):
+        self.server.conditional = True
+        self.server.documents[self.base + '/volumes/v1'] = self.volume('v1', 'e1')
+        self.client.get_volume('dc', 'v1')
+        self.expire()
+        self.assertEqual(self.client.get_volume('dc', 'v1')['metadata']['etag'], 'e1')
+        self.assertEqual(self.cache.stats()['revalidated'], 1)
+        # the revalidated response is fresh again
+        self.client.get_volume('dc', 'v1')
+        self.assertEqual(self.get_count(), 2)
+
+        self.server.documents[self.base + '/volumes/v1'] = self.volume('v1', 'e2')
+        self.expire()
+        self.assertEqual(self.client.get_volume('dc', 'v1')['metadata']['etag'], 'e2')
+        self.assertEqual(self.cache.stats()['revalidated'], 1)
+
+    def test_collection(self):
+        volumes = {'id': 'dc/volumes', 'type': 'collection', 'href': self.base + '/volumes',
+                   'items': [self.volume('v{}'.format(i), 'e') for i in range(5)]}
+        self.server.documents[self.base + '/volumes'] = volumes
+        for volume in volumes['items']:
+            self.server.documents[volume['href']] = volume
+        self.client.list_volumes('dc', depth=2)
+        self.expire()
+
+        volumes['items'][2] = self.volume('v2', 'changed')
+        self.server.documents[self.base + '/volumes/v2'] = volumes['items'][2]
+        volumes['items'].append(self.volume('v5', 'e'))
+        self.server.documents[self.base + '/volumes/v5'] = volumes['items'][5]
+        del volumes['items'][0]
+        del self.server.requests[:]
+
+        result = self.client.list_volumes('dc', depth=2)
+        self.assertEqual([item['id'] for item in result['items']],
+                         ['v1', 'v2', 'v3', 'v4', 'v5'])
+        self.assertEqual(result['items'][1]['metadata']['etag'], 'changed')
+        self.assertEqual(self.server.requests, [
+            ('GET', self.base + '/volumes?depth=1'),
+            ('GET', self.base + '/volumes/v2?depth=1'),
+            ('GET', self.base + '/volumes/v5?depth=1'),
+        ])
+        self.assertEqual(self.cache.stats()['refetched_items'], 2)
+        self.client.list_volumes('dc', depth=2)
+        self.assertEqual(self.get_count(), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
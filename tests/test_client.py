@@ -0,0 +1,86 @@
+# Copyright 2015-2019 IONOS
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import unittest
+
+import ionoscloud
+import responses
+
+from ionosenterprise.client import IonosEnterpriseService
+
+
+class TestClient(unittest.TestCase):
+    def setUp(self):
+        self.client = IonosEnterpriseService(
+            username='username', password='password', host_base='https://localhost/cloudapi/v5',
+            use_config=False, use_keyring=False, pool_size=8)
+
+    def tearDown(self):
+        self.client.close()
+
+    def test_api_client_is_reused(self):
+        api_client = self.client.get_api_client()
+        self.assertIs(self.client.get_api_client(), api_client)
+        self.assertEqual(api_client.configuration.host, 'https://localhost/cloudapi/v5')
+        self.assertEqual(api_client.configuration.connection_pool_maxsize, 8)
+
+    def test_api_instance_is_reused(self):
+        api_instance = self.client.get_api_instance(ionoscloud.ServerApi)
+        self.assertIs(self.client.get_api_instance(ionoscloud.ServerApi), api_instance)
+        self.assertIs(api_instance.api_client, self.client.get_api_client())
+
+    def test_api_client_threads(self):
+        clients = []
+
+        def target():
+            clients.append(self.client.get_api_client())
+
+        threads = [threading.Thread(target=target) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(set(id(c) for c in clients)), 1)
+
+    def test_close(self):
+        api_client = self.client.get_api_client()
+        self.client.close()
+        self.assertIsNot(self.client.get_api_client(), api_client)
+
+    def test_context_manager(self):
+        with self.client as client:
+            api_client = client.get_api_client()
+        self.assertIsNot(self.client.get_api_client(), api_client)
+
+    def test_session_is_reused(self):
+        session = self.client.get_session()
+        self.assertIs(self.client.get_session(), session)
+        self.assertEqual(session.get_adapter('https://localhost')._pool_maxsize, 8)
+        self.client.close()
+        self.assertIsNot(self.client.get_session(), session)
+
+    @responses.activate
+    def test_perform_request_keeps_headers(self):
+        responses.add(responses.GET, 'https://localhost/cloudapi/v5/datacenters',
+                      json={'items': []}, status=200)
+        headers = {'X-Custom': 'value'}
+        self.assertEqual(self.client._perform_request('/datacenters', headers=headers),
+                         {'items': []})
+        self.assertEqual(headers, {'X-Custom': 'value'})
+        self.assertEqual(responses.calls[0].request.headers['X-Custom'], 'value')
+
+
+if __name__ == '__main__':
+    unittest.main()
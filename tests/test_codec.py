@@ -0,0 +1,105 @@
+# Copyright 2015-2019 IONOS
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import unittest
+
+from helpers.stub import StubHandler, StubTestCase
+from ionosenterprise import codec
+from ionosenterprise.client import Datacenter
+from ionosenterprise.codec import JsonBackend, RawBytes, get_json_backend
+from ionosenterprise.errors import ICNotFoundError
+
+DOCUMENT = {'id': 'dc', 'type': 'datacenter',
+            'properties': {'name': 'sérvér ☃', 'version': 3, 'secAuthProtection': False}}
+
+
+class ApiHandler(StubHandler):
+    def do_GET(self):
+        if 'missing' in self.path:
+            self.respond(404, {'httpStatus': 404, 'messages': [
+                {'errorCode': '309', 'message': 'Resource does not exist'}]})
+        else:
+            self.respond(200, DOCUMENT)
+
+    def do_POST(self):
+        length = int(self.headers['Content-Length'])
+        self.server.bodies.append((self.headers['Content-Type'], self.rfile.read(length)))
+        self.respond(202, DOCUMENT, {
+            'Location': 'https://api/cloudapi/v5/requests/123-456/status'})
+
+
+class TestJsonBackend(unittest.TestCase):
+    def test_names(self):
+        self.assertIsInstance(get_json_backend('json'), JsonBackend)
+        backend = object()
+        self.assertIs(get_json_backend(backend), backend)
+        self.assertRaises(ValueError, get_json_backend, 'simplejson')
+
+    def test_round_trip(self):
+        for name in ('json', 'orjson', 'ujson', 'auto'):
+            backend = get_json_backend(name)
+            data = backend.dumps(DOCUMENT)
+            self.assertIsInstance(data, bytes)
+            self.assertEqual(backend.loads(data), DOCUMENT)
+            self.assertEqual(backend.loads(data.decode('utf-8')), DOCUMENT)
+
+    def test_fallback(self):
+        has_orjson = codec.HAS_ORJSON
+        codec.HAS_ORJSON = False
+        try:
+            with self.assertLogs('ionosenterprise.codec', 'WARNING'):
+                self.assertEqual(get_json_backend('orjson').name, 'json')
+        finally:
+            codec.HAS_ORJSON = has_orjson
+
+    def test_raw_bytes(self):
+        data = RawBytes(b'{"a": 1}')
+        self.assertIs(data.decode('utf-8'), data)
+
+
+class TestClientBackend(StubTestCase):
+    handler = ApiHandler
+
+    def setUp(self):
+        super(TestClientBackend, self).setUp()
+        self.server.bodies = []
+
+    def test_backends(self):
+        for name in (None, 'json', 'orjson', 'ujson'):
+            client = self.new_client(json_backend=name)
+            self.assertEqual(client.get_datacenter('dc'), DOCUMENT)
+
+            with self.assertRaises(ICNotFoundError) as context:
+                client.get_datacenter('missing')
+            self.assertEqual(context.exception.content, [
+                {'errorCode': '309', 'message': 'Resource does not exist'}])
+
+            response = client.create_datacenter(Datacenter(name='sérvér ☃', location='de/fra'))
+            self.assertEqual(response['requestId'], '123-456')
+            content_type, body = self.server.bodies.pop()
+            self.assertEqual(content_type, 'application/json')
+            self.assertEqual(json.loads(body.decode('utf-8')), {
+                'properties': {'name': 'sérvér ☃', 'location': 'de/fra'}})
+
+    def test_cached(self):
+        from ionosenterprise.cache import ResponseCache
+        client = self.new_client(json_backend='orjson', response_cache=ResponseCache())
+        self.assertEqual(client.get_datacenter('dc'), DOCUMENT)
+        self.assertEqual(client.get_datacenter('dc'), DOCUMENT)
+        self.assertEqual(client.response_cache.stats()['hits'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+# Copyright 2015-2019 IONOS
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+from six.moves.urllib.parse import parse_qs, urlparse
+
+from helpers.stub import PREFIX, StubHandler, StubTestCase
+from ionosenterprise.cache import ResponseCache
+from ionosenterprise.errors import ICFailedRequest, ICTimeoutError
+from ionosenterprise.polling import AdaptivePolling
+
+DC = '9f4e4b4c-0c5d-4f6c-8c3e-2d1b0a9e8f7a'
+
+
+class ApiHandler(StubHandler):
+    # states of the data center returned by the successive reads, the
+    # last one is repeated
+    states = []
+    # request ID -> statuses returned by the successive polls
+    statuses = {}
+    log = []
+
+    @staticmethod
+    def _next(sequence, count):
+        return sequence[min(count, len(sequence) - 1)]
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        path = url.path[len(PREFIX):]
+        query = dict((key, value[0]) for key, value in parse_qs(url.query).items())
+        reads = sum(1 for logged, _ in self.log if logged == path)
+        self.log.append((path, query))
+        if path.startswith('datacenters/'):
+            document = {'id': DC, 'type': 'datacenter',
+                        'metadata': {'state': self._next(self.states, reads)}}
+        else:
+            request_id = path.split('/')[1]
+            status = self._next(self.statuses[request_id], reads)
+            document = {'id': request_id + '/status', 'type': 'request-status',
+                        'metadata': {'status': status, 'message': 'Request has ' + status,
+                                     'targets': []}}
+        self.respond(200, document)
+
+
+class TestWaitForDatacenterIdle(StubTestCase):
+    handler = ApiHandler
+
+    def setUp(self):
+        super(TestWaitForDatacenterIdle, self).setUp()
+        ApiHandler.states = []
+        ApiHandler.statuses = {}
+        ApiHandler.log = []
+        self.client_options = {
+            'polling': AdaptivePolling(min_wait=0.01, max_wait=0.05, jitter=0)}
+        self.client = self.new_client()
+
+    def test_idle(self):
+        ApiHandler.states = ['BUSY', 'BUSY', 'AVAILABLE']
+        self.assertEqual(self.client.wait_for_datacenter_idle(DC), [])
+        self.assertEqual(ApiHandler.log, [('datacenters/' + DC, {'depth': '0'})] * 3)
+
+    def test_requests(self):
+        # not BUSY yet at the first read
+        ApiHandler.states = ['AVAILABLE']
+        ApiHandler.statuses = {'r-1': ['QUEUED', 'DONE'], 'r-2': ['FAILED']}
+        results = self.client.wait_for_datacenter_idle(DC, [{'requestId': 'r-1'}, 'r-2', {}])
+        self.assertEqual(results[0]['status'], 'DONE')
+        self.assertIsInstance(results[1], ICFailedRequest)
+        self.assertEqual(results[1].request_id, 'r-2')
+        self.assertIsNone(results[2])
+        self.assertEqual([path for path, _ in ApiHandler.log], [
+            'datacenters/' + DC, 'requests/r-1/status', 'requests/r-2/status',
+            'datacenters/' + DC, 'requests/r-1/status'])
+
+    def test_timeout(self):
+        ApiHandler.states = ['BUSY']
+        with self.assertRaises(ICTimeoutError):
+            self.client.wait_for_datacenter_idle(DC, timeout=0.1)
+
+    def test_cache(self):
+        client = self.new_client(response_cache=ResponseCache(ttl=60))
+        ApiHandler.states = ['BUSY', 'AVAILABLE']
+        client.get_datacenter(DC, depth=0)
+        client.wait_for_datacenter_idle(DC)
+        self.assertEqual(len(ApiHandler.log), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
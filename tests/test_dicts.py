@@ -0,0 +1,142 @@
+# Copyright 2015-2019 IONOS
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import importlib
+import json
+import random
+import types
+import unittest
+
+from ionosenterprise.client import (
+    FirewallRule, Group, LAN, LoadBalancer, NIC, Server, User, Volume)
+
+dicts_module = importlib.import_module('ionosenterprise.requests.dicts')
+
+
+class TestDicts(unittest.TestCase):
+    def setUp(self):
+        self.dicts = dicts_module.dicts()
+
+    def assertBody(self, body, expected):
+        # the order of the keys is part of the body
+        self.assertEqual(json.dumps(body), json.dumps(expected))
+
+    def test_server(self):
+        server = Server(name='s', cores=2, ram=0, boot_volume_id='boot', cpu_family='AMD_OPTERON',
+                        create_volumes=[Volume(name='v', size='20', image='image-id')],
+                        attach_volumes=['attached'],
+                        nics=[NIC(name='n', lan=1, dhcp=False, firewall_active=False,
+                                  firewall_rules=[FirewallRule(protocol='ICMP', icmp_type=0)])])
+        self.assertBody(self.dicts._create_server_dict(server), {
+            'properties': {'name': 's', 'cores': 2, 'bootVolume': {'id': 'boot'},
+                           'cpuFamily': 'AMD_OPTERON'},
+            'entities': {
+                'volumes': {'items': [
+                    {'properties': {'name': 'v', 'size': 20, 'availabilityZone': 'AUTO',
+                                    'image': 'image-id', 'bus': 'VIRTIO', 'type': 'HDD'}},
+                    {'id': 'attached'}]},
+                'nics': {'items': [{
+                    'properties': {'name': 'n', 'lan': 1, 'dhcp': False,
+                                   'firewallActive': False},
+                    'entities': {'firewallrules': {'items': [
+                        {'properties': {'protocol': 'ICMP', 'icmpType': '0'}}]}}}]}}})
+
+    def test_server_attach_only(self):
+        # attached volumes are added after the NICs
+        server = Server(name=None, attach_volumes=['a'], nics=[NIC(name='n')])
+        self.assertBody(self.dicts._create_server_dict(server), {
+            'properties': {'name': None},
+            'entities': {'nics': {'items': [{'properties': {'name': 'n'}}]},
+                         'volumes': {'items': [{'id': 'a'}]}}})
+        self.assertBody(self.dicts._create_server_dict(Server(name='s', create_volumes=[])),
+                        {'properties': {'name': 's'}})
+
+    def test_volume_licence_type(self):
+        self.assertBody(self.dicts._create_volume_dict(Volume(name='v', size=0, bus=None)), {
+            'properties': {'name': 'v', 'availabilityZone': 'AUTO', 'type': 'HDD',
+                           'licenceType': 'UNKNOWN'}})
+        self.assertBody(self.dicts._create_volume_dict(
+            Volume(name='v', size=10, image_alias='ubuntu:latest', licence_type='LINUX',
+                   image_password='secret', ssh_keys=['key'])), {
+            'properties': {'name': 'v', 'size': 10, 'availabilityZone': 'AUTO',
+                           'imageAlias': 'ubuntu:latest', 'bus': 'VIRTIO', 'type': 'HDD',
+                           'imagePassword': 'secret', 'sshKeys': ['key']}})
+
+    def test_lan_and_loadbalancer(self):
+        self.assertBody(self.dicts._create_lan_dict(LAN(name='l', public=False, nics=['n'])), {
+            'properties': {'name': 'l', 'public': 'false'},
+            'entities': {'nics': {'items': [{'id': 'n'}]}}})
+        self.assertBody(self.dicts._create_lan_dict(LAN(name='l', pcc_id='')),
+                        {'properties': {'name': 'l', 'pcc': ''}})
+        self.assertBody(self.dicts._create_loadbalancer_dict(
+            LoadBalancer(name='', ip='1.2.3.4', dhcp=True, balancednics=['n'])), {
+            'properties': {'ip': '1.2.3.4', 'dhcp': 'true'},
+            'entities': {'balancednics': {'items': [{'id': 'n'}]}}})
+
+    def test_properties_only(self):
+        self.assertBody(self.dicts._create_group_dict(
+            Group(name='g', create_datacenter=True, reserve_ip=False)),
+            {'properties': {'name': 'g', 'createDataCenter': True}})
+        self.assertBody(self.dicts._create_user_dict(
+            user=User(firstname='a', email='a@b.c', force_sec_auth=True)),
+            {'properties': {'firstname': 'a', 'email': 'a@b.c', 'forceSecAuth': True}})
+        self.assertBody(self.dicts._create_k8s_dict('cluster'),
+                        {'properties': {'name': 'cluster'}})
+
+    def test_builders_keep_to_tables(self):
+        def properties(build):
+            return lambda item: build(item)['properties']
+
+        builders = [
+            (dicts_module.LAN_FIELDS, dicts_module._lan_properties),
+            (dicts_module.LOADBALANCER_FIELDS, dicts_module._loadbalancer_properties),
+            (dicts_module.NIC_FIELDS, properties(dicts_module._nic)),
+            (dicts_module.FIREWALL_RULE_FIELDS, properties(dicts_module._firewall_rule)),
+            (dicts_module.SERVER_FIELDS, properties(dicts_module._server)),
+            (dicts_module.VOLUME_FIELDS, properties(dicts_module._volume)),
+            (dicts_module.GROUP_FIELDS, dicts_module._group_properties),
+            (dicts_module.USER_FIELDS, dicts_module._user_properties),
+            (dicts_module.PRIVATECROSSCONNECT_FIELDS,
+             dicts_module._privatecrossconnect_properties),
+            (dicts_module.BACKUPUNIT_FIELDS, dicts_module._backupunit_properties)]
+        # items without entities
+        entities = dict.fromkeys(('firewall_rules', 'create_volumes', 'nics', 'attach_volumes'))
+        values = (None, '', 0, False, True, '7', 7)
+        rand = random.Random(0)
+        for fields, build in builders:
+            for _ in range(200):
+                item = types.SimpleNamespace(**entities)
+                for field in fields:
+                    setattr(item, field[0], rand.choice(values))
+                self.assertBody(build(item), table_properties(fields, item))
+
+
+def table_properties(fields, item):
+    """Builds the properties by reading the field table."""
+    properties = {}
+    for attr, key, condition, coerce in fields:
+        value = getattr(item, attr)
+        if condition == dicts_module.IF_SET and not value:
+            continue
+        if condition == dicts_module.IF_NOT_NONE and value is None:
+            continue
+        if condition == dicts_module.IF_NO_IMAGE and (
+                item.image is not None or item.image_alias is not None):
+            continue
+        properties[key] = value if coerce is None else coerce(value)
+    return properties
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+# Copyright 2015-2019 IONOS
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+from six.moves.urllib.parse import parse_qs, urlparse
+
+from helpers.stub import PREFIX, StubHandler, StubTestCase
+from ionosenterprise.errors import ICError
+from ionosenterprise.inventory import crawl
+
+
+def resource(resource_id, name, **properties):
+    properties['name'] = name
+    return {'id': resource_id, 'properties': properties, 'metadata': {'state': 'AVAILABLE'}}
+
+
+def collection(*items):
+    return {'type': 'collection', 'items': list(items)}
+
+
+SERVER = resource('s-1', 'web', cores=2)
+SERVER['entities'] = {
+    'volumes': collection(resource('v-1', 'system', size=20)),
+    'nics': collection(resource('n-1', 'public', lan=1), resource('n-2', 'private', lan=2)),
+}
+
+DOCUMENTS = {
+    'datacenters': collection(resource('dc-1', 'production'), resource('dc-2', 'staging')),
+    'datacenters/dc-2': resource('dc-2', 'staging'),
+    'datacenters/dc-1/servers': collection(SERVER),
+    'datacenters/dc-1/volumes': collection(resource('v-1', 'system', size=20),
+                                           resource('v-2', 'spare', size=10)),
+    'datacenters/dc-1/lans': collection(resource('1', 'internet', public=True),
+                                        resource('2', 'backend', public=False)),
+    'datacenters/dc-1/loadbalancers': collection(),
+    'datacenters/dc-2/servers': collection(),
+    'datacenters/dc-2/volumes': collection(),
+    'datacenters/dc-2/lans': collection(resource('1', 'internet', public=True)),
+    'images': collection(resource('i-1', 'ubuntu', location='de/fra')),
+    'snapshots': collection(),
+    'ipblocks': collection(resource('b-1', 'block', size=1)),
+}
+
+
+class ApiHandler(StubHandler):
+    log = []
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        path = url.path[len(PREFIX):]
+        self.log.append((path, int(parse_qs(url.query)['depth'][0])))
+        document = DOCUMENTS.get(path)
+        if document is not None:
+            self.respond(200, document)
+        else:
+            self.respond(500, {'httpStatus': 500, 'messages': [{'message': 'failed'}]})
+
+
+class TestInventory(StubTestCase):
+    handler = ApiHandler
+
+    def setUp(self):
+        super(TestInventory, self).setUp()
+        ApiHandler.log = []
+        self.client = self.new_client(pool_size=4)
+
+    def test_crawl(self):
+        inventory = crawl(self.client, max_workers=4)
+        self.assertEqual(inventory.counts(), {
+            'datacenter': 2, 'server': 1, 'nic': 2, 'volume': 2, 'lan': 3, 'image': 1,
+            'ipblock': 1})
+        self.assertEqual(inventory.errors[0][:2], ('dc-2', 'loadbalancers'))
+        self.assertIsInstance(inventory.errors[0][2], ICError)
+
+        # one request per collection, whatever the number of resources
+        self.assertEqual(sorted(ApiHandler.log), sorted(
+            [('datacenters', 1), ('images', 1), ('snapshots', 1), ('ipblocks', 1)] +
+            [('datacenters/{}/{}'.format(dc, name), depth) for dc in ('dc-1', 'dc-2')
+             for name, depth in [('servers', 3), ('volumes', 1), ('lans', 1),
+                                 ('loadbalancers', 2)]]))
+
+        self.assertEqual([nic.name for nic in inventory.children('s-1', 'nic')],
+                         ['public', 'private'])
+        self.assertEqual(inventory.get('v-1').parent_id, 's-1')
+        self.assertIsNone(inventory.get('v-2').parent_id)
+        self.assertEqual(inventory.get('1', 'dc-2').datacenter_id, 'dc-2')
+        self.assertEqual([lan.name for lan in inventory.of_type('lan', 'dc-1')],
+                         ['internet', 'backend'])
+        self.assertEqual([dc.id for dc in inventory.find('datacenter', 'PROD')], ['dc-1'])
+
+    def test_datacenter_ids(self):
+        inventory = crawl(self.client, datacenter_ids=['dc-2'], account=False,
+                          depths={'lans': 1})
+        self.assertEqual(inventory.counts(), {'datacenter': 1, 'lan': 1})
+        self.assertEqual(sorted(ApiHandler.log),
+                         [('datacenters/dc-2', 0), ('datacenters/dc-2/lans', 1)])
+
+
+if __name__ == '__main__':
+    unittest.main()
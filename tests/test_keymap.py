@@ -0,0 +1,99 @@
+# Copyright 2015-2019 IONOS
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import unittest
+
+import ionoscloud
+
+from helpers.stub import StubHandler, StubTestCase
+from ionosenterprise.errors import ICValidationError
+from ionosenterprise.keymap import camel_case, keymap
+
+
+class ApiHandler(StubHandler):
+    bodies = []
+
+    def _receive(self):
+        length = int(self.headers['Content-Length'])
+        self.bodies.append(json.loads(self.rfile.read(length).decode('utf-8')))
+        self.respond(202, {'id': 'id', 'type': 'resource', 'properties': {}}, {
+            'Location': 'https://api/cloudapi/v5/requests/123-456/status'})
+
+    do_PATCH = do_PUT = do_POST = _receive
+
+
+class TestKeyMap(unittest.TestCase):
+    def test_camel_case(self):
+        for name, expected in [('name', 'name'), ('sec_auth_protection', 'secAuthProtection'),
+                               ('_private', '_private'), ('a__b_', 'a_B_'),
+                               ('createK8s_cluster', 'createk8sCluster')]:
+            self.assertEqual(camel_case(name), expected)
+
+    def test_keys(self):
+        volume = keymap(ionoscloud.models.VolumeProperties)
+        self.assertIs(volume, keymap(ionoscloud.models.VolumeProperties))
+        self.assertEqual(volume.to_keys({'licence_type': 'LINUX', 'imageAlias': 'a'}),
+                         {'licenceType': 'LINUX', 'imageAlias': 'a'})
+        self.assertEqual(volume.to_attributes({'licenceType': 'LINUX', 'size': 10}),
+                         {'licence_type': 'LINUX', 'size': 10})
+        self.assertEqual(keymap(ionoscloud.models.GroupProperties).to_keys(
+            {'create_datacenter': True}), {'createDataCenter': True})
+
+    def test_nested(self):
+        cluster = keymap(ionoscloud.models.KubernetesClusterProperties)
+        self.assertEqual(cluster.to_keys(
+            {'maintenance_window': {'day_of_the_week': 'Monday', 'time': '10:00:00'}}),
+            {'maintenanceWindow': {'dayOfTheWeek': 'Monday', 'time': '10:00:00'}})
+        lan = keymap(ionoscloud.models.LanProperties)
+        self.assertEqual(lan.to_keys(
+            {'ip_failover': [{'ip': '1.2.3.4', 'nic_uuid': 'nic'}], 'name': 'lan'}),
+            {'ipFailover': [{'ip': '1.2.3.4', 'nicUuid': 'nic'}], 'name': 'lan'})
+
+    def test_unknown(self):
+        with self.assertRaises(ICValidationError) as context:
+            keymap(ionoscloud.models.ServerProperties).to_keys({'name': 's', 'coers': 2})
+        self.assertEqual(context.exception.content,
+                         [{'message': "Unknown field 'coers' for ServerProperties"}])
+
+
+class TestUpdates(StubTestCase):
+    handler = ApiHandler
+
+    def setUp(self):
+        super(TestUpdates, self).setUp()
+        ApiHandler.bodies = []
+        self.client = self.new_client()
+
+    def test_bodies(self):
+        self.client.update_server('dc', 'server', name='s', cpu_family='INTEL_XEON',
+                                  boot_volume='volume')
+        self.client.update_volume('dc', 'volume', licence_type='LINUX', imageAlias='ubuntu')
+        self.client.update_group('group', name='g', create_datacenter=False)
+        self.client.update_firewall_rule('dc', 'server', 'nic', 'rule', source_ip='1.2.3.4',
+                                         icmp_type=8)
+        self.assertEqual(ApiHandler.bodies, [
+            {'name': 's', 'cpuFamily': 'INTEL_XEON', 'bootVolume': {'id': 'volume'}},
+            {'licenceType': 'LINUX', 'imageAlias': 'ubuntu'},
+            {'properties': {'name': 'g', 'createDataCenter': False}},
+            {'sourceIp': '1.2.3.4', 'icmpType': 8}])
+
+    def test_unknown_field(self):
+        with self.assertRaises(ICValidationError):
+            self.client.update_nic('dc', 'server', 'nic', nmae='n')
+        self.assertEqual(ApiHandler.bodies, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
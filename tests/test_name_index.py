@@ -0,0 +1,91 @@
+# Copyright 2015-2019 IONOS
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+from six.moves.urllib.parse import parse_qs, urlparse
+
+from helpers.stub import StubHandler, StubTestCase
+from ionosenterprise.utils import NameIndex, find_item_by_name
+
+NAMES = ['web', 'Web', 'webserver', 'Webserver 2', 'my web', 'MY WEB 2', 'db']
+
+
+def datacenter(name):
+    return {'id': 'id-' + name, 'type': 'datacenter', 'properties': {'name': name}}
+
+
+class ApiHandler(StubHandler):
+    paths = []
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        self.paths.append((url.path.rsplit('/', 1)[-1], parse_qs(url.query)['depth'][0]))
+        if url.path.endswith('/datacenters'):
+            document = {'id': 'datacenters', 'type': 'collection',
+                        'items': [datacenter(name) for name in NAMES]}
+        else:
+            document = datacenter(url.path.rsplit('-', 1)[-1])
+        self.respond(200, document)
+
+
+class TestNameIndex(unittest.TestCase):
+    def test_precedence(self):
+        index = NameIndex(NAMES, lambda name: name)
+        self.assertEqual(index.find('web'), ['web'])
+        self.assertEqual(index.find('WEB'), ['web', 'Web'])
+        self.assertEqual(index.find('webs'), ['webserver'])
+        self.assertEqual(index.find('WEBS'), ['webserver', 'Webserver 2'])
+        self.assertEqual(index.find('y web'), ['my web'])
+        self.assertEqual(index.find('y WEB'), ['my web', 'MY WEB 2'])
+        self.assertEqual(index.find('2'), ['Webserver 2', 'MY WEB 2'])
+        self.assertEqual(index.find('mail'), [])
+        self.assertEqual(find_item_by_name(NAMES, lambda name: name, 'D'), ['db'])
+
+    def test_casefold(self):
+        names = ['Straße', 'strasse 2']
+        index = NameIndex(names, lambda name: name)
+        for name, expected in (('STRASSE', ['Straße']), ('strasse', ['Straße']),
+                               ('STRASSE 2', ['strasse 2']), ('ße', ['Straße'])):
+            self.assertEqual(index.find(name), expected)
+            self.assertEqual(find_item_by_name(names, lambda name: name, name), expected)
+
+
+class TestGetDatacenterByName(StubTestCase):
+    handler = ApiHandler
+
+    def setUp(self):
+        super(TestGetDatacenterByName, self).setUp()
+        ApiHandler.paths = []
+        self.client = self.new_client()
+
+    def test_fetches_match(self):
+        response = self.client.get_datacenter_by_name('DB', depth=3)
+        self.assertEqual(response['id'], 'id-db')
+        self.assertEqual(ApiHandler.paths, [('datacenters', '1'), ('id-db', '3')])
+
+    def test_listed_match(self):
+        response = self.client.get_datacenter_by_name('DB')
+        self.assertEqual(response['id'], 'id-db')
+        # one round trip, the listing has the default depth already
+        self.assertEqual(ApiHandler.paths, [('datacenters', '1')])
+
+    def test_ambiguous(self):
+        with self.assertRaises(NameError):
+            self.client.get_datacenter_by_name('server')
+        self.assertEqual(ApiHandler.paths, [('datacenters', '1')])
+
+
+if __name__ == '__main__':
+    unittest.main()
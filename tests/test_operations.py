@@ -0,0 +1,153 @@
+# Copyright 2015-2019 IONOS
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import threading
+import time
+import unittest
+import uuid
+from concurrent.futures import FIRST_EXCEPTION, wait
+
+from helpers.stub import PREFIX, StubHandler, StubTestCase
+from ionosenterprise.errors import ICFailedRequest
+from ionosenterprise.items import Volume
+from ionosenterprise.operations import Operation
+from ionosenterprise.polling import AdaptivePolling
+
+DC = '9f4e4b4c-0c5d-4f6c-8c3e-2d1b0a9e8f7a'
+SERVER = 'a1b2c3d4-0000-4000-8000-000000000001'
+NIC = 'a1b2c3d4-0000-4000-8000-000000000002'
+
+
+class ApiHandler(StubHandler):
+    latency = 0.2
+    # request ID -> (time the request is finished, final status)
+    requests = {}
+    log = []
+
+    def _status(self, request_id):
+        finished, final = self.requests[request_id]
+        status = final if finished <= time.time() else 'RUNNING'
+        return {'id': request_id + '/status', 'type': 'request-status',
+                'metadata': {'status': status, 'message': 'Request has ' + status,
+                             'targets': []}}
+
+    def _start(self, document=None, status='DONE'):
+        request_id = str(uuid.uuid4())
+        self.requests[request_id] = (time.time() + self.latency, status)
+        self.respond(202, document, {
+            'Location': 'https://api/cloudapi/v5/requests/{}/status'.format(request_id)})
+
+    def do_GET(self):
+        path = self.path.split('?')[0][len(PREFIX):]
+        self.log.append(path)
+        if path == 'requests':
+            self.respond(200, {'id': 'requests', 'type': 'collection', 'items': [
+                {'id': request_id, 'type': 'request',
+                 'metadata': {'requestStatus': self._status(request_id)}}
+                for request_id in list(self.requests)]})
+        else:
+            self.respond(200, self._status(path.split('/')[1]))
+
+    def do_PATCH(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])).decode('utf-8'))
+        name = body.get('name')
+        self._start({'id': NIC, 'properties': {'name': name}},
+                    'FAILED' if name == 'fail' else 'DONE')
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        self._start()
+
+    def do_DELETE(self):
+        self._start()
+
+
+class TestOperations(StubTestCase):
+    handler = ApiHandler
+
+    def setUp(self):
+        super(TestOperations, self).setUp()
+        ApiHandler.requests = {}
+        ApiHandler.log = []
+        self.client = self.new_client(
+            polling=AdaptivePolling(min_wait=0.02, max_wait=0.1, jitter=0), operations=True)
+
+    def test_operation(self):
+        operation = self.client.update_nic(DC, SERVER, NIC, name='a')
+        self.assertIsInstance(operation, Operation)
+        # the response is there before the request is finished
+        self.assertEqual(operation['id'], NIC)
+        self.assertEqual(operation.get('properties'), {'name': 'a'})
+        self.assertIn('requestId', operation)
+        self.assertFalse(operation.done())
+
+        called = []
+        operation.add_done_callback(called.append)
+        self.assertIs(operation.result(timeout=5), operation.response)
+        self.assertEqual(operation.status['status'], 'DONE')
+        self.assertEqual(called, [operation])
+        # reads are not wrapped
+        self.assertIsInstance(self.client.get_request(operation.request_id, status=True), dict)
+
+    def test_opt_in(self):
+        client = self.new_client()
+        self.assertIsNone(client.request_waiter)
+        response = client.update_nic(DC, SERVER, NIC, name='a')
+        self.assertNotIsInstance(response, Operation)
+        self.assertEqual(response['id'], NIC)
+
+    def test_action(self):
+        operation = self.client.start_server(DC, SERVER)
+        self.assertIsInstance(operation, Operation)
+        self.assertIsNotNone(operation.request_id)
+        self.assertEqual(operation.response, {'requestId': operation.request_id})
+        self.client.wait_for_completion(operation)
+        self.assertTrue(operation.done())
+
+    def test_failed(self):
+        operations = [self.client.delete_volume(DC, str(uuid.uuid4())) for _ in range(2)]
+        ApiHandler.latency = 10
+        self.addCleanup(setattr, ApiHandler, 'latency', 0.2)
+        operations.append(self.client.update_nic(DC, SERVER, NIC, name='slow'))
+        ApiHandler.latency = 0
+        operations.append(self.client.update_nic(DC, SERVER, NIC, name='fail'))
+
+        done, not_done = wait(operations, timeout=5, return_when=FIRST_EXCEPTION)
+        self.assertIn(operations[3], done)
+        self.assertIn(operations[2], not_done)
+        self.assertIsInstance(operations[3].exception(), ICFailedRequest)
+        self.assertEqual(operations[3].exception().request_id, operations[3].request_id)
+
+    def test_shared_poller(self):
+        operations = [self.client.create_volume(DC, Volume(size=10))
+                      for _ in range(10)]
+        other = self.new_client(
+            polling=AdaptivePolling(min_wait=0.02, max_wait=0.1, jitter=0), operations=True)
+        operations.append(other.delete_volume(DC, str(uuid.uuid4())))
+
+        pollers = [thread for thread in threading.enumerate()
+                   if thread.name == 'ionosenterprise-request-poller']
+        self.assertEqual(len(pollers), 1)
+        done, not_done = wait(operations, timeout=5)
+        self.assertEqual(len(done), 11)
+        self.assertEqual([operation.result()['requestId'] for operation in operations],
+                         [operation.request_id for operation in operations])
+        # the many requests of the first client are listed, not polled one by one
+        self.assertGreater(self.client.request_waiter.listings, 0)
+        self.assertLess(self.client.request_waiter.polls, 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
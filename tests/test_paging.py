@@ -0,0 +1,102 @@
+# Copyright 2015-2019 IONOS
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+import unittest
+from urllib.parse import parse_qsl
+
+from helpers.stub import StubHandler, StubTestCase, ThreadingServer
+from ionosenterprise.paging import iter_pages
+
+
+class CollectionHandler(StubHandler):
+    """Serves collections of 250 items honouring offset and limit."""
+
+    def do_GET(self):
+        path, _, query = self.path.partition('?')
+        params = dict(parse_qsl(query))
+        self.server.requests.append((path, params))
+        items = [{'id': 'item-{}'.format(i)} for i in range(250)]
+        if 'offset' in params:
+            offset = int(params['offset'])
+            items = items[offset:offset + int(params['limit'])]
+        self.respond(200, {'id': path, 'type': 'collection', 'items': items})
+
+
+class TestIterPages(unittest.TestCase):
+    def test_pages(self):
+        calls = []
+
+        def fetch(offset, limit):
+            calls.append((offset, limit))
+            return {'items': list(range(offset, min(offset + limit, 25)))}
+
+        for prefetch in (True, False):
+            del calls[:]
+            self.assertEqual(list(iter_pages(fetch, page_size=10, prefetch=prefetch)),
+                             list(range(25)))
+            self.assertEqual(calls, [(0, 10), (10, 10), (20, 10)])
+
+    def test_exact_multiple(self):
+        def fetch(offset, limit):
+            return {'items': list(range(offset, min(offset + limit, 20)))}
+        self.assertEqual(list(iter_pages(fetch, page_size=10)), list(range(20)))
+
+    def test_prefetch(self):
+        fetched = []
+
+        def fetch(offset, limit):
+            fetched.append(offset)
+            return {'items': list(range(offset, offset + limit))}
+
+        pages = iter_pages(fetch, page_size=5)
+        next(pages)
+        time.sleep(0.05)
+        # the next page is requested while the first one is processed
+        self.assertEqual(fetched, [0, 5])
+        pages.close()
+
+    def test_invalid_page_size(self):
+        self.assertRaises(ValueError, list, iter_pages(lambda offset, limit: {}, page_size=0))
+
+
+class TestIterMethods(StubTestCase):
+    handler = CollectionHandler
+    server_class = ThreadingServer
+
+    def setUp(self):
+        super(TestIterMethods, self).setUp()
+        self.server.requests = []
+        self.client = self.new_client(single_flight=True)
+
+    def test_paged(self):
+        servers = self.client.iter_servers('dc', depth=2, page_size=100)
+        self.assertEqual(self.server.requests, [])
+        self.assertEqual([s['id'] for s in servers], ['item-{}'.format(i) for i in range(250)])
+        self.assertEqual(sorted((p['offset'], p['limit'], p['depth'])
+                                for _, p in self.server.requests),
+                         [('0', '100', '2'), ('100', '100', '2'), ('200', '100', '2')])
+
+    def test_not_paged(self):
+        images = list(self.client.iter_images())
+        self.assertEqual(len(images), 250)
+        self.assertEqual(self.server.requests, [('/cloudapi/v5/images', {'depth': '1'})])
+
+    def test_list_is_unchanged(self):
+        self.assertEqual(len(self.client.list_servers('dc')['items']), 250)
+        self.assertNotIn('offset', self.server.requests[0][1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,167 @@
+# Copyright 2015-2019 IONOS
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import contextlib
+import io
+import time
+import unittest
+import uuid
+
+from helpers.stub import PREFIX, StubHandler, StubTestCase
+from ionosenterprise.errors import ICTimeoutError
+from ionosenterprise.polling import AdaptivePolling, FixedPolling, operation_type
+
+DC = '9f4e4b4c-0c5d-4f6c-8c3e-2d1b0a9e8f7a'
+SERVER = 'a1b2c3d4-0000-4000-8000-000000000001'
+NIC = 'a1b2c3d4-0000-4000-8000-000000000002'
+
+
+class ApiHandler(StubHandler):
+    latency = 0.3
+    # request ID -> time the request is finished
+    finished = {}
+    polls = 0
+
+    def do_GET(self):
+        ApiHandler.polls += 1
+        request_id = self.path[len(PREFIX):].split('/')[1]
+        status = 'DONE' if self.finished[request_id] <= time.time() else 'RUNNING'
+        self.respond(200, {'id': request_id, 'metadata': {'status': status, 'message': ''}})
+
+    def do_PATCH(self):
+        self.rfile.read(int(self.headers['Content-Length']))
+        request_id = str(uuid.uuid4())
+        self.finished[request_id] = time.time() + self.latency
+        self.respond(202, {'id': NIC, 'properties': {'name': 'nic'}}, {
+            'Location': 'https://api/cloudapi/v5/requests/{}/status'.format(request_id)})
+
+
+class TestOperationType(unittest.TestCase):
+    def test_operation_type(self):
+        base = 'https://api.ionos.com/cloudapi/v5/'
+        self.assertEqual(operation_type('post', base + 'datacenters'), 'POST datacenters')
+        self.assertEqual(operation_type('PATCH', base + 'datacenters/' + DC), 'PATCH datacenters')
+        self.assertEqual(
+            operation_type('POST', base + 'datacenters/{}/volumes'.format(DC)),
+            'POST datacenters/volumes')
+        self.assertEqual(
+            operation_type('POST', base + 'datacenters/{}/servers/{}/volumes'.format(DC, SERVER)),
+            'POST servers/volumes')
+        self.assertEqual(
+            operation_type('DELETE', base + 'datacenters/{}/lans/3'.format(DC)),
+            'DELETE datacenters/lans')
+        self.assertEqual(
+            operation_type('POST', base + 'datacenters/{}/servers/{}/start'.format(DC, SERVER)),
+            'POST servers/start')
+
+
+class TestSchedules(unittest.TestCase):
+    def test_fixed(self):
+        schedule = FixedPolling(initial_wait=5, scaleup=10).begin()
+        self.assertEqual([schedule.next_delay() for _ in range(3)], [0, 5, 5])
+        schedule.next_increase = 0
+        self.assertEqual(schedule.next_delay(), 10)
+
+    def test_adaptive(self):
+        polling = AdaptivePolling(min_wait=1, max_wait=4, jitter=0, backoff=2)
+        schedule = polling.begin(key='POST datacenters')
+        self.assertEqual([schedule.next_delay() for _ in range(4)], [1, 2, 4, 4])
+
+        polling.observe('POST datacenters', 10)
+        polling.observe('POST datacenters', 20)
+        self.assertEqual(polling.estimate('POST datacenters'), 13)
+        self.assertEqual(polling.deviation('POST datacenters'), 4.75)
+        schedule = polling.begin(key='POST datacenters')
+        # the estimate less half the deviation
+        self.assertAlmostEqual(schedule.next_delay(), 10.625, places=1)
+        # late: poll again after half the deviation, growing
+        self.assertEqual([schedule.next_delay() for _ in range(3)], [2.375, 4, 4])
+
+    def test_first_poll(self):
+        polling = AdaptivePolling(jitter=0.1, estimates={'PATCH servers/nics': 2.0})
+        schedule = polling.begin(key='PATCH servers/nics')
+        self.assertTrue(1.55 <= schedule.next_delay() <= 1.95)
+        schedule.started -= 2.0
+        schedule.finish()
+        # found finished at the first poll, the estimate comes down
+        self.assertLess(polling.estimate('PATCH servers/nics'), 2.0)
+
+
+class TestWaitForCompletion(StubTestCase):
+    handler = ApiHandler
+
+    def setUp(self):
+        super(TestWaitForCompletion, self).setUp()
+        ApiHandler.finished = {}
+        ApiHandler.polls = 0
+        self.polling = AdaptivePolling(min_wait=0.05, max_wait=1, jitter=0)
+        self.client = self.new_client(polling=self.polling)
+
+    def test_learns(self):
+        self.client.wait_for_completion(self.client.update_nic(DC, SERVER, NIC, name='a'))
+        first = ApiHandler.polls
+        self.assertGreater(first, 3)
+        estimate = self.polling.estimate('PATCH servers/nics')
+        self.assertTrue(0.2 < estimate < 0.6, estimate)
+
+        ApiHandler.polls = 0
+        start = time.time()
+        self.client.wait_for_completion(self.client.update_nic(DC, SERVER, NIC, name='b'))
+        # first poll shortly before the request is finished
+        self.assertLessEqual(ApiHandler.polls, 3)
+        self.assertLess(ApiHandler.polls, first)
+        self.assertLess(time.time() - start, 0.8)
+        self.assertEqual(self.polling.stats()['waits'], 2)
+
+    def test_fixed(self):
+        ApiHandler.latency = 0
+        self.addCleanup(setattr, ApiHandler, 'latency', 0.3)
+        self.client.wait_for_completion(self.client.update_nic(DC, SERVER, NIC, name='a'),
+                                        initial_wait=1)
+        self.assertEqual(ApiHandler.polls, 1)
+        self.assertIsNone(self.polling.estimate('PATCH servers/nics'))
+
+    def test_default(self):
+        polling = self.new_client().polling
+        # the schedule of earlier versions unless a strategy is passed
+        self.assertIsInstance(polling, FixedPolling)
+        self.assertEqual((polling.initial_wait, polling.scaleup), (5, 10))
+
+    def test_zero_wait(self):
+        start = time.time()
+        self.client.wait_for_completion(self.client.update_nic(DC, SERVER, NIC, name='a'),
+                                        initial_wait=0)
+        # polled without pause, not every 5 seconds
+        self.assertLess(time.time() - start, 2)
+        self.assertGreater(ApiHandler.polls, 1)
+
+    def test_wait_for(self):
+        calls = []
+        self.client.wait_for(lambda r: len(r) == 3, lambda: calls.append(1) or list(calls),
+                             polling=self.polling, key='k8s')
+        self.assertEqual(len(calls), 3)
+        self.assertIsNotNone(self.polling.estimate('k8s'))
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            self.client.wait_for(lambda r: True, lambda: None, console_print='.',
+                                 polling=self.polling)
+        # the progress output ends with a newline
+        self.assertEqual(stdout.getvalue(), '.\n')
+        with self.assertRaises(ICTimeoutError):
+            self.client.wait_for(lambda r: False, lambda: {'requestId': 'r-1'}, timeout=0.1,
+                                 polling=self.polling)
+
+
+if __name__ == '__main__':
+    unittest.main()
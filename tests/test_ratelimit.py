@@ -0,0 +1,98 @@
+# Copyright 2015-2019 IONOS
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+from ionosenterprise.client import IonosEnterpriseService
+from ionosenterprise.ratelimit import RateLimiter, FileRateLimiter, HAS_FCNTL
+
+
+def acquire_many(path, count):
+    limiter = FileRateLimiter(rate=50, burst=1, path=path)
+    for _ in range(count):
+        limiter.acquire()
+
+
+class TestRateLimiter(unittest.TestCase):
+    def test_burst(self):
+        limiter = RateLimiter(rate=1, burst=5)
+        for _ in range(5):
+            self.assertEqual(limiter.acquire(), 0)
+        self.assertEqual(limiter.stats()['delayed'], 0)
+
+    def test_rate(self):
+        limiter = RateLimiter(rate=100, burst=1)
+        start = time.time()
+        for _ in range(21):
+            limiter.acquire()
+        self.assertGreaterEqual(time.time() - start, 0.19)
+        stats = limiter.stats()
+        self.assertEqual(stats['requests'], 21)
+        self.assertEqual(stats['delayed'], 20)
+        self.assertGreater(stats['total_wait'], 0.15)
+
+    def test_threads(self):
+        limiter = RateLimiter(rate=100, burst=10)
+
+        def target():
+            for _ in range(10):
+                limiter.acquire()
+
+        start = time.time()
+        threads = [threading.Thread(target=target) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        # 40 requests, 10 of them from the burst
+        self.assertGreaterEqual(time.time() - start, 0.28)
+        self.assertEqual(limiter.stats()['requests'], 40)
+
+    def test_invalid(self):
+        self.assertRaises(ValueError, RateLimiter, 0)
+        self.assertRaises(ValueError, RateLimiter, 1, 0)
+
+    @unittest.skipUnless(HAS_FCNTL, "fcntl is not available")
+    def test_processes(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmpdir, 'bucket')
+            start = time.time()
+            processes = [multiprocessing.Process(target=acquire_many, args=(path, 10))
+                         for _ in range(3)]
+            for process in processes:
+                process.start()
+            for process in processes:
+                process.join()
+            # 30 requests at 50 per second, one from the burst
+            self.assertGreaterEqual(time.time() - start, 0.55)
+        finally:
+            shutil.rmtree(tmpdir)
+
+    def test_client(self):
+        limiter = RateLimiter(rate=10, burst=3)
+        client = IonosEnterpriseService(username='username', password='password',
+                                        use_config=False, use_keyring=False,
+                                        rate_limiter=limiter)
+        self.assertIs(client.get_api_client().rate_limiter, limiter)
+
+
+if __name__ == '__main__':
+    unittest.main()
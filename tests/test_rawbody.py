@@ -0,0 +1,105 @@
+# Copyright 2015-2019 IONOS
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import datetime
+import json
+import unittest
+
+from helpers.stub import StubHandler, StubTestCase
+from ionosenterprise.client import Datacenter, FirewallRule, LAN, LoadBalancer, NIC, Server, Volume
+from ionosenterprise.errors import ICValidationError
+from ionosenterprise.rawbody import RawBody, raw_body
+
+
+class ApiHandler(StubHandler):
+    def do_POST(self):
+        length = int(self.headers['Content-Length'])
+        self.server.bodies.append(json.loads(self.rfile.read(length).decode('utf-8')))
+        self.respond(202, {'id': 'new'}, {
+            'Location': 'https://api/cloudapi/v5/requests/123-456/status'})
+
+
+def composite_datacenter():
+    rules = [FirewallRule(name='ssh', protocol='TCP', port_range_start=22, port_range_end=22)]
+    servers = [Server(name='server {}'.format(i), cores=2, ram=4096,
+                      create_volumes=[Volume(name='system', size=20, image_alias='ubuntu:latest',
+                                             ssh_keys=['ssh-rsa AAAA'])],
+                      nics=[NIC(name='nic', lan=1, dhcp=True, firewall_rules=rules)])
+               for i in range(3)]
+    return Datacenter(name='dc', location='de/fra', description='composite',
+                      servers=servers, volumes=[Volume(name='data', size=100)],
+                      lans=[LAN(name='public', public=True)],
+                      loadbalancers=[LoadBalancer(name='lb', dhcp=True)])
+
+
+class TestRawBody(unittest.TestCase):
+    def test_valid(self):
+        body = raw_body({'properties': {'name': 'x', 'ips': ('1.2.3.4',)}, 'entities': {
+            'volumes': {'items': [{'id': 'volume-id'}, {'properties': {'size': 10}}]}}})
+        self.assertIsInstance(body, RawBody)
+
+    def test_invalid(self):
+        for resource, message in (
+                ([], 'Expected an object at body'),
+                ({'properties': None}, "Missing 'properties' at body"),
+                ({'properties': {'name': datetime.date(2020, 1, 1)}},
+                 'date value is not JSON serializable at body.properties.name'),
+                ({'properties': {}, 'entities': {'nics': {}}},
+                 "Missing 'items' list at body.entities.nics"),
+                ({'properties': {}, 'entities': {'nics': {'items': [{}]}}},
+                 "Missing 'properties' at body.entities.nics.items[0]")):
+            with self.assertRaises(ICValidationError) as context:
+                raw_body(resource)
+            self.assertEqual(context.exception.resp, 422)
+            self.assertEqual(context.exception.content, [{'message': message}])
+
+
+class TestRawBodyClient(StubTestCase):
+    handler = ApiHandler
+
+    def setUp(self):
+        super(TestRawBodyClient, self).setUp()
+        self.server.bodies = []
+
+    def bodies(self, **kwargs):
+        client = self.new_client(**kwargs)
+        responses = [
+            client.create_datacenter(composite_datacenter()),
+            client.create_server('dc', Server(name='s', cores=1, ram=1024, attach_volumes=['v'])),
+            client.create_volume('dc', Volume(name='v', size=10, image='image-id')),
+            client.create_nic('dc', 's', NIC(name='n', lan=2, ips=['10.0.0.1'])),
+            client.create_loadbalancer('dc', LoadBalancer(name='lb', balancednics=['n'])),
+            client.create_firewall_rule('dc', 's', 'n',
+                                        FirewallRule(name='icmp', protocol='ICMP')),
+        ]
+        for response in responses:
+            self.assertEqual(response['requestId'], '123-456')
+        bodies, self.server.bodies = self.server.bodies, []
+        return bodies
+
+    def test_same_bodies(self):
+        expected = self.bodies()
+        self.assertEqual(len(expected), 6)
+        self.assertEqual(self.bodies(raw_bodies=True), expected)
+        self.assertEqual(self.bodies(raw_bodies=True, json_backend='orjson'), expected)
+
+    def test_local_validation(self):
+        client = self.new_client(raw_bodies=True)
+        with self.assertRaises(ICValidationError):
+            client.create_volume('dc', Volume(name=datetime.datetime.now()))
+        self.assertEqual(self.server.bodies, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
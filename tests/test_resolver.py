@@ -0,0 +1,155 @@
+# Copyright 2015-2019 IONOS
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import unittest
+
+from six.moves.urllib.parse import parse_qs, urlparse
+
+from helpers.stub import PREFIX, StubHandler, StubTestCase
+from ionosenterprise.client import Server
+
+
+class ApiHandler(StubHandler):
+    # path of the collection -> {id: properties}
+    resources = {}
+    log = []
+    next_id = 0
+
+    def _parse(self):
+        url = urlparse(self.path)
+        path = url.path[len(PREFIX):]
+        depth = int(parse_qs(url.query).get('depth', ['1'])[0])
+        self.log.append((self.command, path, depth))
+        collection, _, resource_id = path.rpartition('/')
+        if path in self.resources:
+            return path, None, depth
+        return collection, resource_id, depth
+
+    def _resource(self, collection, resource_id, depth):
+        document = {'id': resource_id, 'href': PREFIX + collection + '/' + resource_id}
+        if depth >= 0:
+            document['properties'] = self.resources[collection][resource_id]
+        return document
+
+    def do_GET(self):
+        collection, resource_id, depth = self._parse()
+        if resource_id is None:
+            self.respond(200, {'id': collection, 'type': 'collection', 'items': [
+                self._resource(collection, i, depth - 1) for i in self.resources[collection]]})
+        else:
+            self.respond(200, self._resource(collection, resource_id, depth))
+
+    def _change(self, collection, resource_id):
+        self.respond(202, self._resource(collection, resource_id, 0), {
+            'Location': 'https://api/cloudapi/v5/requests/123-456/status'})
+
+    def do_POST(self):
+        collection, _, _ = self._parse()
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])).decode('utf-8'))
+        ApiHandler.next_id += 1
+        resource_id = 'new-{}'.format(ApiHandler.next_id)
+        self.resources[collection][resource_id] = body['properties']
+        self._change(collection, resource_id)
+
+    def do_PATCH(self):
+        collection, resource_id, _ = self._parse()
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])).decode('utf-8'))
+        self.resources[collection][resource_id].update(body)
+        self._change(collection, resource_id)
+
+    def do_DELETE(self):
+        collection, resource_id, _ = self._parse()
+        del self.resources[collection][resource_id]
+        self.respond(202, headers={
+            'Location': 'https://api/cloudapi/v5/requests/123-456/status'})
+
+
+class TestResolver(StubTestCase):
+    handler = ApiHandler
+
+    def setUp(self):
+        super(TestResolver, self).setUp()
+        ApiHandler.log = []
+        ApiHandler.resources = {
+            'datacenters': {'dc-1': {'name': 'production'}, 'dc-2': {'name': 'staging'}},
+            'datacenters/dc-1/servers': {'s-1': {'name': 'web'}, 's-2': {'name': 'db'}},
+            'datacenters/dc-2/servers': {'s-3': {'name': 'web'}},
+            'images': {'i-1': {'name': 'ubuntu', 'location': 'de/fra'},
+                       'i-2': {'name': 'ubuntu', 'location': 'us/las'}},
+        }
+
+    def test_cached(self):
+        client = self.new_client()
+        self.assertEqual(client.resolve('datacenter', None, 'prod'), 'dc-1')
+        self.assertEqual(client.resolve('datacenter', None, 'STAGING'), 'dc-2')
+        self.assertEqual(client.resolve('server', 'dc-1', 'web'), 's-1')
+        self.assertEqual(client.resolve('server', 'dc-2', 'web'), 's-3')
+        self.assertEqual(ApiHandler.log, [
+            ('GET', 'datacenters', 1),
+            ('GET', 'datacenters/dc-1/servers', 1),
+            ('GET', 'datacenters/dc-2/servers', 1)])
+        self.assertEqual(client.name_resolver.stats()['hits'], 1)
+
+    def test_errors(self):
+        client = self.new_client()
+        with self.assertRaises(NameError):
+            client.resolve('datacenter', None, 'test')
+        with self.assertRaises(NameError):
+            client.resolve('image', None, 'ubuntu')
+        self.assertEqual(client.resolve('image', 'us/las', 'ubuntu'), 'i-2')
+        with self.assertRaises(ValueError):
+            client.resolve('volume', 'dc-1', 'data')
+
+    def test_invalidation(self):
+        client = self.new_client()
+        self.assertEqual(client.resolve('server', 'dc-1', 'db'), 's-2')
+
+        client.create_server('dc-1', Server(name='cache', cores=1, ram=1024))
+        client.update_server('dc-1', 's-1', name='frontend')
+        del ApiHandler.log[:]
+        self.assertEqual(client.resolve('server', 'dc-1', 'frontend'), 's-1')
+        self.assertEqual(client.resolve('server', 'dc-1', 'cache'), 'new-1')
+        with self.assertRaises(NameError):
+            client.resolve('server', 'dc-1', 'web')
+        # only the renamed and the new server are fetched
+        self.assertEqual(ApiHandler.log, [
+            ('GET', 'datacenters/dc-1/servers', 0),
+            ('GET', 'datacenters/dc-1/servers/s-1', 0),
+            ('GET', 'datacenters/dc-1/servers/new-1', 0)])
+
+        client.delete_datacenter('dc-1')
+        self.assertEqual(client.name_resolver.stats()['scopes'], 0)
+
+    def test_ttl(self):
+        client = self.new_client(name_ttl=0)
+        client.resolve('datacenter', None, 'production')
+        ApiHandler.resources['datacenters']['dc-3'] = {'name': 'test'}
+        self.assertEqual(client.resolve('datacenter', None, 'test'), 'dc-3')
+        self.assertEqual(ApiHandler.log, [
+            ('GET', 'datacenters', 1),
+            ('GET', 'datacenters', 1)])
+
+    def test_renamed_elsewhere(self):
+        client = self.new_client(name_ttl=0)
+        self.assertEqual(client.resolve('server', 'dc-1', 'web'), 's-1')
+        # renamed by another client
+        ApiHandler.resources['datacenters/dc-1/servers']['s-1']['name'] = 'frontend'
+        self.assertEqual(client.resolve('server', 'dc-1', 'frontend'), 's-1')
+        with self.assertRaises(NameError):
+            client.resolve('server', 'dc-1', 'web')
+
+
+if __name__ == '__main__':
+    unittest.main()
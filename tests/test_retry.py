@@ -0,0 +1,198 @@
+# Copyright 2015-2019 IONOS
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import socket
+import threading
+import time
+import unittest
+
+import requests
+import responses
+import urllib3
+
+from helpers.stub import StubHandler, StubTestCase
+from ionosenterprise.errors import ICError, ICNotFoundError
+from ionosenterprise.retry import RetryPolicy
+
+
+class FlakyHandler(StubHandler):
+    """Answers with the queued status codes, then with 200."""
+
+    def do_GET(self):
+        self.server.requests.append(self.path)
+        status = self.server.statuses.pop(0) if self.server.statuses else 200
+        self.respond(status, {'id': 'dc', 'items': []} if status == 200 else
+                     {'httpStatus': status, 'messages': [{'message': 'error'}]},
+                     {'Retry-After': '0'} if status == 429 else None)
+
+
+class TestRetryPolicy(unittest.TestCase):
+    def test_idempotent(self):
+        policy = RetryPolicy()
+        self.assertTrue(policy.is_idempotent('GET'))
+        self.assertTrue(policy.is_idempotent('delete'))
+        self.assertFalse(policy.is_idempotent('PUT'))
+        self.assertFalse(policy.is_idempotent('POST'))
+        self.assertTrue(RetryPolicy(retry_put_patch=True).is_idempotent('PATCH'))
+        self.assertFalse(RetryPolicy(retry_put_patch=True).is_idempotent('POST'))
+
+    def test_decorrelated_jitter(self):
+        policy = RetryPolicy(base_delay=1, max_delay=10)
+        delay = 0
+        for _ in range(100):
+            previous, delay = delay, policy.next_delay(delay)
+            self.assertGreaterEqual(delay, 1)
+            self.assertLessEqual(delay, min(10, max(1, previous * 3)))
+
+    def test_retry_after(self):
+        self.assertEqual(RetryPolicy.delay_from_headers({'Retry-After': '7'}), 7)
+        self.assertIsNone(RetryPolicy.delay_from_headers({'X-RateLimit-Remaining': '3',
+                                                          'X-RateLimit-Reset': '5'}))
+        self.assertEqual(RetryPolicy.delay_from_headers({'X-RateLimit-Remaining': '0',
+                                                         'X-RateLimit-Reset': '5'}), 5)
+        delay = RetryPolicy.delay_from_headers({'X-RateLimit-Remaining': '0',
+                                                'X-RateLimit-Reset': str(time.time() + 20)})
+        self.assertAlmostEqual(delay, 20, delta=1)
+
+    def test_retry_delay(self):
+        policy = RetryPolicy(max_retries=2, base_delay=0.1, max_delay=0.2)
+        state = policy.begin('GET')
+        self.assertIsNone(state.retry_delay(status=404))
+        self.assertIsNotNone(state.retry_delay(status=503))
+        self.assertEqual(state.retry_delay(status=429, headers={'Retry-After': '3'}), 3)
+        self.assertIsNone(policy.begin('POST').retry_delay(status=503))
+        # a POST that was never sent is safe to repeat
+        refused = urllib3.exceptions.MaxRetryError(
+            None, '/', urllib3.exceptions.NewConnectionError(None, 'refused'))
+        self.assertIsNotNone(policy.begin('POST').retry_delay(error=refused))
+        self.assertIsNotNone(policy.begin('POST').retry_delay(
+            error=requests.exceptions.ConnectionError(refused)))
+        self.assertIsNone(policy.begin('POST').retry_delay(
+            error=urllib3.exceptions.ProtocolError('reset')))
+
+    def test_max_retries_and_deadline(self):
+        policy = RetryPolicy(max_retries=2, base_delay=0, max_delay=0)
+        state = policy.begin('GET')
+        state.sleep(state.retry_delay(status=503))
+        state.sleep(state.retry_delay(status=503))
+        self.assertIsNone(state.retry_delay(status=503))
+        error = state.finish(Exception())
+        self.assertEqual(error.retries, 2)
+        self.assertEqual(policy.stats()['exhausted'], 1)
+
+        state = RetryPolicy(deadline=1).begin('GET')
+        self.assertIsNone(state.retry_delay(status=503, headers={'Retry-After': '5'}))
+
+
+class TestRetryClient(StubTestCase):
+    handler = FlakyHandler
+
+    def setUp(self):
+        super(TestRetryClient, self).setUp()
+        self.server.statuses = []
+        self.server.requests = []
+        self.policy = RetryPolicy(base_delay=0.01, max_delay=0.05)
+        self.client = self.new_client(retry_policy=self.policy)
+
+    def test_retries_server_errors(self):
+        self.server.statuses = [503, 429, 502]
+        self.assertEqual(self.client.get_datacenter('dc')['id'], 'dc')
+        self.assertEqual(len(self.server.requests), 4)
+        stats = self.policy.stats()
+        self.assertEqual(stats['retries'], 3)
+        self.assertEqual(stats['retried_requests'], 1)
+        self.assertGreater(stats['backoff_time'], 0)
+
+    def test_retries_exhausted(self):
+        self.policy.max_retries = 2
+        self.server.statuses = [503, 503, 503, 503]
+        with self.assertRaises(ICError) as context:
+            self.client.get_datacenter('dc')
+        self.assertEqual(context.exception.retries, 2)
+        self.assertGreater(context.exception.retry_time, 0)
+        self.assertEqual(len(self.server.requests), 3)
+        self.assertEqual(self.policy.stats()['exhausted'], 1)
+
+    def test_no_retry_on_client_error(self):
+        self.server.statuses = [404]
+        with self.assertRaises(ICNotFoundError) as context:
+            self.client.get_datacenter('dc')
+        self.assertEqual(context.exception.retries, 0)
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_connection_errors(self):
+        # accepts connections and closes them without a response
+        listener = socket.socket()
+        listener.bind(('127.0.0.1', 0))
+        listener.listen(16)
+        self.addCleanup(listener.close)
+        accepted = []
+
+        def accept():
+            while True:
+                try:
+                    connection, _ = listener.accept()
+                except OSError:
+                    return
+                accepted.append(connection)
+                connection.close()
+        threading.Thread(target=accept, daemon=True).start()
+
+        policy = RetryPolicy(max_retries=2, base_delay=0, max_delay=0)
+        client = self.new_client(
+            host_base='http://127.0.0.1:{}/cloudapi/v5'.format(listener.getsockname()[1]),
+            retry_policy=policy)
+        with self.assertRaises(Exception):
+            client.get_datacenter('dc')
+        # the connection pool does not retry underneath the policy
+        self.assertEqual(policy.stats()['retries'], 2)
+        self.assertEqual(len(accepted), 3)
+
+    def test_refused_connections(self):
+        # a port nobody listens on refuses the connections, so the request
+        # was never sent and even a POST is retried
+        closed = socket.socket()
+        closed.bind(('127.0.0.1', 0))
+        port = closed.getsockname()[1]
+        closed.close()
+
+        policy = RetryPolicy(max_retries=2, base_delay=0, max_delay=0)
+        client = self.new_client(host_base='http://127.0.0.1:{}/cloudapi/v5'.format(port),
+                                 retry_policy=policy)
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            client._perform_request('/datacenters', method='POST', data='{}')
+        self.assertEqual(policy.stats()['retries'], 2)
+
+    def test_api_client_policy(self):
+        self.assertIs(self.client.get_api_client().retry_policy, self.policy)
+
+    @responses.activate
+    def test_perform_request(self):
+        url = 'https://localhost/cloudapi/v5/datacenters'
+        self.client.host_base = 'https://localhost/cloudapi/v5'
+        responses.add(responses.GET, url, status=503,
+                      json={'httpStatus': 503, 'messages': []})
+        responses.add(responses.GET, url, json={'items': []})
+        self.assertEqual(self.client._perform_request('/datacenters'), {'items': []})
+        self.assertEqual(len(responses.calls), 2)
+
+        responses.add(responses.POST, url, status=503,
+                      json={'httpStatus': 503, 'messages': []})
+        with self.assertRaises(ICError) as context:
+            self.client._perform_request('/datacenters', method='POST', data='{}')
+        self.assertEqual(context.exception.retries, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
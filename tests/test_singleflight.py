@@ -0,0 +1,110 @@
+# Copyright 2015-2019 IONOS
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import time
+import unittest
+
+from helpers.stub import StubHandler, StubTestCase, ThreadingServer
+from ionosenterprise.errors import ICNotFoundError
+from ionosenterprise.singleflight import SingleFlight
+
+
+class SlowHandler(StubHandler):
+    """Answers every request after a short delay."""
+
+    def do_GET(self):
+        self.server.requests.append(self.path)
+        time.sleep(0.2)
+        status = 404 if 'missing' in self.path else 200
+        self.respond(status, {'id': self.path.split('?')[0].rsplit('/', 1)[-1],
+                              'properties': {'name': 'dc'}} if status == 200 else
+                     {'httpStatus': 404, 'messages': [{'message': 'not found'}]})
+
+
+def run_concurrently(calls):
+    results = [None] * len(calls)
+
+    def target(i, call):
+        try:
+            results[i] = call()
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=target, args=(i, call)) for i, call in enumerate(calls)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+class TestSingleFlight(unittest.TestCase):
+    def test_do(self):
+        single_flight = SingleFlight()
+        calls = []
+
+        def fn(value):
+            calls.append(value)
+            time.sleep(0.1)
+            return {'value': value}
+
+        results = run_concurrently([lambda: single_flight.do('key', fn, 1)] * 5)
+        self.assertEqual(calls, [1])
+        self.assertEqual(results, [{'value': 1}] * 5)
+        self.assertEqual(len(set(id(r) for r in results)), 5)
+        self.assertEqual(single_flight.stats(), {'calls': 1, 'shared': 4})
+        # nothing is kept after the call finished
+        self.assertEqual(single_flight.do('key', fn, 2), {'value': 2})
+
+
+class TestSingleFlightClient(StubTestCase):
+    handler = SlowHandler
+    server_class = ThreadingServer
+
+    def setUp(self):
+        super(TestSingleFlightClient, self).setUp()
+        self.server.requests = []
+        self.client = self.new_client(single_flight=True, pool_size=10)
+
+    def test_identical_reads_share_one_request(self):
+        results = run_concurrently(
+            [lambda: self.client.get_datacenter('dc')] * 4 +
+            [lambda: self.client.get_datacenter(datacenter_id='dc', depth=1)] * 4)
+        self.assertEqual(len(self.server.requests), 1)
+        self.assertEqual([r['id'] for r in results], ['dc'] * 8)
+        # every caller gets its own copy
+        results[0]['properties']['name'] = 'changed'
+        self.assertEqual(results[1]['properties']['name'], 'dc')
+
+    def test_different_arguments(self):
+        run_concurrently([lambda: self.client.get_datacenter('dc', depth=1),
+                          lambda: self.client.get_datacenter('dc', depth=2),
+                          lambda: self.client.get_datacenter('other')])
+        self.assertEqual(len(self.server.requests), 3)
+
+    def test_errors_are_shared(self):
+        results = run_concurrently([lambda: self.client.get_datacenter('missing')] * 3)
+        self.assertEqual(len(self.server.requests), 1)
+        for result in results:
+            self.assertIsInstance(result, ICNotFoundError)
+
+    def test_disabled(self):
+        self.client.single_flight = None
+        run_concurrently([lambda: self.client.get_datacenter('dc')] * 3)
+        self.assertEqual(len(self.server.requests), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+# Copyright 2015-2019 IONOS
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+from six.moves.urllib.parse import parse_qs, urlparse
+
+from helpers.stub import PREFIX, StubHandler, StubTestCase
+from ionosenterprise.errors import ICTimeoutError
+from ionosenterprise.polling import AdaptivePolling
+from ionosenterprise.waiters import StateWatcher
+
+DC = '9f4e4b4c-0c5d-4f6c-8c3e-2d1b0a9e8f7a'
+
+
+def shutoff(server):
+    return server['properties']['vmState'] == 'SHUTOFF'
+
+
+class ApiHandler(StubHandler):
+    # server ID -> number of listings after which it is shut off, None
+    # if it is never
+    servers = {}
+    # servers missing from the listings
+    deleted = set()
+    log = []
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        listing = len(self.log)
+        self.log.append((url.path[len(PREFIX):],
+                         dict((key, value[0]) for key, value in parse_qs(url.query).items())))
+        items = []
+        for server_id, stopped in sorted(self.servers.items()):
+            if server_id in self.deleted:
+                continue
+            off = stopped is not None and listing >= stopped
+            items.append({'id': server_id, 'type': 'server',
+                          'metadata': {'state': 'INACTIVE' if off else 'BUSY'},
+                          'properties': {'name': server_id,
+                                         'vmState': 'SHUTOFF' if off else 'RUNNING'}})
+        self.respond(200, {'id': DC + '/servers', 'type': 'collection', 'items': items})
+
+
+class TestWaitForStates(StubTestCase):
+    handler = ApiHandler
+
+    def setUp(self):
+        super(TestWaitForStates, self).setUp()
+        ApiHandler.servers = {}
+        ApiHandler.deleted = set()
+        ApiHandler.log = []
+        self.client = self.new_client(
+            polling=AdaptivePolling(min_wait=0.01, max_wait=0.02, jitter=0))
+
+    def test_many(self):
+        ApiHandler.servers = dict(('s-{:03d}'.format(i), i % 4 + 1) for i in range(200))
+        servers = self.client.wait_for_states(
+            DC, dict((server_id, shutoff) for server_id in ApiHandler.servers))
+        self.assertEqual(len(servers), 200)
+        self.assertEqual(set(server['metadata']['state'] for server in servers.values()),
+                         set(['INACTIVE']))
+        # one listing per tick for all servers
+        self.assertEqual(ApiHandler.log, [('datacenters/{}/servers'.format(DC),
+                                           {'depth': '1'})] * 5)
+
+    def test_outcomes(self):
+        ApiHandler.servers = {'s-1': 1, 's-2': None, 's-3': None, 's-4': None}
+        ApiHandler.deleted = set(['s-3'])
+        servers = self.client.wait_for_states(DC, {
+            's-1': shutoff,
+            's-2': shutoff,
+            's-3': lambda server: server is None,
+            's-4': lambda server: server['properties']['cores'] == 2,
+        }, timeout=0.2)
+        self.assertEqual(servers['s-1']['properties']['vmState'], 'SHUTOFF')
+        self.assertIsInstance(servers['s-2'], ICTimeoutError)
+        self.assertIsNone(servers['s-3'])
+        self.assertIsInstance(servers['s-4'], KeyError)
+
+    def test_background(self):
+        ApiHandler.servers = {'s-1': 1, 's-2': 3}
+        watcher = StateWatcher(self.client, DC)
+        watcher.start()
+        released = []
+        first = watcher.watch('s-1', shutoff)
+        second = watcher.watch('s-2', shutoff)
+        for future in (first, second):
+            future.add_done_callback(lambda future: released.append(watcher.listings))
+        self.assertEqual(first.result(timeout=5)['id'], 's-1')
+        self.assertEqual(second.result(timeout=5)['id'], 's-2')
+        # each is released by the first listing in its state
+        self.assertEqual(released, [2, 4])
+        self.assertEqual(len(watcher), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+# Copyright 2015-2019 IONOS
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import unittest
+
+from helpers.stub import StubHandler, StubTestCase
+from ionosenterprise.errors import ICNotFoundError
+from ionosenterprise.streaming import iter_json_items
+
+ITEMS = [
+    {'id': 'a', 'properties': {'name': 'sérvér ] }', 'cores': 12345, 'ram': 1.5e3}},
+    {'id': 'b', 'properties': {'name': '☃ "quoted" [x]', 'nics': [1, [2, {}]]}},
+    {'id': 'c', 'properties': None, 'entities': {'volumes': {'items': []}}},
+]
+
+
+def chunked(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+class CollectionHandler(StubHandler):
+    def do_GET(self):
+        self.server.requests.append(self.path)
+        if 'missing' in self.path:
+            status, document = 404, {'httpStatus': 404, 'messages': [{'message': 'missing'}]}
+        else:
+            status = 200
+            document = {'id': 'servers', 'type': 'collection',
+                        'items': [{'id': 'server-{}'.format(i)} for i in range(2000)]}
+        self.respond(status, document)
+
+
+class TestIterJsonItems(unittest.TestCase):
+    def test_chunk_sizes(self):
+        document = {'id': 'x', 'type': 'collection', 'items': ITEMS, 'limit': 1000,
+                    '_links': {'next': 'https://api/next'}}
+        for indent in (None, 2):
+            data = json.dumps(document, indent=indent, ensure_ascii=False).encode('utf-8')
+            for size in (1, 2, 3, 7, 64, len(data)):
+                self.assertEqual(list(iter_json_items(chunked(data, size))), ITEMS)
+
+    def test_empty(self):
+        self.assertEqual(list(iter_json_items([b'{}'])), [])
+        self.assertEqual(list(iter_json_items([b'{"items": [ ]}'])), [])
+        self.assertEqual(list(iter_json_items([b'{"id": "x"}'])), [])
+
+    def test_trailing_number(self):
+        data = b'{"items": [1, 23, 456], "offset": 12345}'
+        for size in range(1, 6):
+            self.assertEqual(list(iter_json_items(chunked(data, size))), [1, 23, 456])
+
+    def test_invalid(self):
+        self.assertRaises(ValueError, list, iter_json_items([b'[1, 2]']))
+        self.assertRaises(ValueError, list, iter_json_items([b'{"items": [1 2]}']))
+        self.assertRaises(ValueError, list, iter_json_items([b'{"items": [{"a": ']))
+
+
+class TestStreamClient(StubTestCase):
+    handler = CollectionHandler
+
+    def setUp(self):
+        super(TestStreamClient, self).setUp()
+        self.server.requests = []
+        self.client = self.new_client(single_flight=True)
+
+    def test_stream(self):
+        servers = list(self.client.iter_servers('dc', depth=3, stream=True))
+        self.assertEqual(len(servers), 2000)
+        self.assertEqual(servers[-1], {'id': 'server-1999'})
+        self.assertEqual(self.server.requests, ['/cloudapi/v5/datacenters/dc/servers?depth=3'])
+        # the connection can be used again
+        self.assertEqual(len(self.client.list_servers('dc')['items']), 2000)
+
+    def test_break(self):
+        for server in self.client.iter_servers('dc', stream=True):
+            break
+        self.assertEqual(server, {'id': 'server-0'})
+        self.assertEqual(len(self.client.list_servers('dc')['items']), 2000)
+
+    def test_error(self):
+        with self.assertRaises(ICNotFoundError):
+            list(self.client.iter_servers('missing', stream=True))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+# Copyright 2015-2019 IONOS
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+from six.moves.urllib.parse import parse_qs, urlparse
+
+from helpers.stub import PREFIX, StubHandler, StubTestCase
+from ionosenterprise.errors import ICFailedRequest, ICNotFoundError, ICTimeoutError
+from ionosenterprise.waiters import RequestWaiter
+
+
+class ApiHandler(StubHandler):
+    # request ID -> statuses returned by the successive polls, the last
+    # one is repeated
+    statuses = {}
+    polls = {}
+    # requests created before the listed period
+    unlisted = set()
+    listing_fails = False
+    log = []
+
+    def _status(self, request_id):
+        statuses = self.statuses[request_id]
+        poll = self.polls.get(request_id, 0)
+        self.polls[request_id] = poll + 1
+        status = statuses[min(poll, len(statuses) - 1)]
+        return {'id': request_id + '/status', 'type': 'request-status',
+                'metadata': {'status': status, 'message': 'Request has ' + status,
+                             'targets': []}}
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        path = url.path[len(PREFIX):]
+        query = parse_qs(url.query)
+        self.log.append((path, dict((key, value[0]) for key, value in query.items())))
+        if path == 'requests' and self.listing_fails:
+            self.respond(500, {'httpStatus': 500, 'messages': [{'message': 'error'}]})
+        elif path == 'requests':
+            self.respond(200, {'id': 'requests', 'type': 'collection', 'items': [
+                {'id': request_id, 'type': 'request',
+                 'metadata': {'requestStatus': self._status(request_id)}}
+                for request_id in sorted(self.statuses) if request_id not in self.unlisted]})
+        elif path.split('/')[1] in self.statuses:
+            self.respond(200, self._status(path.split('/')[1]))
+        else:
+            self.respond(404, {'httpStatus': 404, 'messages': [{'message': 'not found'}]})
+
+
+class TestRequestWaiter(StubTestCase):
+    handler = ApiHandler
+
+    def setUp(self):
+        super(TestRequestWaiter, self).setUp()
+        ApiHandler.statuses = {}
+        ApiHandler.polls = {}
+        ApiHandler.unlisted = set()
+        ApiHandler.listing_fails = False
+        ApiHandler.log = []
+        self.client = self.new_client()
+
+    def test_listing(self):
+        progress = [['RUNNING', 'DONE'], ['QUEUED', 'RUNNING', 'DONE']]
+        for i in range(20):
+            ApiHandler.statuses['r-{}'.format(i)] = progress[i % 2]
+        ApiHandler.statuses['r-0'] = ['RUNNING', 'FAILED']
+        # requests listed but not waited for
+        ApiHandler.statuses['other'] = ['RUNNING']
+
+        results = self.client.wait_for_all(
+            [{'requestId': 'r-{}'.format(i)} for i in range(20)] + [{}], interval=0.01)
+        self.assertIsInstance(results[0], ICFailedRequest)
+        self.assertEqual(results[0].request_id, 'r-0')
+        self.assertEqual([result['status'] for result in results[1:20]], ['DONE'] * 19)
+        self.assertIsNone(results[20])
+
+        # one listing per tick, no request is polled on its own
+        self.assertEqual(len(ApiHandler.log), 3)
+        for path, query in ApiHandler.log:
+            self.assertEqual(path, 'requests')
+            self.assertEqual(query['depth'], '2')
+            self.assertIn('filter.createdAfter', query)
+
+    def test_few(self):
+        ApiHandler.statuses = {'r-1': ['RUNNING', 'DONE'], 'r-2': ['DONE']}
+        waiter = RequestWaiter(self.client, interval=0.01)
+        futures = [waiter.add('r-1'), waiter.add({'requestId': 'r-2'})]
+        self.assertIs(waiter.add('r-1'), futures[0])
+        waiter.run()
+        self.assertEqual([future.result()['status'] for future in futures], ['DONE', 'DONE'])
+        self.assertEqual(sorted(path for path, _ in ApiHandler.log),
+                         ['requests/r-1/status', 'requests/r-1/status', 'requests/r-2/status'])
+        self.assertEqual((waiter.polls, waiter.listings), (3, 0))
+
+    def test_missing_from_listing(self):
+        ApiHandler.statuses = dict(('r-{}'.format(i), ['DONE']) for i in range(4))
+        ApiHandler.statuses['old'] = ['RUNNING', 'DONE']
+        ApiHandler.unlisted = set(['old'])
+        waiter = RequestWaiter(self.client, interval=0.01)
+        futures = [waiter.add(request_id) for request_id in sorted(ApiHandler.statuses)]
+        self.assertEqual(waiter.poll(), 1)
+        # only one request is left, it is polled on its own
+        waiter.run()
+        self.assertTrue(all(future.result()['status'] == 'DONE' for future in futures))
+        self.assertEqual([path for path, _ in ApiHandler.log],
+                         ['requests', 'requests/old/status', 'requests/old/status'])
+
+    def test_status_error(self):
+        ApiHandler.statuses = {'r-1': ['RUNNING', 'DONE']}
+        results = self.client.wait_for_all(['r-1', 'unknown'], interval=0.01)
+        self.assertEqual(results[0]['status'], 'DONE')
+        self.assertIsInstance(results[1], ICNotFoundError)
+
+    def test_listing_error(self):
+        ApiHandler.statuses = dict(('r-{}'.format(i), ['RUNNING', 'DONE']) for i in range(5))
+        ApiHandler.listing_fails = True
+        with self.assertLogs('ionosenterprise.waiters', 'WARNING'):
+            results = self.client.wait_for_all(sorted(ApiHandler.statuses), interval=0.01)
+        self.assertEqual([result['status'] for result in results], ['DONE'] * 5)
+        self.assertEqual(len([path for path, _ in ApiHandler.log if path != 'requests']), 10)
+
+    def test_timeout(self):
+        ApiHandler.statuses = {'r-1': ['RUNNING']}
+        results = self.client.wait_for_all(['r-1'], timeout=0.05, interval=0.01)
+        self.assertIsInstance(results[0], ICTimeoutError)
+        self.assertEqual(results[0].request_id, 'r-1')
+
+
+if __name__ == '__main__':
+    unittest.main()